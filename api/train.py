@@ -3,44 +3,138 @@ API para treinamento de modelo de ML
 Função serverless para Vercel
 """
 
+import os
+import sys
 import json
+import math
+import time
+import threading
 import numpy as np
 import pandas as pd
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.model_selection import train_test_split, GridSearchCV
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-from sklearn.metrics import confusion_matrix, roc_curve, auc
-from ucimlrepo import fetch_ucirepo
+from sklearn.metrics import roc_curve, auc
 import io
 import base64
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from http.server import BaseHTTPRequestHandler
 
+# Módulos compartilhados com os scripts do pipeline
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'scripts'))
+# Esquema reduzido salvo por feature_selection.py (selectedFeatures: true)
+SELECTION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'data', 'selected_features.json')
+from explain_predictions import TreeExplainer
+from permutation_importance import permutation_importance_fast
+from threshold_optimization import choose_operating_point, set_threshold, predict_with_threshold, N_SPLITS
+from dataset_registry import load_dataset as load_registered_dataset, preload
+from multiclass_metrics import one_vs_rest_metrics
+from deadline import Deadline, DeadlineExceeded, POLL_INTERVAL
+from learning_curves import learning_curve
+from input_validation import build_profile, validate_batch, DriftMonitor
+
+# Orçamento padrão (maxDuration de 30s no vercel.json, com margem para enviar a resposta)
+DEFAULT_TIME_BUDGET = 25.0
+RESPONSE_RESERVE = 1.0
+# Fração do tempo restante que o treino pode usar e profundidade máxima ao degradar
+TRAIN_FRACTION = 0.5
+DEPTH_CAP = 10
+PILOT_ROWS = 2000
+# Custo aproximado das explicações por amostra de teste (inclui a serialização)
+EXPLAIN_SECONDS_PER_ROW = 5e-5
+# Máximo de índices de linhas marcadas devolvidos na resposta
+MAX_FLAGGED_ROWS = 100
+# Fração aproximada do pipeline concluída em cada evento de progresso
+PROGRESS_STAGES = {
+    'dataset_loaded': 0.15,
+    'split_done': 0.25,
+    'validation_done': 0.3,
+    'training_started': 0.35,
+    'model_trained': 0.7,
+    'evaluation_done': 0.85,
+    'explanations_done': 0.95
+}
+
+class TrainingCancelled(Exception):
+    """Cliente desconectou durante o treinamento com progresso em streaming"""
+
+class InvalidRequest(Exception):
+    """Parâmetro inválido na requisição (resposta 400)"""
+
 class handler(BaseHTTPRequestHandler):
     def do_POST(self):
         """Processar requisição POST para treinamento"""
         try:
-            # Configurar CORS
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
-            self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-            self.end_headers()
-            
             # Ler dados da requisição
             content_length = int(self.headers['Content-Length'])
             post_data = self.rfile.read(content_length)
             request_data = json.loads(post_data.decode('utf-8'))
             
-            # Processar treinamento
-            result = self.process_training(request_data)
+            # Progresso em Server-Sent Events (Accept: text/event-stream ou "stream": true)
+            if request_data.get('stream') or 'text/event-stream' in self.headers.get('Accept', ''):
+                self.stream_training(request_data)
+                return
             
-            # Retornar resultado
-            response = json.dumps(result, ensure_ascii=False).encode('utf-8')
-            self.wfile.write(response)
+            # Processar treinamento (cabeçalhos só são enviados com o resultado pronto)
+            result = self.process_training(request_data)
+            status = response_status(result)
             
         except Exception as e:
-            self.send_error(500, f'Erro interno: {str(e)}')
+            result = {'success': False, 'error': f'Erro interno: {str(e)}'}
+            status = 500
+        
+        # Configurar CORS e retornar resultado
+        response = json.dumps(result, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+        self.wfile.write(response)
+    
+    def stream_training(self, config):
+        """Treinamento com eventos de progresso (text/event-stream); o último evento traz o resultado"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('X-Accel-Buffering', 'no')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+        self.close_connection = True  # Corpo delimitado pelo fechamento da conexão
+        lock = threading.Lock()  # Eventos podem vir da thread de uma etapa
+        
+        def write(payload):
+            try:
+                with lock:
+                    self.wfile.write(payload)
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError) as e:
+                raise TrainingCancelled('Cliente desconectou; treinamento interrompido') from e
+        
+        def send(event, data):
+            write(f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode('utf-8'))
+        
+        def progress(stage, **data):
+            send('progress', {'stage': stage, 'progress': PROGRESS_STAGES.get(stage), **data})
+        
+        def heartbeat():
+            # Comentário SSE: mantém a conexão viva e detecta a desconexão durante etapas longas
+            write(b": ping\n\n")
+        
+        try:
+            result = self.process_training(config, progress=progress, heartbeat=heartbeat)
+        except Exception as e:
+            result = {'success': False, 'error': f'Erro interno: {str(e)}'}
+        
+        if not result.get('cancelled'):
+            try:
+                send('result', {**result, 'status': response_status(result)})
+            except TrainingCancelled:
+                pass
     
     def do_OPTIONS(self):
         """Lidar com requisições OPTIONS (CORS)"""
@@ -50,105 +144,277 @@ class handler(BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
         self.end_headers()
     
-    def process_training(self, config):
-        """Processar treinamento do modelo"""
+    def process_training(self, config, progress=None, heartbeat=None):
+        """Processar treinamento do modelo
+
+        progress(etapa, **dados) é chamado ao fim de cada etapa e heartbeat() periodicamente
+        durante etapas longas; ambos podem levantar TrainingCancelled para interromper.
+        """
+        progress = progress or (lambda stage, **data: None)
+        
+        # Vários pares dataset/configuração em uma única requisição
+        if 'jobs' in config:
+            return self.process_batch(config, progress, heartbeat)
+        
+        try:
+            budget = time_budget(config)
+        except InvalidRequest as e:
+            return {'success': False, 'invalid': True, 'error': str(e)}
+        
+        deadline = Deadline(budget, poll=heartbeat)
         try:
-            # 1. Carregar dataset
-            dataset_info = self.load_dataset(config['datasetUrl'])
+            # 1. Carregar dataset (download com limite de tempo)
+            dataset_info = deadline.run(
+                'load_dataset', self.load_dataset, config['datasetUrl'], config.get('targetColumn'),
+                fraction=0.6
+            )
+            if config.get('selectedFeatures'):
+                dataset_info = self.select_features(dataset_info, config['selectedFeatures'], deadline)
+            progress('dataset_loaded', dataset={k: v for k, v in dataset_info.items() if k != 'data'})
+            
+            # Curva de aprendizado: vários tamanhos de treino em uma única requisição
+            if config.get('learningCurve'):
+                return self.process_learning_curve(dataset_info, config, deadline, progress)
             
             # 2. Preparar dados
-            X_train, X_test, y_train, y_test = self.prepare_data(
-                dataset_info['data'], 
-                config['trainSize']
-            )
+            with deadline.step('prepare_data'):
+                X_train, X_test, y_train, y_test = self.prepare_data(
+                    dataset_info['data'], 
+                    config['trainSize'],
+                    int(config.get('randomState', 42))
+                )
+            progress('split_done', train_samples=len(X_train), test_samples=len(X_test))
+            
+            # Validação das entradas e drift do teste em relação ao treino
+            validation = None
+            if config.get('validate', True):
+                with deadline.step('validation'):
+                    validation = self.validate_inputs(X_train, y_train, X_test)
+                progress('validation_done', flagged_rows=validation['test']['n_flagged'],
+                         drifted=validation['drift']['drifted'])
             
-            # 3. Treinar modelo
-            model = self.train_model(X_train, y_train, config)
+            # 3. Treinar modelo (limitando profundidade/amostras se não couber no orçamento)
+            with deadline.step('plan_training'):
+                X_train, y_train, config = self.plan_training(X_train, y_train, config, deadline)
+            progress('training_started', samples=len(X_train), params=self.model_params(config),
+                     cuts=deadline.cuts)
+            model = deadline.run('train_model', self.train_model, X_train, y_train, config, fraction=0.9)
+            progress('model_trained', depth=int(model.get_depth()), n_leaves=int(model.get_n_leaves()),
+                     seconds=round(deadline.steps['train_model'], 3))
             
             # 4. Avaliar modelo
-            results = self.evaluate_model(model, X_test, y_test)
+            with deadline.step('evaluate_model'):
+                results = self.evaluate_model(model, X_test, y_test, config, deadline, X_train, y_train)
+            results['validation'] = validation
+            progress('evaluation_done', metrics=results['metrics'],
+                     confusion_matrix=results['confusion_matrix'])
             
-            # 5. Gerar visualizações
-            visualizations = self.generate_visualizations(
-                dataset_info, results, model
-            )
+            # 5. Explicar predições (caminho de decisão por caso)
+            explain_cost = len(X_test) * EXPLAIN_SECONDS_PER_ROW + RESPONSE_RESERVE
+            if config.get('explain', True) and deadline.allows('explanations', explain_cost):
+                with deadline.step('explanations'):
+                    results['explanations'] = self.explain_predictions(model, X_test)
+                progress('explanations_done')
+            
+            # 6. Gerar visualizações
+            visualizations = None
+            if deadline.allows('visualizations', RESPONSE_RESERVE):
+                with deadline.step('visualizations'):
+                    visualizations = self.generate_visualizations(
+                        dataset_info, results, model
+                    )
             
             return {
                 'success': True,
-                'dataset': dataset_info,
+                'dataset': {k: v for k, v in dataset_info.items() if k != 'data'},
                 'results': results,
                 'visualizations': visualizations,
-                'model_info': {
-                    'algorithm': 'Decision Tree',
-                    'parameters': {
-                        'criterion': config.get('criterion', 'entropy'),
-                        'max_depth': config.get('maxDepth'),
-                        'min_samples_split': config.get('minSamplesSplit', 5),
-                        'min_samples_leaf': config.get('minSamplesLeaf', 2)
-                    }
-                }
+                'model_info': self.model_info(config),
+                'budget': deadline.summary()
             }
             
+        except TrainingCancelled as e:
+            return {
+                'success': False,
+                'cancelled': True,
+                'error': str(e),
+                'budget': deadline.summary()
+            }
+        except DeadlineExceeded as e:
+            return {
+                'success': False,
+                'timeout': True,
+                'error': str(e),
+                'budget': deadline.summary()
+            }
         except Exception as e:
             return {
                 'success': False,
-                'error': str(e)
+                'error': str(e),
+                'budget': deadline.summary()
             }
     
-    def load_dataset(self, dataset_url):
-        """Carregar dataset"""
+    def process_learning_curve(self, dataset_info, config, deadline, progress=None):
+        """Acurácia de treino/validação cruzada para cada tamanho de treino pedido"""
+        X = dataset_info['data']['X'].to_numpy()
+        y = dataset_info['data']['y'].to_numpy()
+        n_samples = len(y)
+        
+        # trainSizes em % do dataset (como trainSize), limitados ao treino de cada fold
+        percents = config.get('trainSizes') or [10, 20, 30, 40, 50, 60, 70, 80]
+        sizes = [max(int(round(n_samples * float(p) / 100)), 2) for p in percents]
+        
+        def fit_done(done, total):
+            stage_progress = PROGRESS_STAGES['dataset_loaded']
+            progress('fit', done=done, total=total,
+                     progress=stage_progress + (0.95 - stage_progress) * done / total)
+        
+        curve = deadline.run(
+            'learning_curve', learning_curve, X, y, self.model_params(config), sizes,
+            int(config.get('folds', 5)), None, int(config.get('randomState', 42)),
+            fit_done if progress else None, fraction=0.9, cancellable=True
+        )
+        curve['train_percent'] = [100 * size / n_samples for size in curve['train_sizes']]
+        
+        return {
+            'success': True,
+            'dataset': {k: v for k, v in dataset_info.items() if k != 'data'},
+            'learning_curve': curve,
+            'model_info': self.model_info(config),
+            'budget': deadline.summary()
+        }
+    
+    def process_batch(self, config, progress=None, heartbeat=None):
+        """Treinar vários pares dataset/configuração em processos paralelos
+
+        Ao esgotar o orçamento (ou o cliente desconectar), os jobs ainda não iniciados são
+        cancelados e o pool é encerrado sem esperar; a resposta traz os jobs concluídos.
+        """
+        progress = progress or (lambda stage, **data: None)
+        jobs = config['jobs']
         try:
-            # Se for ID do UCI
-            if dataset_url.isdigit():
-                dataset_id = int(dataset_url)
-                
-                if dataset_id == 17:  # Breast Cancer Wisconsin
-                    breast_cancer = fetch_ucirepo(id=17)
-                    X = breast_cancer.data.features
-                    y = breast_cancer.data.targets
-                    
-                    return {
-                        'name': 'Breast Cancer Wisconsin (Diagnostic)',
-                        'samples': len(X),
-                        'features': len(X.columns),
-                        'data': {'X': X, 'y': y},
-                        'classes': {
-                            'benign': int((y == 'B').sum()),
-                            'malignant': int((y == 'M').sum())
-                        }
-                    }
-                else:
-                    raise ValueError(f"Dataset UCI {dataset_id} não suportado")
-            
-            # Se for URL de CSV
-            elif dataset_url.startswith('http'):
-                df = pd.read_csv(dataset_url)
-                
-                # Assumir que última coluna é target
-                X = df.iloc[:, :-1]
-                y = df.iloc[:, -1]
-                
-                return {
-                    'name': 'Dataset Personalizado',
-                    'samples': len(X),
-                    'features': len(X.columns),
-                    'data': {'X': X, 'y': y},
-                    'classes': dict(y.value_counts())
-                }
+            budget = time_budget(config)
+            requested = [time_budget(job) for job in jobs]
+        except InvalidRequest as e:
+            return {'success': False, 'invalid': True, 'error': str(e)}
+        
+        deadline = Deadline(budget)
+        try:
+            # Carregar cada dataset uma única vez antes de criar os processos
+            sources = {(str(job['datasetUrl']), job.get('targetColumn')) for job in jobs}
+            deadline.run('load_dataset', preload, sources, fraction=0.6)
+        except DeadlineExceeded as e:
+            return {'success': False, 'timeout': True, 'error': str(e), 'budget': deadline.summary()}
+        except Exception as e:
+            return {'success': False, 'error': f"Erro ao carregar dataset: {str(e)}"}
+        
+        n_workers = max(min(len(jobs), int(config.get('workers', os.cpu_count() or 1))), 1)
+        
+        # Tempo restante (menos a margem da resposta) dividido entre as rodadas de jobs em paralelo
+        job_budget = max(deadline.remaining() - RESPONSE_RESERVE, 0.0) / math.ceil(len(jobs) / n_workers)
+        jobs = [{**job, 'timeBudget': min(job_request, job_budget)}
+                for job, job_request in zip(jobs, requested)]
+        
+        results = [None] * len(jobs)
+        executor = ProcessPoolExecutor(max_workers=n_workers)
+        pending = set()
+        try:
+            futures = {executor.submit(run_training_job, job): i for i, job in enumerate(jobs)}
+            pending = set(futures)
+            with deadline.step('jobs'):
+                while pending:
+                    done, pending = wait(pending, timeout=min(POLL_INTERVAL, deadline.remaining()),
+                                         return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result = results[futures[future]] = future.result()
+                        n_done = sum(r is not None for r in results)
+                        progress('job_done', done=n_done, total=len(jobs), success=result.get('success'),
+                                 progress=n_done / len(jobs))
+                    if pending and deadline.remaining() <= 0:
+                        raise DeadlineExceeded(f"{len(pending)} de {len(jobs)} jobs não terminaram dentro "
+                                               f"do orçamento ({deadline.budget:.2f}s)")
+                    if pending and heartbeat is not None:
+                        heartbeat()
+        except TrainingCancelled as e:
+            return {'success': False, 'cancelled': True, 'error': str(e)}
+        except DeadlineExceeded as e:
+            return {
+                'success': False,
+                'timeout': True,
+                'error': str(e),
+                'jobs': [result if result is not None else
+                         {'success': False, 'timeout': True, 'error': 'Job não concluído dentro do orçamento'}
+                         for result in results],
+                'budget': deadline.summary()
+            }
+        finally:
+            # Interrompido: descarta os jobs pendentes sem esperar pelos que estão em execução
+            executor.shutdown(wait=not pending, cancel_futures=True)
+        
+        return {
+            'success': all(result.get('success') for result in results),
+            'jobs': results
+        }
+    
+    def load_dataset(self, dataset_url, target_column=None):
+        """Carregar dataset (registro com cache de entradas pré-processadas)"""
+        try:
+            entry = load_registered_dataset(dataset_url, target_column)
             
-            else:
-                raise ValueError("URL de dataset inválida")
+            return {
+                'name': entry['name'],
+                'samples': int(entry['X'].shape[0]),
+                'features': int(entry['X'].shape[1]),
+                'data': {
+                    'X': pd.DataFrame(entry['X'], columns=entry['feature_names']),
+                    'y': pd.Series(entry['y'])
+                },
+                'class_names': entry['class_names'],
+                'classes': entry['class_counts']
+            }
                 
         except Exception as e:
             raise Exception(f"Erro ao carregar dataset: {str(e)}")
     
-    def prepare_data(self, data, train_size):
+    def select_features(self, dataset_info, selected, deadline):
+        """Manter só as features do esquema reduzido (lista de nomes ou true para o salvo)
+
+        Com true, se o esquema salvo não estiver disponível no deploy ou não pertencer a
+        este dataset, o treino segue com todas as features e o corte é registrado.
+        """
+        X = dataset_info['data']['X']
+        if selected is True:
+            try:
+                with open(SELECTION_PATH, 'r') as f:
+                    selected = json.load(f)['features']
+            except (OSError, ValueError, KeyError):
+                deadline.cut('select_features', 'full_schema',
+                             'esquema reduzido indisponível; usando todas as features')
+                return dataset_info
+            if not set(selected) <= set(X.columns):
+                deadline.cut('select_features', 'full_schema',
+                             'esquema reduzido não pertence a este dataset; usando todas as features')
+                return dataset_info
+        missing = [name for name in selected if name not in X.columns]
+        if missing:
+            raise ValueError(f"Features selecionadas ausentes no dataset: {', '.join(missing)}")
+        return {
+            **dataset_info,
+            'features': len(selected),
+            'data': {**dataset_info['data'], 'X': X[list(selected)]}
+        }
+    
+    def prepare_data(self, data, train_size, random_state=42):
         """Preparar dados para treinamento"""
         X = data['X']
         y = data['y']
         
+        # Target do UCI vem como DataFrame de uma coluna
+        if isinstance(y, pd.DataFrame):
+            y = y.iloc[:, 0]
+        
         # Codificar labels se necessário
-        if y.dtype == 'object':
+        if not pd.api.types.is_numeric_dtype(y):
             from sklearn.preprocessing import LabelEncoder
             le = LabelEncoder()
             y = le.fit_transform(y)
@@ -156,17 +422,85 @@ class handler(BaseHTTPRequestHandler):
         # Dividir dados
         test_size = (100 - train_size) / 100
         X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=test_size, random_state=42, stratify=y
+            X, y, test_size=test_size, random_state=random_state, stratify=y
         )
         
         return X_train, X_test, y_train, y_test
     
-    def train_model(self, X_train, y_train, config):
-        """Treinar modelo"""
-        # Parâmetros do modelo
+    def validate_inputs(self, X_train, y_train, X_test):
+        """Perfil do treino, linhas inseguras (treino e teste) e drift do teste"""
+        feature_names = self.get_feature_names(X_train)
+        profile = build_profile(X_train.to_numpy(), y_train, feature_names)
+        
+        summary = {}
+        for name, X in (('train', X_train), ('test', X_test)):
+            validation = validate_batch(X, profile)
+            summary[name] = {
+                'valid': validation['valid'],
+                'n_rows': validation['n_rows'],
+                'n_flagged': validation['n_flagged'],
+                'flagged_rows': validation['flagged_rows'][:MAX_FLAGGED_ROWS]
+            }
+        
+        drift = DriftMonitor(profile).update(X_test.to_numpy()).report()
+        summary['drift'] = {
+            'features': {name: {'psi': item['psi'], 'ks': item['ks']}
+                         for name, item in drift['features'].items()},
+            'drifted': drift['drifted']
+        }
+        return summary
+    
+    def plan_training(self, X_train, y_train, config, deadline):
+        """Limitar profundidade e/ou amostras de treino para caber no orçamento"""
+        n_rows = len(X_train)
+        if n_rows <= 4 * PILOT_ROWS:
+            return X_train, y_train, config
+        
+        allotted = deadline.remaining() * TRAIN_FRACTION
+        rows = np.random.default_rng(int(config.get('randomState', 42))).choice(n_rows, 4 * PILOT_ROWS, replace=False)
+        X_pilot = X_train.iloc[rows] if hasattr(X_train, 'iloc') else X_train[rows]
+        y_pilot = y_train.iloc[rows] if hasattr(y_train, 'iloc') else y_train[rows]
+        
+        def estimate(config):
+            # Treinos piloto com m e 4m amostras: tempo ~ n^k, com k estimado pelos dois
+            timings = []
+            for size in (PILOT_ROWS, 4 * PILOT_ROWS):
+                start = time.perf_counter()
+                self.train_model(X_pilot[:size], y_pilot[:size], config)
+                timings.append(time.perf_counter() - start)
+            exponent = min(max(math.log(timings[1] / max(timings[0], 1e-6), 4), 1.0), 2.0)
+            return timings[1] * (n_rows / (4 * PILOT_ROWS)) ** exponent, exponent
+        
+        estimated, exponent = estimate(config)
+        if estimated <= allotted:
+            return X_train, y_train, config
+        
+        # 1º corte: profundidade (árvores sem limite são as mais caras)
+        max_depth = config.get('maxDepth')
+        if max_depth in (None, 'None') or int(max_depth) > DEPTH_CAP:
+            config = {**config, 'maxDepth': DEPTH_CAP}
+            deadline.cut('train_model', 'max_depth',
+                         f"profundidade limitada a {DEPTH_CAP} (estimativa {estimated:.1f}s > {allotted:.1f}s)")
+            estimated, exponent = estimate(config)
+            if estimated <= allotted:
+                return X_train, y_train, config
+        
+        # 2º corte: subamostragem estratificada das amostras de treino
+        n_keep = max(int(n_rows * (allotted / estimated) ** (1 / exponent)), 4 * PILOT_ROWS)
+        _, counts = np.unique(np.asarray(y_train), return_counts=True)
+        X_train, _, y_train, _ = train_test_split(
+            X_train, y_train, train_size=n_keep, random_state=int(config.get('randomState', 42)),
+            stratify=y_train if counts.min() >= 2 else None
+        )
+        deadline.cut('train_model', 'subsample',
+                     f"{n_keep} de {n_rows} amostras de treino (estimativa {estimated:.1f}s > {allotted:.1f}s)")
+        return X_train, y_train, config
+    
+    def model_params(self, config):
+        """Parâmetros da árvore a partir da configuração da requisição"""
         params = {
             'criterion': config.get('criterion', 'entropy'),
-            'random_state': 42
+            'random_state': int(config.get('randomState', 42))
         }
         
         max_depth = config.get('maxDepth')
@@ -179,17 +513,46 @@ class handler(BaseHTTPRequestHandler):
         if 'minSamplesLeaf' in config:
             params['min_samples_leaf'] = int(config['minSamplesLeaf'])
         
-        # Treinar modelo
-        model = DecisionTreeClassifier(**params)
+        return params
+    
+    def model_info(self, config):
+        """Descrição do modelo para a resposta"""
+        return {
+            'algorithm': 'Decision Tree',
+            'parameters': {
+                'criterion': config.get('criterion', 'entropy'),
+                'max_depth': config.get('maxDepth'),
+                'min_samples_split': config.get('minSamplesSplit', 5),
+                'min_samples_leaf': config.get('minSamplesLeaf', 2)
+            }
+        }
+    
+    def train_model(self, X_train, y_train, config):
+        """Treinar modelo"""
+        model = DecisionTreeClassifier(**self.model_params(config))
         model.fit(X_train, y_train)
         
         return model
     
-    def evaluate_model(self, model, X_test, y_test):
-        """Avaliar modelo"""
+    def evaluate_model(self, model, X_test, y_test, config=None, deadline=None, X_train=None, y_train=None):
+        """Avaliar modelo (limiar escolhido só com o treino, métricas no teste)"""
+        config = config or {}
+        deadline = deadline or Deadline(math.inf)
+        
         # Predições
-        y_pred = model.predict(X_test)
-        y_pred_proba = model.predict_proba(X_test)[:, 1] if len(np.unique(y_test)) == 2 else None
+        with deadline.step('predict'):
+            y_proba = model.predict_proba(X_test)
+        is_binary = y_proba.shape[1] == 2
+        y_pred_proba = y_proba[:, 1] if is_binary else None
+        
+        # Ponto de operação (limiar de decisão) nas probabilidades fora do fold do treino
+        operating_point = None
+        if y_pred_proba is not None and X_train is not None:
+            operating_point = self.select_operating_point(model, X_train, y_train, config, deadline)
+            if operating_point is not None and not operating_point['degenerate']:
+                set_threshold(model, operating_point)
+        
+        y_pred = predict_with_threshold(model, X_test, y_pred_proba)
         
         # Métricas básicas
         accuracy = accuracy_score(y_test, y_pred)
@@ -197,33 +560,49 @@ class handler(BaseHTTPRequestHandler):
         recall = recall_score(y_test, y_pred, average='weighted')
         f1 = f1_score(y_test, y_pred, average='weighted')
         
+        # Métricas clínicas um-contra-todos (binário: classe positiva; multiclasse: média macro)
+        class_index = np.searchsorted(model.classes_, np.asarray(y_test).ravel())
+        ovr = one_vs_rest_metrics(
+            class_index, np.searchsorted(model.classes_, y_pred), y_proba, len(model.classes_)
+        )
+        per_class = ovr['per_class']
+        
         # Matriz de confusão
-        cm = confusion_matrix(y_test, y_pred)
+        cm = ovr['confusion_matrix']
         
-        # Métricas clínicas (para classificação binária)
-        clinical_metrics = {}
-        if len(np.unique(y_test)) == 2:
-            tn, fp, fn, tp = cm.ravel()
-            
-            clinical_metrics = {
-                'sensitivity': tp / (tp + fn) if (tp + fn) > 0 else 0,
-                'specificity': tn / (tn + fp) if (tn + fp) > 0 else 0,
-                'ppv': tp / (tp + fp) if (tp + fp) > 0 else 0,
-                'npv': tn / (tn + fn) if (tn + fn) > 0 else 0
-            }
+        if is_binary:
+            clinical_metrics = {name: per_class[name][1] for name in ('sensitivity', 'specificity', 'ppv', 'npv')}
+        else:
+            clinical_metrics = {name: ovr['macro'][name] for name in ('sensitivity', 'specificity', 'ppv', 'npv')}
         
-        # Curva ROC
+        # Curva ROC (pontos da curva são dispensáveis se o tempo estiver acabando)
         roc_data = {}
         if y_pred_proba is not None:
             fpr, tpr, _ = roc_curve(y_test, y_pred_proba)
             roc_auc = auc(fpr, tpr)
             
+            roc_data = {'auc': float(roc_auc)}
+            if deadline.allows('roc_curve_points', RESPONSE_RESERVE):
+                roc_data.update({'fpr': fpr.tolist(), 'tpr': tpr.tolist()})
+        else:
+            # Multiclasse: AUC de cada classe contra as demais
             roc_data = {
-                'fpr': fpr.tolist(),
-                'tpr': tpr.tolist(),
-                'auc': float(roc_auc)
+                'auc': ovr['macro']['auc'],
+                'per_class_auc': [None if np.isnan(v) else float(v) for v in per_class['auc']]
             }
         
+        # Importância por permutação (em cache por versão do modelo)
+        # Custo aproximado: uma predição por repetição para cada feature usada pela árvore
+        feature_names = self.get_feature_names(X_test)
+        n_used = len(np.unique(model.tree_.feature[model.tree_.feature >= 0]))
+        permutation_cost = 5 * n_used * deadline.steps.get('predict', 0.0) + RESPONSE_RESERVE
+        permutation = None
+        if deadline.allows('permutation_importance', permutation_cost):
+            with deadline.step('permutation_importance'):
+                permutation = permutation_importance_fast(
+                    model, X_test, y_test, feature_names, cache_dir=None
+                )
+        
         return {
             'metrics': {
                 'accuracy': float(accuracy * 100),
@@ -233,13 +612,62 @@ class handler(BaseHTTPRequestHandler):
                 **{k: float(v * 100) for k, v in clinical_metrics.items()}
             },
             'confusion_matrix': cm.tolist(),
+            'per_class_metrics': {
+                name: per_class[name] for name in ('sensitivity', 'specificity', 'ppv', 'npv', 'f1', 'support')
+            },
             'roc_curve': roc_data,
+            'operating_point': operating_point,
             'feature_importance': {
-                'features': list(range(len(model.feature_importances_))),
+                'features': feature_names,
                 'importance': (model.feature_importances_ * 100).tolist()
-            }
+            },
+            'permutation_importance': {
+                'features': feature_names,
+                'importance': [v * 100 for v in permutation['importance_mean']],
+                'std': [v * 100 for v in permutation['importance_std']],
+                'model_version': permutation['model_version']
+            } if permutation is not None else None
         }
     
+    def select_operating_point(self, model, X_train, y_train, config, deadline):
+        """Selecionar o limiar conforme o critério pedido (None = limiar padrão)
+
+        O teste não participa da escolha: o limiar vem da validação cruzada no treino
+        (N_SPLITS ajustes extras, pulados se não couberem no orçamento).
+        """
+        criteria = {}
+        if config.get('targetSensitivity') is not None:
+            criteria['target_sensitivity'] = float(config['targetSensitivity'])
+            criteria['min_specificity'] = float(config.get('minSpecificity', 0.0))
+        elif config.get('targetSpecificity') is not None:
+            criteria['target_specificity'] = float(config['targetSpecificity'])
+        elif config.get('costRatio') is not None:
+            criteria['cost_fn'] = float(config['costRatio'])
+            criteria['cost_fp'] = 1.0
+        else:
+            return None
+        
+        cost = N_SPLITS * deadline.steps.get('train_model', 0.0) + RESPONSE_RESERVE
+        if not deadline.allows('operating_point', cost):
+            return None
+        with deadline.step('operating_point'):
+            return choose_operating_point(
+                model, X_train, y_train, random_state=int(config.get('randomState', 42)), **criteria
+            )
+    
+    def get_feature_names(self, X):
+        """Nomes das features (colunas do DataFrame ou índices)"""
+        if hasattr(X, 'columns'):
+            return [str(c) for c in X.columns]
+        return [f'feature_{i}' for i in range(X.shape[1])]
+    
+    def explain_predictions(self, model, X_test):
+        """Explicar cada predição do conjunto de teste"""
+        feature_names = self.get_feature_names(X_test)
+        class_names = [str(c) for c in model.classes_]
+        explainer = TreeExplainer(model, feature_names, class_names)
+        return explainer.explain_compact(X_test)
+    
     def generate_visualizations(self, dataset_info, results, model):
         """Gerar dados para visualizações"""
         return {
@@ -249,11 +677,40 @@ class handler(BaseHTTPRequestHandler):
             'roc_curve': results['roc_curve'],
             'decision_tree': {
                 'max_depth': model.max_depth,
-                'n_leaves': model.get_n_leaves(),
-                'n_nodes': model.tree_.node_count
+                'n_leaves': int(model.get_n_leaves()),
+                'n_nodes': int(model.tree_.node_count)
             }
         }
 
+def time_budget(config):
+    """Orçamento pedido em timeBudget, limitado ao padrão (maxDuration da função serverless)"""
+    value = config.get('timeBudget', DEFAULT_TIME_BUDGET)
+    try:
+        if isinstance(value, bool):
+            raise TypeError
+        budget = float(value)
+    except (TypeError, ValueError):
+        raise InvalidRequest(f"timeBudget deve ser numérico (recebido {value!r})") from None
+    if not budget > 0:
+        raise InvalidRequest(f"timeBudget deve ser maior que zero (recebido {value!r})")
+    return min(budget, DEFAULT_TIME_BUDGET)
+
+def response_status(result):
+    """Código HTTP do resultado (lote: 200 com o status de cada job no corpo)"""
+    if result.get('success'):
+        return 200
+    if result.get('invalid'):
+        return 400  # Parâmetro inválido na requisição
+    if result.get('cancelled'):
+        return 499  # Cliente encerrou a requisição
+    if result.get('timeout'):
+        return 504  # Lote: jobs concluídos no corpo, os demais marcados com timeout
+    return 200 if 'jobs' in result else 500
+
+def run_training_job(config):
+    """Treinar um par dataset/configuração (executado em processo separado)"""
+    return handler.__new__(handler).process_training(config)
+
 def handler_function(request):
     """Função principal para Vercel"""
     if request.method == 'OPTIONS':
@@ -277,11 +734,11 @@ def handler_function(request):
         config = json.loads(request.body)
         
         # Instanciar handler e processar
-        api_handler = handler()
+        api_handler = handler.__new__(handler)
         result = api_handler.process_training(config)
         
         return {
-            'statusCode': 200,
+            'statusCode': response_status(result),
             'headers': {
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*'
@@ -250,7 +250,7 @@ class APIManager {
             if (this.isProductionEnvironment()) {
                 return await this.processWithRealAPI(config);
             } else {
-                return await this.processWithMockData(config);
+                return await this.processWithPrecomputedData(config);
             }
 
         } catch (error) {
@@ -273,35 +273,184 @@ class APIManager {
         try {
             this.log('Conectando com API do servidor...', 'info');
             
+            // Progresso em Server-Sent Events; abortar a requisição interrompe o treino no servidor
+            this.abortController = new AbortController();
             const response = await fetch('/api/train', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
+                    'Accept': 'text/event-stream'
                 },
-                body: JSON.stringify(config)
+                body: JSON.stringify(config),
+                signal: this.abortController.signal
             });
 
-            if (!response.ok) {
+            const isStream = (response.headers.get('Content-Type') || '').includes('text/event-stream');
+            if (!response.ok && !isStream) {
                 const errorData = await response.json();
                 throw new Error(errorData.error || 'Erro na API');
             }
 
-            const result = await response.json();
+            const result = isStream ? await this.readEventStream(response) : await response.json();
             
             if (!result.success) {
                 throw new Error(result.error || 'Erro no processamento');
             }
 
+            // Etapas cortadas pelo orçamento de tempo da função serverless
+            (result.budget?.cuts || []).forEach(cut => {
+                this.log(`Resultado parcial (${cut.step}): ${cut.detail}`, 'warning');
+            });
+
             this.log('Processamento concluído com sucesso', 'success');
             return this.formatAPIResponse(result);
 
         } catch (error) {
+            if (error.name === 'AbortError' || this.isCancelled()) {
+                throw new Error('Operação cancelada');
+            }
             this.log(`Erro na API: ${error.message}`, 'error');
             
-            // Fallback para dados mock se API falhar
-            this.log('Usando dados de demonstração...', 'warning');
-            return await this.processWithMockData(config);
+            // Fallback para dados pré-calculados (ou mock) se API falhar
+            return await this.processWithPrecomputedData(config);
+        } finally {
+            this.abortController = null;
+        }
+    }
+
+    /**
+     * Ler eventos de progresso (text/event-stream) até o evento final com o resultado
+     */
+    async readEventStream(response) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let result = null;
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            // Eventos separados por linha em branco; comentários (": ping") são ignorados
+            let separator;
+            while ((separator = buffer.indexOf('\n\n')) !== -1) {
+                const block = buffer.slice(0, separator);
+                buffer = buffer.slice(separator + 2);
+
+                let event = 'message';
+                const data = [];
+                block.split('\n').forEach(line => {
+                    if (line.startsWith('event:')) event = line.slice(6).trim();
+                    else if (line.startsWith('data:')) data.push(line.slice(5).trimStart());
+                });
+                if (!data.length) continue;
+
+                const payload = JSON.parse(data.join('\n'));
+                if (event === 'progress') {
+                    this.handleProgress(payload);
+                } else if (event === 'result') {
+                    result = payload;
+                }
+            }
+        }
+
+        if (!result) {
+            throw new Error('Conexão encerrada antes do resultado');
+        }
+        return result;
+    }
+
+    /**
+     * Repassar um evento de progresso para a UI
+     */
+    handleProgress(event) {
+        const messages = {
+            dataset_loaded: () => `Dataset carregado: ${event.dataset.samples} amostras, ${event.dataset.features} features`,
+            split_done: () => `Divisão concluída: ${event.train_samples} treino / ${event.test_samples} teste`,
+            validation_done: () => `Validação das entradas: ${event.flagged_rows} linha(s) marcada(s) no teste`,
+            training_started: () => `Treinando com ${event.samples} amostras...`,
+            model_trained: () => `Modelo treinado em ${event.seconds}s (profundidade ${event.depth}, ${event.n_leaves} folhas)`,
+            evaluation_done: () => `Avaliação concluída: acurácia ${event.metrics.accuracy.toFixed(1)}%`,
+            explanations_done: () => 'Explicações das predições geradas',
+            fit: () => `Ajuste ${event.done}/${event.total} concluído`,
+            job_done: () => `Job ${event.done}/${event.total} concluído`
+        };
+        if (messages[event.stage]) {
+            this.log(messages[event.stage](), 'info');
+        }
+
+        window.dispatchEvent(new CustomEvent('trainingProgress', { detail: event }));
+    }
+
+    /**
+     * Curva de aprendizado: todos os tamanhos de treino em uma única requisição
+     */
+    async fetchLearningCurve(config, trainSizes = [10, 20, 30, 40, 50, 60, 70, 80]) {
+        this.log(`Calculando curva de aprendizado (${trainSizes.length} tamanhos)...`, 'info');
+
+        const response = await fetch('/api/train', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ ...config, learningCurve: true, trainSizes })
+        });
+
+        const result = await response.json();
+        if (!response.ok || !result.success) {
+            throw new Error(result.error || 'Erro na curva de aprendizado');
         }
+
+        const curve = result.learning_curve;
+        this.log(`Curva de aprendizado: ${curve.n_fits} ajustes em ${curve.total_time.toFixed(2)}s`, 'success');
+        return curve;
+    }
+
+    /**
+     * Carregar dados pré-calculados do modelo salvo (JSON estático com hash)
+     */
+    async loadPrecomputedDashboard() {
+        if (!this.precomputedPromise) {
+            this.precomputedPromise = (async () => {
+                // Manifesto revalidado a cada acesso; payload imutável em cache
+                const manifestResponse = await fetch('assets/data/dashboard-manifest.json', { cache: 'no-cache' });
+                if (!manifestResponse.ok) {
+                    throw new Error('Manifesto do dashboard não encontrado');
+                }
+                const manifest = await manifestResponse.json();
+
+                const payloadResponse = await fetch(manifest.payload);
+                if (!payloadResponse.ok) {
+                    throw new Error('Dados pré-calculados não encontrados');
+                }
+                return await payloadResponse.json();
+            })();
+
+            // Permitir nova tentativa se o carregamento falhar
+            this.precomputedPromise.catch(() => {
+                this.precomputedPromise = null;
+            });
+        }
+        return this.precomputedPromise;
+    }
+
+    /**
+     * Processar com dados pré-calculados (dataset padrão) ou mock
+     */
+    async processWithPrecomputedData(config) {
+        if (config.datasetUrl === '17') {
+            try {
+                const payload = await this.loadPrecomputedDashboard();
+                this.log('Usando resultados pré-calculados do modelo salvo', 'info');
+                return payload;
+            } catch (error) {
+                this.log(`Dados pré-calculados indisponíveis: ${error.message}`, 'warning');
+            }
+        }
+
+        this.log('Usando dados de demonstração...', 'warning');
+        return await this.processWithMockData(config);
     }
 
     /**
@@ -340,7 +489,8 @@ class APIManager {
                 features: apiResult.dataset.features
             },
             model: apiResult.model_info,
-            results: apiResult.results
+            results: apiResult.results,
+            budget: apiResult.budget
         };
     }
 
@@ -359,6 +509,7 @@ class APIManager {
                 confusionMatrix: results.results.confusionMatrix,
                 featureImportance: results.results.featureImportance,
                 rocCurve: results.results.rocCurve,
+                rocAuc: results.results.metrics.auc,
                 decisionTree: this.generateDecisionTreeData()
             };
             
@@ -507,6 +658,9 @@ class APIManager {
      */
     cancel() {
         this.cancelled = true;
+        if (this.abortController) {
+            this.abortController.abort();
+        }
         this.log('Operação cancelada pelo usuário', 'warning');
     }
 
@@ -0,0 +1,100 @@
+/**
+ * Árvore de Decisão Compilada
+ * Gerado por src/scripts/compile_tree.py - não editar
+ */
+
+class CompiledTreeModel {
+    /**
+     * Probabilidades de uma amostra (array com 30 valores)
+     */
+    static predictProba(row) {
+        const x = row.map(Math.fround); // float32, como o scikit-learn
+        if (x[22] <= 114.45000076293945) {
+            if (x[27] <= 0.11099999770522118) {
+                if (x[13] <= 45.170000076293945) {
+                    if (x[21] <= 33.35000038146973) {
+                        return [1.0, 0.0];
+                    } else {
+                        if (x[27] <= 0.092289999127388) {
+                            return [1.0, 0.0];
+                        } else {
+                            return [0.5, 0.5];
+                        }
+                    }
+                } else {
+                    if (x[15] <= 0.014274999964982271) {
+                        return [0.0, 1.0];
+                    } else {
+                        return [1.0, 0.0];
+                    }
+                }
+            } else {
+                if (x[21] <= 25.734999656677246) {
+                    if (x[13] <= 33.39999961853027) {
+                        return [1.0, 0.0];
+                    } else {
+                        return [0.5, 0.5];
+                    }
+                } else {
+                    if (x[7] <= 0.05491499975323677) {
+                        if (x[22] <= 100.3499984741211) {
+                            return [1.0, 0.0];
+                        } else {
+                            if (x[17] <= 0.010521499905735254) {
+                                return [0.0, 1.0];
+                            } else {
+                                if (x[10] <= 0.3755499869585037) {
+                                    return [1.0, 0.0];
+                                } else {
+                                    return [0.0, 1.0];
+                                }
+                            }
+                        }
+                    } else {
+                        return [0.0, 1.0];
+                    }
+                }
+            }
+        } else {
+            if (x[7] <= 0.050084998831152916) {
+                if (x[21] <= 28.97000026702881) {
+                    if (x[7] <= 0.028020000085234642) {
+                        return [0.5, 0.5];
+                    } else {
+                        return [1.0, 0.0];
+                    }
+                } else {
+                    return [0.0, 1.0];
+                }
+            } else {
+                return [0.0, 1.0];
+            }
+        }
+    }
+
+    /**
+     * Classe predita de uma amostra
+     */
+    static predict(row) {
+        const proba = CompiledTreeModel.predictProba(row);
+        if (CompiledTreeModel.threshold !== null) {
+            return CompiledTreeModel.classes[proba[proba.length - 1] >= CompiledTreeModel.threshold ? 1 : 0];
+        }
+        return CompiledTreeModel.classes[proba.indexOf(Math.max(...proba))];
+    }
+
+    /**
+     * Predição a partir de um objeto {nome_da_feature: valor}
+     */
+    static predictFromObject(values) {
+        return CompiledTreeModel.predict(CompiledTreeModel.featureNames.map(name => Number(values[name])));
+    }
+}
+
+CompiledTreeModel.featureNames = ['radius1', 'texture1', 'perimeter1', 'area1', 'smoothness1', 'compactness1', 'concavity1', 'concave_points1', 'symmetry1', 'fractal_dimension1', 'radius2', 'texture2', 'perimeter2', 'area2', 'smoothness2', 'compactness2', 'concavity2', 'concave_points2', 'symmetry2', 'fractal_dimension2', 'radius3', 'texture3', 'perimeter3', 'area3', 'smoothness3', 'compactness3', 'concavity3', 'concave_points3', 'symmetry3', 'fractal_dimension3'];
+CompiledTreeModel.classes = [0, 1];
+CompiledTreeModel.threshold = 0.25;
+CompiledTreeModel.example = [11.41, 10.82, 73.34, 403.3, 0.09373, 0.06685, 0.03512, 0.02623, 0.1667, 0.06113, 0.1408, 0.4607, 1.103, 10.5, 0.00604, 0.01529, 0.01514, 0.00646, 0.01344, 0.002206, 12.82, 15.97, 83.74, 510.5, 0.1548, 0.239, 0.2102, 0.08958, 0.3016, 0.08523];
+
+// Exportar para uso global
+window.CompiledTreeModel = CompiledTreeModel;
@@ -10,6 +10,7 @@ class UIManager {
         this.initializeEventListeners();
         this.initializeFormValidation();
         this.initializePreview();
+        this.initializeProgressListener();
     }
 
     /**
@@ -377,6 +378,56 @@ class UIManager {
         this.updateMetrics();
     }
 
+    /**
+     * Progresso real do treinamento (eventos enviados pela API durante o processamento)
+     */
+    initializeProgressListener() {
+        window.addEventListener('trainingProgress', (event) => this.handleTrainingProgress(event.detail));
+    }
+
+    /**
+     * Atualizar etapas, barra de progresso e métricas parciais a partir de um evento
+     */
+    handleTrainingProgress(event) {
+        // Etapa da interface concluída por cada evento do servidor
+        const completedSteps = {
+            dataset_loaded: 1,
+            split_done: 2,
+            validation_done: 2,
+            training_started: 2,
+            model_trained: 3,
+            evaluation_done: 4,
+            explanations_done: 4
+        };
+        const stepNames = ['Carregando Dataset', 'Preparando Dados', 'Treinando Modelo', 'Avaliando Performance'];
+
+        const completed = completedSteps[event.stage];
+        if (completed !== undefined) {
+            stepNames.forEach((name, i) => {
+                const stepElement = document.getElementById(`step${i + 1}`);
+                if (!stepElement) return;
+                stepElement.classList.toggle('completed', i < completed);
+                stepElement.classList.toggle('active', i === completed);
+            });
+
+            const trainingStatus = document.getElementById('trainingStatus');
+            if (trainingStatus) {
+                trainingStatus.textContent = stepNames[Math.min(completed, stepNames.length - 1)];
+                trainingStatus.className = 'progress-status active';
+            }
+        }
+
+        const progressFill = document.getElementById('progressFill');
+        if (progressFill && typeof event.progress === 'number') {
+            progressFill.style.width = `${Math.round(event.progress * 100)}%`;
+        }
+
+        // Métricas exibidas assim que a avaliação termina (antes das etapas opcionais)
+        if (event.stage === 'evaluation_done') {
+            this.updateMetrics(event.metrics);
+        }
+    }
+
     /**
      * Adicionar log
      */
@@ -394,10 +445,14 @@ class UIManager {
     }
 
     /**
-     * Atualizar métricas simuladas
+     * Atualizar métricas (valores da API em %, ou simuladas se não informadas)
      */
-    updateMetrics() {
-        const metrics = {
+    updateMetrics(apiMetrics = null) {
+        const metrics = apiMetrics ? Object.fromEntries(
+            ['accuracy', 'precision', 'recall', 'f1Score', 'sensitivity', 'specificity', 'ppv', 'npv']
+                .filter(key => typeof apiMetrics[key] === 'number')
+                .map(key => [key === 'f1Score' ? 'f1' : key, `${apiMetrics[key].toFixed(1)}%`])
+        ) : {
             accuracy: '95.6%',
             precision: '100.0%',
             recall: '88.1%',
@@ -416,7 +471,9 @@ class UIManager {
         });
 
         // Atualizar estatísticas do dataset
-        this.updateDatasetStats();
+        if (!apiMetrics) {
+            this.updateDatasetStats();
+        }
     }
 
     /**
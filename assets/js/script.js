@@ -38,6 +38,9 @@ document.addEventListener('DOMContentLoaded', function() {
     // Configurar tema
     initializeTheme();
     
+    // Carregar números reais do modelo salvo (sem treinamento)
+    loadPrecomputedDashboard();
+    
     console.log('✅ Aplicação inicializada com sucesso!');
 });
 
@@ -58,6 +61,9 @@ function initializeManagers() {
         chartsManager = new ChartsManager();
         console.log('✅ Charts Manager inicializado');
         
+        // Modelo compilado (inferência no navegador, sem servidor)
+        setupLocalPrediction();
+        
         // Conectar gerenciadores
         connectManagers();
         
@@ -118,6 +124,118 @@ function connectManagers() {
     });
 }
 
+/**
+ * Carregar dados pré-calculados do dashboard
+ */
+async function loadPrecomputedDashboard() {
+    if (!apiManager || !chartsManager) return;
+    
+    try {
+        const payload = await apiManager.loadPrecomputedDashboard();
+        const results = payload.results;
+        
+        updateMetricsDisplay(results.metrics);
+        updateDatasetStats(payload.dataset);
+        
+        chartsManager.updateClassDistribution(payload.dataset.classes.benign, payload.dataset.classes.malignant);
+        chartsManager.updateConfusionMatrix(results.confusionMatrix);
+        chartsManager.updateFeatureImportance(results.featureImportance.features, results.featureImportance.importance);
+        chartsManager.updateROCCurve(results.rocCurve, results.metrics.auc);
+        
+        console.log(`✅ Dashboard pré-calculado carregado (modelo ${payload.model.version})`);
+    } catch (error) {
+        console.warn('⚠️ Dashboard pré-calculado indisponível:', error.message);
+    }
+}
+
+/**
+ * Configurar predição local com o modelo compilado
+ */
+function setupLocalPrediction() {
+    const form = document.getElementById('predictionForm');
+    const section = document.getElementById('prediction');
+    if (!form) return;
+    
+    if (typeof CompiledTreeModel === 'undefined') {
+        console.warn('⚠️ Modelo compilado não carregado - predição local indisponível');
+        if (section) section.style.display = 'none';
+        return;
+    }
+    
+    const featureNames = CompiledTreeModel.featureNames;
+    const input = document.getElementById('predictionFeatures');
+    const help = document.getElementById('predictionHelp');
+    if (help) {
+        help.textContent = `${featureNames.length} valores na ordem: ${featureNames.join(', ')}`;
+    }
+    
+    const exampleBtn = document.getElementById('predictionExampleBtn');
+    if (exampleBtn) {
+        exampleBtn.disabled = !CompiledTreeModel.example;
+        exampleBtn.addEventListener('click', function() {
+            input.value = CompiledTreeModel.example.join(', ');
+            clearFieldErrors(input);
+            input.classList.remove('error');
+        });
+    }
+    
+    form.addEventListener('submit', function(e) {
+        e.preventDefault();
+        clearFieldErrors(input);
+        input.classList.remove('error');
+        
+        try {
+            const prediction = predictLocally(input.value);
+            updatePredictionDisplay(prediction);
+        } catch (error) {
+            showFieldError(input, error.message);
+        }
+    });
+    
+    console.log('✅ Modelo compilado disponível para inferência local');
+}
+
+/**
+ * Classificar uma amostra (texto com valores separados por vírgula) no navegador
+ */
+function predictLocally(text) {
+    const featureNames = CompiledTreeModel.featureNames;
+    const values = text.split(/[,;\s]+/).filter(value => value !== '').map(Number);
+    
+    if (values.length !== featureNames.length) {
+        throw new Error(`Informe ${featureNames.length} valores (recebidos ${values.length})`);
+    }
+    if (values.some(value => !Number.isFinite(value))) {
+        throw new Error('Todos os valores devem ser numéricos');
+    }
+    
+    const proba = CompiledTreeModel.predictProba(values);
+    return {
+        label: CompiledTreeModel.predict(values),
+        malignantProba: proba[proba.length - 1],
+        threshold: CompiledTreeModel.threshold
+    };
+}
+
+/**
+ * Atualizar exibição da predição local
+ */
+function updatePredictionDisplay(prediction) {
+    const labels = { 0: 'Benigno', 1: 'Maligno' };
+    const fields = {
+        'predictionClass': labels[prediction.label] || String(prediction.label),
+        'predictionProba': (prediction.malignantProba * 100).toFixed(1) + '%',
+        'predictionThreshold': prediction.threshold === null ? '50% (padrão)' : (prediction.threshold * 100).toFixed(1) + '%'
+    };
+    
+    Object.entries(fields).forEach(([id, value]) => {
+        const element = document.getElementById(id);
+        if (element) {
+            element.textContent = value;
+        }
+    });
+}
+
 /**
  * Atualizar UI com resultados
  */
@@ -206,7 +324,7 @@ function updateCharts(visualizations) {
         
         // Atualizar curva ROC
         if (visualizations.rocCurve) {
-            chartsManager.updateROCCurve(visualizations.rocCurve, 0.94);
+            chartsManager.updateROCCurve(visualizations.rocCurve, visualizations.rocAuc || 0.94);
         }
         
         // Criar visualização da árvore
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Suíte de benchmarks determinísticos do pipeline, do treinamento e da inferência
+(dados sintéticos com o mesmo formato de breast_cancer_data.csv)
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import contextlib
+import urllib.request
+from functools import partial
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.model_selection import GridSearchCV
+from sklearn.metrics import (
+    accuracy_score, precision_score, recall_score, f1_score,
+    confusion_matrix, roc_curve, auc, precision_recall_curve
+)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src', 'scripts'))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api'))
+
+import prepare_data
+from build_decision_tree import PARAM_GRID
+from threshold_optimization import sweep_thresholds
+
+REFERENCE_CSV = os.path.join(ROOT_DIR, 'src', 'data', 'breast_cancer_data.csv')
+RESULTS_DIR = os.path.join(ROOT_DIR, 'benchmarks', 'results')
+SEED = 42
+
+def make_synthetic_dataset(n_rows, seed=SEED, chunk_size=1_000_000):
+    """Gera um dataset sintético com as colunas e estatísticas por classe do original"""
+    reference = pd.read_csv(REFERENCE_CSV)
+    feature_names = [c for c in reference.columns if c != 'Diagnosis']
+    malignant_rate = (reference['Diagnosis'] == 'M').mean()
+
+    stats = {
+        label: (group[feature_names].mean().values, group[feature_names].std().values)
+        for label, group in reference.groupby('Diagnosis')
+    }
+
+    rng = np.random.default_rng(seed)
+    chunks = []
+    for start in range(0, n_rows, chunk_size):
+        size = min(chunk_size, n_rows - start)
+        malignant = rng.random(size) < malignant_rate
+        mean = np.where(malignant[:, None], stats['M'][0], stats['B'][0])
+        std = np.where(malignant[:, None], stats['M'][1], stats['B'][1])
+        values = np.abs(rng.normal(mean, std))  # Todas as medidas são positivas
+        chunk = pd.DataFrame(values, columns=feature_names)
+        chunk['Diagnosis'] = np.where(malignant, 'M', 'B')
+        chunks.append(chunk)
+
+    return pd.concat(chunks, ignore_index=True)
+
+def machine_info():
+    """Informações da máquina e das versões usadas no benchmark"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'scikit-learn': sklearn.__version__,
+        'git_commit': commit
+    }
+
+def time_stage(function, repeats):
+    """Executa a etapa várias vezes e retorna as estatísticas de tempo"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return {
+        'min_s': min(timings),
+        'median_s': float(np.median(timings)),
+        'mean_s': float(np.mean(timings)),
+        'repeats': repeats
+    }
+
+@contextlib.contextmanager
+def working_directory(path):
+    """Muda temporariamente o diretório de trabalho"""
+    original = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(original)
+
+@contextlib.contextmanager
+def local_server(handler_class):
+    """Servidor HTTP local em uma thread (substituto do ambiente de deploy)"""
+    server = HTTPServer(('127.0.0.1', 0), handler_class)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+class QuietFileHandler(SimpleHTTPRequestHandler):
+    """Servidor de arquivos estáticos sem log por requisição"""
+    def log_message(self, format, *args):
+        pass
+
+def benchmark_size(n_rows, repeats, stages, grid_max_rows, workdir):
+    """Executa todas as etapas para um tamanho de dataset"""
+    from train import handler as api_handler
+
+    data = make_synthetic_dataset(n_rows)
+    csv_path = os.path.join(workdir, 'breast_cancer_data.csv')
+    data.to_csv(csv_path, index=False)
+
+    X = data.drop('Diagnosis', axis=1).values
+    y = (data['Diagnosis'] == 'M').astype(int).values
+    split = int(n_rows * 0.8)
+    X_train, X_test, y_train, y_test = X[:split], X[split:], y[:split], y[split:]
+
+    model = DecisionTreeClassifier(random_state=SEED, max_depth=7,
+                                   min_samples_split=5, min_samples_leaf=2)
+    model.fit(X_train, y_train)
+    y_pred = model.predict(X_test)
+    y_pred_proba = model.predict_proba(X_test)[:, 1]
+
+    def run_prepare_data():
+        with working_directory(workdir):
+            prepare_data.prepare_data()
+
+    def run_prepare_data_lean():
+        with working_directory(workdir):
+            prepare_data.prepare_data_lean()
+
+    def run_grid_search():
+        GridSearchCV(DecisionTreeClassifier(random_state=SEED), PARAM_GRID,
+                     cv=5, scoring='accuracy', n_jobs=-1).fit(X_train, y_train)
+
+    def run_fit():
+        DecisionTreeClassifier(random_state=SEED, max_depth=7, min_samples_split=5,
+                               min_samples_leaf=2).fit(X_train, y_train)
+
+    def run_metrics():
+        accuracy_score(y_test, y_pred)
+        precision_score(y_test, y_pred)
+        recall_score(y_test, y_pred)
+        f1_score(y_test, y_pred)
+        confusion_matrix(y_test, y_pred)
+        fpr, tpr, _ = roc_curve(y_test, y_pred_proba)
+        auc(fpr, tpr)
+        precision_recall_curve(y_test, y_pred_proba)
+        sweep_thresholds(y_test, y_pred_proba)
+
+    def run_api_train():
+        file_handler = partial(QuietFileHandler, directory=workdir)
+        with local_server(file_handler) as files_url, local_server(api_handler) as api_url:
+            config = {
+                'datasetUrl': f"{files_url}/breast_cancer_data.csv",
+                'trainSize': 80, 'criterion': 'entropy', 'maxDepth': 7,
+                'minSamplesSplit': 5, 'minSamplesLeaf': 2
+            }
+            request = urllib.request.Request(
+                f"{api_url}/api/train", data=json.dumps(config).encode('utf-8'),
+                headers={'Content-Type': 'application/json'}, method='POST'
+            )
+            with urllib.request.urlopen(request) as response:
+                result = json.loads(response.read().decode('utf-8'))
+            if not result.get('success'):
+                raise RuntimeError(result.get('error'))
+
+    available = {
+        'prepare_data': run_prepare_data,
+        'prepare_data_lean': run_prepare_data_lean,
+        'grid_search': run_grid_search,
+        'fit': run_fit,
+        'predict': lambda: model.predict(X_test),
+        'predict_proba': lambda: model.predict_proba(X_test),
+        'metrics': run_metrics,
+        'api_train': run_api_train
+    }
+
+    results = {}
+    for stage in stages:
+        if stage == 'grid_search' and n_rows > grid_max_rows:
+            print(f"  {stage:<18} ignorado (> {grid_max_rows} linhas)")
+            continue
+        timing = time_stage(available[stage], repeats)
+        timing['rows_per_s'] = n_rows / timing['median_s'] if timing['median_s'] > 0 else None
+        results[stage] = timing
+        print(f"  {stage:<18} mediana {timing['median_s']:.4f}s (mín {timing['min_s']:.4f}s)")
+    return results
+
+def compare_with_baseline(results, baseline, tolerance):
+    """Lista as etapas mais lentas que o baseline além da tolerância"""
+    regressions = []
+    for size, stages in results['results'].items():
+        for stage, timing in stages.items():
+            reference = baseline.get('results', {}).get(size, {}).get(stage)
+            if reference is None:
+                continue
+            ratio = timing['median_s'] / reference['median_s'] if reference['median_s'] > 0 else 1.0
+            if ratio > 1 + tolerance:
+                regressions.append({
+                    'rows': size, 'stage': stage, 'ratio': ratio,
+                    'baseline_s': reference['median_s'], 'current_s': timing['median_s']
+                })
+    return regressions
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                        help='Número de linhas dos datasets sintéticos (até 10^7)')
+    parser.add_argument('--stages', nargs='+',
+                        default=['prepare_data', 'prepare_data_lean', 'grid_search', 'fit', 'predict',
+                                 'predict_proba', 'metrics', 'api_train'])
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--grid-max-rows', type=int, default=100_000,
+                        help='Maior dataset em que a busca em grade é executada')
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'latest.json'))
+    parser.add_argument('--baseline', default=os.path.join(RESULTS_DIR, 'baseline.json'))
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Salva os resultados como novo baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Aumento relativo de tempo considerado regressão')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+
+    print("=== BENCHMARKS DO PIPELINE ===")
+    results = {'machine': machine_info(), 'seed': SEED, 'results': {}}
+
+    workdir = tempfile.mkdtemp(prefix='benchmark_')
+    try:
+        for n_rows in args.sizes:
+            print(f"\nDataset sintético com {n_rows} linhas:")
+            results['results'][str(n_rows)] = benchmark_size(
+                n_rows, args.repeats, args.stages, args.grid_max_rows, workdir
+            )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResultados salvos em '{args.output}'")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline salvo em '{args.baseline}'")
+        return True
+
+    if not os.path.exists(args.baseline):
+        print("Nenhum baseline encontrado (use --save-baseline para criar)")
+        return True
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    regressions = compare_with_baseline(results, baseline, args.tolerance)
+
+    print(f"\n=== COMPARAÇÃO COM O BASELINE (tolerância {args.tolerance:.0%}) ===")
+    same_machine = all(baseline.get('machine', {}).get(key) == value
+                       for key, value in results['machine'].items() if key != 'git_commit')
+    if not same_machine:
+        print("⚠️  Baseline gerado em outra máquina/versão - compare com cautela")
+    if not regressions:
+        print("✅ Nenhuma regressão encontrada")
+    for item in regressions:
+        print(f"❌ {item['stage']} ({item['rows']} linhas): {item['current_s']:.4f}s "
+              f"vs {item['baseline_s']:.4f}s ({item['ratio']:.2f}x)")
+
+    return not (regressions and args.fail_on_regression)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -6,11 +6,12 @@ Script principal para executar todo o pipeline do projeto
 
 import os
 import sys
+import argparse
 import subprocess
 from pathlib import Path
 
-def run_script(script_path, description):
-    """Executa um script Python e exibe o status"""
+def run_script(script_path, description, args=()):
+    """Executa um script Python (com argumentos opcionais) e exibe o status"""
     print(f"\n{'='*60}")
     print(f"🔄 {description}")
     print(f"{'='*60}")
@@ -24,7 +25,7 @@ def run_script(script_path, description):
             os.chdir(script_dir)
         
         # Executar o script
-        result = subprocess.run([sys.executable, os.path.basename(script_path)], 
+        result = subprocess.run([sys.executable, os.path.basename(script_path), *args], 
                               capture_output=True, text=True)
         
         # Voltar ao diretório original
@@ -45,11 +46,63 @@ def run_script(script_path, description):
     
     return True
 
+def run_multi_seed(n_seeds, first_seed=42, n_workers=None, compare_sequential=False):
+    """Executa preparação, construção e avaliação para várias seeds em paralelo"""
+    print(f"\n{'='*60}")
+    print(f"🔄 Executando o pipeline para {n_seeds} seeds")
+    print(f"{'='*60}")
+    
+    if not Path('src/data/breast_cancer_data.csv').exists():
+        print("❌ Dataset não encontrado: src/data/breast_cancer_data.csv")
+        return False
+    
+    # Os módulos do pipeline usam caminhos relativos a src/scripts
+    original_dir = os.getcwd()
+    sys.path.insert(0, os.path.abspath('src/scripts'))
+    os.chdir('src/scripts')
+    try:
+        from multi_seed import run_seeds, aggregate, format_report, write_report
+        
+        seeds = list(range(first_seed, first_seed + n_seeds))
+        run = run_seeds(seeds, n_workers)
+        sequential = run_seeds(seeds, n_workers=1) if compare_sequential else None
+        
+        section = format_report(run, aggregate(run['results']), sequential)
+        print(section)
+        write_report(section)
+    except Exception as e:
+        print(f"❌ Erro na execução com várias seeds: {str(e)}")
+        return False
+    finally:
+        os.chdir(original_dir)
+    
+    print(f"✅ {n_seeds} seeds executadas com sucesso")
+    print(f"   • Relatório: src/data/multi_seed_report.txt")
+    return True
+
+def parse_args():
+    """Argumentos da linha de comando"""
+    parser = argparse.ArgumentParser(description='Executa o pipeline completo do projeto')
+    parser.add_argument('--seeds', type=int, default=None,
+                        help='Executa preparação, construção e avaliação para N seeds em paralelo')
+    parser.add_argument('--first-seed', type=int, default=42, help='Primeira seed (padrão: 42)')
+    parser.add_argument('--workers', type=int, default=None, help='Processos do pool (padrão: nº de CPUs)')
+    parser.add_argument('--compare-sequential', action='store_true',
+                        help='Mede também a execução sequencial das mesmas seeds')
+    parser.add_argument('--selected', action='store_true',
+                        help='Prepara os dados só com as features de selected_features.json')
+    return parser.parse_args()
+
 def main():
     """Função principal"""
     print("🧬 ÁRVORE DE DECISÃO PARA CLASSIFICAÇÃO DE CÂNCER DE MAMA")
     print("👨‍🎓 Autor: Kalleby Evangelho")
     print("🏫 UFN 2025 - IA em Saúde - Engenharia Biomédica")
+    
+    args = parse_args()
+    if args.seeds:
+        return run_multi_seed(args.seeds, args.first_seed, args.workers, args.compare_sequential)
+    
     print("\n🚀 Iniciando execução completa do projeto...")
     
     # Definir scripts na ordem de execução
@@ -60,7 +113,8 @@ def main():
         },
         {
             'path': 'src/scripts/prepare_data.py',
-            'description': 'Preparando e analisando dados'
+            'description': 'Preparando e analisando dados',
+            'args': ['--selected'] if args.selected else []
         },
         {
             'path': 'src/scripts/build_decision_tree.py',
@@ -69,6 +123,11 @@ def main():
         {
             'path': 'src/scripts/evaluate_model.py',
             'description': 'Avaliando modelo e gerando relatórios'
+        },
+        {
+            # Depois da avaliação: o dashboard usa o limiar salvo no modelo
+            'path': 'src/scripts/build_dashboard_payloads.py',
+            'description': 'Pré-calculando os dados do dashboard'
         }
     ]
     
@@ -81,7 +140,7 @@ def main():
     # Executar scripts sequencialmente
     success_count = 0
     for script in scripts:
-        if run_script(script['path'], script['description']):
+        if run_script(script['path'], script['description'], script.get('args', ())):
             success_count += 1
         else:
             print(f"\n❌ Falha na execução. Parando pipeline.")
@@ -100,6 +159,7 @@ def main():
         print(f"   • Dados processados: src/data/")
         print(f"   • Visualizações: assets/images/")
         print(f"   • Relatórios: src/data/evaluation_report.txt")
+        print(f"   • Dashboard: assets/data/dashboard-manifest.json")
         print(f"\n🌐 Para visualizar a landing page:")
         print(f"   • Abra o arquivo index.html em um navegador")
         print(f"   • Ou execute: python -m http.server 8000")
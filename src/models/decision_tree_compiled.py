@@ -0,0 +1,114 @@
+"""
+Árvore de decisão compilada (gerado por src/scripts/compile_tree.py - não editar)
+Inferência sem scikit-learn: if/else aninhados por amostra e tabela vetorizada (NumPy)
+"""
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional (apenas para lotes)
+    np = None
+
+FEATURE_NAMES = ['radius1', 'texture1', 'perimeter1', 'area1', 'smoothness1', 'compactness1', 'concavity1', 'concave_points1', 'symmetry1', 'fractal_dimension1', 'radius2', 'texture2', 'perimeter2', 'area2', 'smoothness2', 'compactness2', 'concavity2', 'concave_points2', 'symmetry2', 'fractal_dimension2', 'radius3', 'texture3', 'perimeter3', 'area3', 'smoothness3', 'compactness3', 'concavity3', 'concave_points3', 'symmetry3', 'fractal_dimension3']
+CLASSES = [0, 1]
+DECISION_THRESHOLD = 0.25
+MAX_DEPTH = 7
+
+# Tabela da árvore (usada na versão vetorizada)
+CHILDREN_LEFT = [1, 2, 3, 4, -1, 6, -1, -1, 9, -1, -1, 12, 13, -1, -1, 16, 17, -1, 19, -1, 21, -1, -1, -1, 25, 26, 27, -1, -1, -1, -1]
+CHILDREN_RIGHT = [24, 11, 8, 5, -1, 7, -1, -1, 10, -1, -1, 15, 14, -1, -1, 23, 18, -1, 20, -1, 22, -1, -1, -1, 30, 29, 28, -1, -1, -1, -1]
+FEATURE = [22, 27, 13, 21, -2, 27, -2, -2, 15, -2, -2, 21, 13, -2, -2, 7, 22, -2, 17, -2, 10, -2, -2, -2, 7, 21, 7, -2, -2, -2, -2]
+THRESHOLD = [114.45000076293945, 0.11099999770522118, 45.170000076293945, 33.35000038146973, -2.0, 0.092289999127388, -2.0, -2.0, 0.014274999964982271, -2.0, -2.0, 25.734999656677246, 33.39999961853027, -2.0, -2.0, 0.05491499975323677, 100.3499984741211, -2.0, 0.010521499905735254, -2.0, 0.3755499869585037, -2.0, -2.0, -2.0, 0.050084998831152916, 28.97000026702881, 0.028020000085234642, -2.0, -2.0, -2.0, -2.0]
+PROBA = [[0.6263736263736264, 0.37362637362637363], [0.9090909090909091, 0.09090909090909091], [0.9836734693877551, 0.0163265306122449], [0.9957983193277311, 0.004201680672268907], [1.0, 0.0], [0.9333333333333333, 0.06666666666666667], [1.0, 0.0], [0.5, 0.5], [0.5714285714285714, 0.42857142857142855], [0.0, 1.0], [1.0, 0.0], [0.6190476190476191, 0.38095238095238093], [0.9285714285714286, 0.07142857142857142], [1.0, 0.0], [0.5, 0.5], [0.37142857142857144, 0.6285714285714286], [0.65, 0.35], [1.0, 0.0], [0.36363636363636365, 0.6363636363636364], [0.0, 1.0], [0.6666666666666666, 0.3333333333333333], [1.0, 0.0], [0.0, 1.0], [0.0, 1.0], [0.034013605442176874, 0.9659863945578231], [0.4166666666666667, 0.5833333333333334], [0.8333333333333334, 0.16666666666666666], [0.5, 0.5], [1.0, 0.0], [0.0, 1.0], [0.0, 1.0]]
+
+def predict_proba_row(row):
+    """Probabilidades de uma amostra (lista de 30 valores)"""
+    x = array('f', row)  # float32, como o scikit-learn
+    if x[22] <= 114.45000076293945:
+        if x[27] <= 0.11099999770522118:
+            if x[13] <= 45.170000076293945:
+                if x[21] <= 33.35000038146973:
+                    return (1.0, 0.0)
+                else:
+                    if x[27] <= 0.092289999127388:
+                        return (1.0, 0.0)
+                    else:
+                        return (0.5, 0.5)
+            else:
+                if x[15] <= 0.014274999964982271:
+                    return (0.0, 1.0)
+                else:
+                    return (1.0, 0.0)
+        else:
+            if x[21] <= 25.734999656677246:
+                if x[13] <= 33.39999961853027:
+                    return (1.0, 0.0)
+                else:
+                    return (0.5, 0.5)
+            else:
+                if x[7] <= 0.05491499975323677:
+                    if x[22] <= 100.3499984741211:
+                        return (1.0, 0.0)
+                    else:
+                        if x[17] <= 0.010521499905735254:
+                            return (0.0, 1.0)
+                        else:
+                            if x[10] <= 0.3755499869585037:
+                                return (1.0, 0.0)
+                            else:
+                                return (0.0, 1.0)
+                else:
+                    return (0.0, 1.0)
+    else:
+        if x[7] <= 0.050084998831152916:
+            if x[21] <= 28.97000026702881:
+                if x[7] <= 0.028020000085234642:
+                    return (0.5, 0.5)
+                else:
+                    return (1.0, 0.0)
+            else:
+                return (0.0, 1.0)
+        else:
+            return (0.0, 1.0)
+
+def _decide(proba):
+    """Classe a partir das probabilidades (limiar salvo ou maior probabilidade)"""
+    if DECISION_THRESHOLD is not None:
+        return CLASSES[int(proba[-1] >= DECISION_THRESHOLD)]
+    return CLASSES[max(range(len(proba)), key=proba.__getitem__)]
+
+def predict_row(row):
+    """Classe predita de uma amostra"""
+    return _decide(predict_proba_row(row))
+
+def predict_proba(X):
+    """Probabilidades de um lote de amostras"""
+    if np is None:
+        return [predict_proba_row(row) for row in X]
+
+    X = np.asarray(X, dtype=np.float32)
+    left = np.asarray(CHILDREN_LEFT)
+    right = np.asarray(CHILDREN_RIGHT)
+    feature = np.maximum(np.asarray(FEATURE), 0)
+    threshold = np.asarray(THRESHOLD)
+    rows = np.arange(X.shape[0])
+
+    # Percorre a árvore nível a nível para todas as amostras ao mesmo tempo
+    node = np.zeros(X.shape[0], dtype=np.intp)
+    for _ in range(MAX_DEPTH):
+        go_left = X[rows, feature[node]] <= threshold[node]
+        next_node = np.where(go_left, left[node], right[node])
+        node = np.where(left[node] == -1, node, next_node)
+    return np.asarray(PROBA)[node]
+
+def predict(X):
+    """Classes preditas de um lote de amostras"""
+    if np is None:
+        return [predict_row(row) for row in X]
+
+    proba = predict_proba(X)
+    classes = np.asarray(CLASSES)
+    if DECISION_THRESHOLD is not None:
+        return classes[(proba[:, -1] >= DECISION_THRESHOLD).astype(int)]
+    return classes[proba.argmax(axis=1)]
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Script para pré-calcular os dados do dashboard da landing page a partir do modelo salvo
+(arquivos JSON estáticos com hash do conteúdo no nome)
+"""
+
+import os
+import glob
+import json
+import hashlib
+import numpy as np
+from sklearn.metrics import (
+    accuracy_score, precision_score, recall_score, f1_score,
+    confusion_matrix, roc_curve, auc, precision_recall_curve, average_precision_score
+)
+import joblib
+from permutation_importance import permutation_importance_fast, model_version
+from threshold_optimization import predict_with_threshold, get_threshold
+
+OUTPUT_DIR = '../../assets/data'
+MANIFEST_NAME = 'dashboard-manifest.json'
+
+def load_data_and_model():
+    """Carrega dados e modelo treinado"""
+    X_train = np.load('../data/X_train.npy')
+    X_test = np.load('../data/X_test.npy')
+    y_train = np.load('../data/y_train.npy')
+    y_test = np.load('../data/y_test.npy')
+
+    with open('../data/feature_names.txt', 'r') as f:
+        feature_names = [line.strip() for line in f.readlines()]
+
+    model = joblib.load('../models/decision_tree_model.pkl')
+
+    return X_train, X_test, y_train, y_test, feature_names, model
+
+def percent(value):
+    """Valor em porcentagem arredondado (como exibido na página)"""
+    return round(float(value) * 100, 1)
+
+def build_payload(X_train, X_test, y_train, y_test, feature_names, model, top_n=10):
+    """Monta os dados do dashboard no formato consumido por api.js/script.js"""
+    y_pred_proba = model.predict_proba(X_test)[:, 1]
+    y_pred = predict_with_threshold(model, X_test, y_pred_proba)
+
+    cm = confusion_matrix(y_test, y_pred)
+    tn, fp, fn, tp = cm.ravel()
+
+    fpr, tpr, _ = roc_curve(y_test, y_pred_proba)
+    precision_curve, recall_curve, _ = precision_recall_curve(y_test, y_pred_proba)
+
+    # Importâncias (impureza e permutação) das top features
+    order = np.argsort(-model.feature_importances_)[:top_n]
+    permutation = permutation_importance_fast(model, X_test, y_test, feature_names)
+    permutation_order = np.argsort(-np.asarray(permutation['importance_mean']))[:top_n]
+
+    y_all = np.concatenate([y_train, y_test])
+    threshold = get_threshold(model)
+    params = model.get_params()
+
+    return {
+        'dataset': {
+            'name': 'Breast Cancer Wisconsin (Diagnostic)',
+            'samples': int(len(y_all)),
+            'features': len(feature_names),
+            'classes': {
+                'benign': int((y_all == 0).sum()),
+                'malignant': int((y_all == 1).sum())
+            }
+        },
+        'data': {
+            'trainSamples': int(len(y_train)),
+            'testSamples': int(len(y_test)),
+            'features': len(feature_names)
+        },
+        'model': {
+            'algorithm': 'Decision Tree',
+            'version': model_version(model),
+            'parameters': {
+                'criterion': params['criterion'],
+                'maxDepth': params['max_depth'],
+                'minSamplesSplit': params['min_samples_split'],
+                'minSamplesLeaf': params['min_samples_leaf']
+            },
+            'threshold': threshold
+        },
+        'results': {
+            'metrics': {
+                'accuracy': percent(accuracy_score(y_test, y_pred)),
+                'precision': percent(precision_score(y_test, y_pred, zero_division=0)),
+                'recall': percent(recall_score(y_test, y_pred)),
+                'f1Score': percent(f1_score(y_test, y_pred)),
+                'sensitivity': percent(tp / (tp + fn) if (tp + fn) > 0 else 0),
+                'specificity': percent(tn / (tn + fp) if (tn + fp) > 0 else 0),
+                'ppv': percent(tp / (tp + fp) if (tp + fp) > 0 else 0),
+                'npv': percent(tn / (tn + fn) if (tn + fn) > 0 else 0),
+                'auc': round(float(auc(fpr, tpr)), 4),
+                'averagePrecision': round(float(average_precision_score(y_test, y_pred_proba)), 4)
+            },
+            'confusionMatrix': cm.tolist(),
+            'rocCurve': [{'x': round(float(x), 4), 'y': round(float(y), 4)} for x, y in zip(fpr, tpr)],
+            'prCurve': [{'x': round(float(x), 4), 'y': round(float(y), 4)}
+                        for x, y in zip(recall_curve, precision_curve)],
+            'featureImportance': {
+                'features': [feature_names[i] for i in order],
+                'importance': [round(float(model.feature_importances_[i]) * 100, 2) for i in order]
+            },
+            'permutationImportance': {
+                'features': [feature_names[i] for i in permutation_order],
+                'importance': [round(permutation['importance_mean'][i] * 100, 2) for i in permutation_order]
+            },
+            'treeStats': {
+                'depth': int(model.get_depth()),
+                'leaves': int(model.get_n_leaves()),
+                'nodes': int(model.tree_.node_count)
+            }
+        }
+    }
+
+def write_payload(payload, output_dir=OUTPUT_DIR):
+    """Salva o JSON com hash do conteúdo no nome e atualiza o manifesto"""
+    os.makedirs(output_dir, exist_ok=True)
+
+    content = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:12]
+    filename = f"dashboard.{digest}.json"
+
+    # Remover versões anteriores (o manifesto sempre aponta para a atual)
+    for old_file in glob.glob(os.path.join(output_dir, 'dashboard.*.json')):
+        if os.path.basename(old_file) != filename:
+            os.remove(old_file)
+
+    with open(os.path.join(output_dir, filename), 'w', encoding='utf-8') as f:
+        f.write(content)
+
+    # O manifesto é pequeno e revalidado a cada acesso (ver vercel.json)
+    manifest = {'payload': f"assets/data/{filename}", 'modelVersion': payload['model']['version']}
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"Dados do dashboard salvos em '{os.path.join(output_dir, filename)}'")
+    return filename
+
+if __name__ == "__main__":
+    print("=== PRÉ-CÁLCULO DOS DADOS DO DASHBOARD ===")
+    X_train, X_test, y_train, y_test, feature_names, model = load_data_and_model()
+    payload = build_payload(X_train, X_test, y_train, y_test, feature_names, model)
+
+    print(f"Acurácia: {payload['results']['metrics']['accuracy']}%")
+    print(f"AUC-ROC: {payload['results']['metrics']['auc']}")
+    write_payload(payload)
@@ -3,14 +3,28 @@
 Script para construir e treinar a árvore de decisão para classificação de câncer de mama
 """
 
+import sys
+import json
 import numpy as np
 import pandas as pd
 from sklearn.tree import DecisionTreeClassifier, plot_tree, export_text
-from sklearn.model_selection import GridSearchCV, cross_val_score
+from sklearn.model_selection import cross_val_score
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 import matplotlib.pyplot as plt
 import seaborn as sns
 import joblib
+from permutation_importance import permutation_importance_fast, importance_to_dataframe
+from shared_grid_search import shared_grid_search
+from learning_curves import learning_curve, plot_learning_curve
+from prepare_data import seed_argument
+
+# Parâmetros para busca em grade
+PARAM_GRID = {
+    'max_depth': [3, 5, 7, 10, None],
+    'min_samples_split': [2, 5, 10],
+    'min_samples_leaf': [1, 2, 4],
+    'criterion': ['gini', 'entropy']
+}
 
 def load_prepared_data():
     """Carrega os dados preparados"""
@@ -25,8 +39,8 @@ def load_prepared_data():
     
     return X_train, X_test, y_train, y_test, feature_names
 
-def build_decision_tree():
-    """Constrói e treina a árvore de decisão"""
+def build_decision_tree(random_state=42, n_jobs=-1):
+    """Constrói e treina a árvore de decisão (n_jobs: processos da busca em grade)"""
     print("=== CONSTRUÇÃO DA ÁRVORE DE DECISÃO ===")
     
     # Carregar dados
@@ -36,30 +50,22 @@ def build_decision_tree():
     print(f"Dados de teste: {X_test.shape}")
     print(f"Features: {len(feature_names)}")
     
-    # Definir parâmetros para busca em grade
-    param_grid = {
-        'max_depth': [3, 5, 7, 10, None],
-        'min_samples_split': [2, 5, 10],
-        'min_samples_leaf': [1, 2, 4],
-        'criterion': ['gini', 'entropy']
-    }
-    
     # Criar modelo base
-    dt_base = DecisionTreeClassifier(random_state=42)
+    dt_base = DecisionTreeClassifier(random_state=random_state)
     
-    # Busca em grade com validação cruzada
+    # Busca em grade com validação cruzada (dados e folds compartilhados entre os workers)
     print("\nRealizando busca em grade para otimização de hiperparâmetros...")
-    grid_search = GridSearchCV(
+    grid_search = shared_grid_search(
         dt_base, 
-        param_grid, 
-        cv=5, 
+        PARAM_GRID, 
+        X_train, 
+        y_train, 
+        n_splits=5, 
         scoring='accuracy',
-        n_jobs=-1,
+        n_jobs=n_jobs,
         verbose=1
     )
     
-    grid_search.fit(X_train, y_train)
-    
     print(f"Melhores parâmetros: {grid_search.best_params_}")
     print(f"Melhor score CV: {grid_search.best_score_:.4f}")
     
@@ -67,7 +73,7 @@ def build_decision_tree():
     best_dt = grid_search.best_estimator_
     
     # Treinar modelo simples para comparação
-    dt_simple = DecisionTreeClassifier(random_state=42, max_depth=5)
+    dt_simple = DecisionTreeClassifier(random_state=random_state, max_depth=5)
     dt_simple.fit(X_train, y_train)
     
     # Validação cruzada
@@ -106,6 +112,17 @@ def build_decision_tree():
     joblib.dump(final_model, '../models/decision_tree_model.pkl')
     print("Modelo salvo como '../models/decision_tree_model.pkl'")
     
+    # Salvar parâmetros e scores de validação cruzada (usados na seleção de features)
+    final_params = final_model.get_params()
+    with open('../data/best_params.json', 'w') as f:
+        json.dump({
+            'best_params': grid_search.best_params_,
+            'best_cv_score': float(grid_search.best_score_),
+            'final_model': model_name,
+            'final_params': {name: final_params[name] for name in PARAM_GRID},
+            'cv_scores': (cv_scores_best if final_model is best_dt else cv_scores_simple).tolist()
+        }, f, indent=2)
+    
     # Importância das features
     feature_importance = pd.DataFrame({
         'feature': feature_names,
@@ -118,6 +135,16 @@ def build_decision_tree():
     # Salvar importância das features
     feature_importance.to_csv('../data/feature_importance.csv', index=False)
     
+    # Importância por permutação (não enviesada para divisões de alta cardinalidade)
+    permutation_importance = importance_to_dataframe(
+        permutation_importance_fast(final_model, X_test, y_test, feature_names)
+    )
+    
+    print(f"\n=== TOP 10 FEATURES - IMPORTÂNCIA POR PERMUTAÇÃO ===")
+    print(permutation_importance.head(10))
+    
+    permutation_importance.to_csv('../data/permutation_importance.csv', index=False)
+    
     return final_model, y_pred_final, y_test, feature_names, feature_importance
 
 def create_visualizations(model, y_pred, y_test, feature_names, feature_importance):
@@ -187,9 +214,29 @@ def generate_text_tree(model, feature_names):
     
     print("Representação textual da árvore salva em 'decision_tree_text.txt'")
 
+def build_learning_curve(model):
+    """Curva de aprendizado (validação cruzada) com os parâmetros do modelo final"""
+    print("\n=== CURVA DE APRENDIZADO ===")
+    X_train, _, y_train, _, _ = load_prepared_data()
+    params = {name: model.get_params()[name] for name in PARAM_GRID}
+    
+    curve = learning_curve(X_train, y_train, params)
+    for size, train, test, std in zip(curve['train_sizes'], curve['train_scores_mean'],
+                                      curve['test_scores_mean'], curve['test_scores_std']):
+        print(f"{size:>5} amostras - treino: {train:.4f} | validação: {test:.4f} (+/- {std * 2:.4f})")
+    print(f"{curve['n_fits']} ajustes em {curve['total_time']:.2f}s ({curve['n_jobs']} processos)")
+    
+    with open('../data/learning_curve.json', 'w') as f:
+        json.dump(curve, f, indent=2)
+    plot_learning_curve(curve, '../../assets/images/learning_curve.png')
+    print("Curva de aprendizado salva em 'learning_curve.json' e 'learning_curve.png'")
+    return curve
+
 if __name__ == "__main__":
     # Construir modelo
-    model, y_pred, y_test, feature_names, feature_importance = build_decision_tree()
+    model, y_pred, y_test, feature_names, feature_importance = build_decision_tree(
+        random_state=seed_argument()
+    )
     
     # Criar visualizações
     create_visualizations(model, y_pred, y_test, feature_names, feature_importance)
@@ -197,6 +244,10 @@ if __name__ == "__main__":
     # Gerar árvore textual
     generate_text_tree(model, feature_names)
     
+    # Curva de aprendizado (opcional)
+    if '--learning-curve' in sys.argv:
+        build_learning_curve(model)
+    
     # Relatório de classificação
     print(f"\n=== RELATÓRIO DE CLASSIFICAÇÃO ===")
     print(classification_report(y_test, y_pred, target_names=['Benigno', 'Maligno']))
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Script para converter a árvore de decisão treinada em um formato compacto
+(índices int16/int32, features uint8, limiares float32 ou códigos de bin e
+probabilidades float32) para manter várias versões do modelo em memória
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+import joblib
+from permutation_importance import model_version
+
+COMPACT_OUTPUT = '../models/decision_tree_compact.bin'
+ALIGNMENT = 8
+
+def float32_round_down(values):
+    """Maior float32 <= valor (x32 <= t64 equivale a x32 <= t32 arredondado para baixo)"""
+    values = np.asarray(values, dtype=np.float64)
+    rounded = values.astype(np.float32)
+    above = rounded.astype(np.float64) > values
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+def _index_dtype(n):
+    """Menor tipo inteiro com sinal que comporta os índices (e -1 para folhas)"""
+    return np.int16 if n < np.iinfo(np.int16).max else np.int32
+
+class CompactTree:
+    """Árvore de decisão em arrays compactos
+
+    - folhas: children_left = -1 e children_right = índice da folha em `proba`/`leaf_class`
+    - limiares float32 arredondados para baixo (comparação idêntica à do scikit-learn)
+    - modo quantizado: limiar substituído pelo código do bin de cada feature (uint8/uint16)
+    """
+
+    def __init__(self, arrays, metadata):
+        self.arrays = arrays
+        self.metadata = metadata
+        self.children_left = arrays['children_left']
+        self.children_right = arrays['children_right']
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.proba = arrays['proba']
+        self.leaf_class = arrays['leaf_class']
+        self.classes = np.asarray(metadata['classes'])
+        self.quantized = metadata['quantized']
+        self.max_depth = metadata['max_depth']
+        if self.quantized:
+            offsets = arrays['bin_offsets']
+            self.bin_edges = [arrays['bin_edges'][offsets[f]:offsets[f + 1]]
+                              for f in range(len(offsets) - 1)]
+
+    @classmethod
+    def from_model(cls, model, quantized=False):
+        """Converte um DecisionTreeClassifier treinado
+
+        quantized: os bins de cada feature são os limiares distintos da própria árvore,
+        não bins construídos a partir dos dados de treino (ex.: quantis). Assim os
+        códigos reproduzem exatamente as decisões do modelo, sem erro de quantização.
+        """
+        tree = model.tree_
+        is_leaf = tree.children_left == -1
+        node_dtype = _index_dtype(tree.node_count)
+        n_features = int(model.n_features_in_)
+        feature_dtype = np.uint8 if n_features <= np.iinfo(np.uint8).max + 1 else np.uint16
+
+        # Probabilidades e classe de cada folha (decididas em float64, como no modelo original)
+        values = tree.value[is_leaf, 0, :]
+        proba64 = values / values.sum(axis=1, keepdims=True)
+        decision_threshold = getattr(model, 'decision_threshold_', None)
+        if decision_threshold is not None:
+            leaf_class = (proba64[:, -1] >= decision_threshold).astype(np.uint8)
+        else:
+            leaf_class = proba64.argmax(axis=1).astype(np.uint8)
+
+        children_left = tree.children_left.astype(node_dtype)
+        children_right = tree.children_right.astype(node_dtype)
+        children_right[is_leaf] = np.arange(is_leaf.sum(), dtype=node_dtype)
+        feature = np.where(is_leaf, 0, tree.feature).astype(feature_dtype)
+        threshold32 = np.where(is_leaf, 0, float32_round_down(tree.threshold)).astype(np.float32)
+
+        arrays = {
+            'children_left': children_left,
+            'children_right': children_right,
+            'feature': feature,
+            'proba': proba64.astype(np.float32),
+            'leaf_class': leaf_class
+        }
+
+        if quantized:
+            # Bins de cada feature = limiares distintos usados pela árvore (float32, ordenados)
+            edges = [np.unique(threshold32[~is_leaf & (tree.feature == f)]) for f in range(n_features)]
+            max_bins = max((len(e) for e in edges), default=0)
+            code_dtype = np.uint8 if max_bins <= np.iinfo(np.uint8).max else np.uint16
+            codes = np.zeros(tree.node_count, dtype=code_dtype)
+            for f, feature_edges in enumerate(edges):
+                nodes = ~is_leaf & (tree.feature == f)
+                codes[nodes] = np.searchsorted(feature_edges, threshold32[nodes])
+            arrays['threshold'] = codes
+            arrays['bin_edges'] = np.concatenate(edges).astype(np.float32) if edges else np.zeros(0, np.float32)
+            arrays['bin_offsets'] = np.concatenate([[0], np.cumsum([len(e) for e in edges])]).astype(np.int32)
+        else:
+            arrays['threshold'] = threshold32
+
+        metadata = {
+            'classes': model.classes_.tolist(),
+            'n_features': n_features,
+            'max_depth': int(model.get_depth()),
+            'quantized': quantized,
+            'decision_threshold': decision_threshold,
+            'model_version': model_version(model)
+        }
+        return cls(arrays, metadata)
+
+    def encode(self, X):
+        """Códigos de bin das amostras: nº de limiares da feature menores que o valor"""
+        X = np.asarray(X, dtype=np.float32)
+        max_bins = max((len(e) for e in self.bin_edges), default=0)
+        codes = np.zeros(X.shape, dtype=np.uint8 if max_bins <= np.iinfo(np.uint8).max else np.uint16)
+        for f, edges in enumerate(self.bin_edges):
+            if len(edges):
+                # x <= limiar[k]  <=>  código(x) <= k
+                codes[:, f] = np.searchsorted(edges, X[:, f], side='left')
+        return codes
+
+    def apply(self, X):
+        """Índice da folha (em `proba`) de cada amostra"""
+        X = self.encode(X) if self.quantized else np.asarray(X, dtype=np.float32)
+        rows = np.arange(X.shape[0])
+        is_leaf = self.children_left == -1
+
+        # Percorre a árvore nível a nível para todas as amostras ao mesmo tempo
+        node = np.zeros(X.shape[0], dtype=np.intp)
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            next_node = np.where(go_left, self.children_left[node], self.children_right[node])
+            node = np.where(is_leaf[node], node, next_node)
+        return self.children_right[node].astype(np.intp)
+
+    def predict_proba(self, X):
+        """Probabilidades (float32) de cada classe"""
+        return self.proba[self.apply(X)]
+
+    def predict(self, X):
+        """Classes preditas (mesma regra do modelo original, inclusive o limiar salvo)"""
+        return self.classes[self.leaf_class[self.apply(X)]]
+
+    def nbytes(self):
+        """Memória ocupada pelos arrays da árvore"""
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def save(self, path=COMPACT_OUTPUT):
+        """Salva em um único arquivo: tamanho do cabeçalho, cabeçalho JSON e arrays alinhados"""
+        layout, offset = {}, 0
+        for name, array in self.arrays.items():
+            offset = -(-offset // ALIGNMENT) * ALIGNMENT
+            layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+            offset += array.nbytes
+        header = json.dumps({'metadata': self.metadata, 'arrays': layout}).encode('utf-8')
+        start = -(-(4 + len(header)) // ALIGNMENT) * ALIGNMENT
+
+        buffer = bytearray(start + offset)
+        buffer[:4] = len(header).to_bytes(4, 'little')
+        buffer[4:4 + len(header)] = header
+        for name, array in self.arrays.items():
+            position = start + layout[name]['offset']
+            buffer[position:position + array.nbytes] = np.ascontiguousarray(array).tobytes()
+        with open(path, 'wb') as f:
+            f.write(buffer)
+
+    @classmethod
+    def load(cls, path=COMPACT_OUTPUT, mmap=False):
+        """Carrega uma árvore salva com save() (mmap=True compartilha as páginas entre processos)"""
+        if mmap:
+            buffer = np.memmap(path, dtype=np.uint8, mode='r')
+        else:
+            with open(path, 'rb') as f:
+                buffer = f.read()
+        header_size = int.from_bytes(bytes(buffer[:4]), 'little')
+        header = json.loads(bytes(buffer[4:4 + header_size]).decode('utf-8'))
+        start = -(-(4 + header_size) // ALIGNMENT) * ALIGNMENT
+
+        arrays = {}
+        for name, info in header['arrays'].items():
+            dtype = np.dtype(info['dtype'])
+            count = int(np.prod(info['shape']))
+            arrays[name] = np.frombuffer(
+                buffer, dtype=dtype, count=count, offset=start + info['offset']
+            ).reshape(info['shape'])
+        return cls(arrays, header['metadata'])
+
+def sklearn_tree_nbytes(model):
+    """Memória dos arrays internos da árvore do scikit-learn (nós + valores)"""
+    state = model.tree_.__getstate__()
+    return state['nodes'].nbytes + state['values'].nbytes
+
+def verify(model, compact, X):
+    """Confere se a árvore compacta reproduz exatamente as predições do modelo"""
+    from threshold_optimization import predict_with_threshold
+    X = np.asarray(X)
+    same_leaves = np.array_equal(
+        compact.proba[compact.apply(X)],
+        model.predict_proba(X).astype(np.float32)
+    )
+    same_predictions = np.array_equal(compact.predict(X), predict_with_threshold(model, X))
+    return same_leaves and same_predictions
+
+def _load_time(function, repeats=20):
+    """Tempo (mediana) de carregamento"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+def report(model_path, X_test, output_dir, synthetic_rows=100_000):
+    """Converte um modelo, verifica as predições e compara memória e tempo de carga"""
+    model = joblib.load(model_path)
+    name = os.path.splitext(os.path.basename(model_path))[0]
+    print(f"\nModelo: {model_path} ({model.tree_.node_count} nós, profundidade {model.get_depth()})")
+
+    rng = np.random.default_rng(42)
+    low, high = X_test.min(axis=0), X_test.max(axis=0)
+    X_synthetic = rng.uniform(low, high, size=(synthetic_rows, X_test.shape[1]))
+
+    pickle_load = _load_time(lambda: joblib.load(model_path))
+    print(f"  {'formato':<22} {'memória':>10} {'arquivo':>10} {'carga':>10}  verificação")
+    print(f"  {'scikit-learn (pickle)':<22} {sklearn_tree_nbytes(model) / 1024:>7.1f} KB "
+          f"{os.path.getsize(model_path) / 1024:>7.1f} KB {pickle_load * 1000:>7.2f} ms")
+
+    results = {}
+    for quantized in (False, True):
+        compact = CompactTree.from_model(model, quantized=quantized)
+        suffix = 'quantized' if quantized else 'compact'
+        path = os.path.join(output_dir, f"{name}_{suffix}.bin")
+        compact.save(path)
+        load_time = _load_time(lambda: CompactTree.load(path))
+
+        checks = [verify(model, CompactTree.load(path), X) for X in (X_test, X_synthetic)]
+        status = 'OK' if all(checks) else 'DIVERGENTE'
+        label = 'compacto (bins uint)' if quantized else 'compacto (float32)'
+        print(f"  {label:<22} {compact.nbytes() / 1024:>7.1f} KB "
+              f"{os.path.getsize(path) / 1024:>7.1f} KB {load_time * 1000:>7.2f} ms  "
+              f"{status} (teste + {synthetic_rows} sintéticas)")
+        results[suffix] = {'nbytes': compact.nbytes(), 'load_s': load_time, 'verified': all(checks)}
+
+    results['sklearn'] = {'nbytes': sklearn_tree_nbytes(model), 'load_s': pickle_load}
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('models', nargs='*', default=['../models/decision_tree_model.pkl'],
+                        help='Modelos (.pkl) a converter')
+    parser.add_argument('--output-dir', default='../models')
+    args = parser.parse_args()
+
+    print("=== ÁRVORE COMPACTA ===")
+    X_test = np.load('../data/X_test.npy')
+    results = [report(path, X_test, args.output_dir) for path in args.models]
+    verified = all(r['compact']['verified'] and r['quantized']['verified'] for r in results)
+    sys.exit(0 if verified else 1)
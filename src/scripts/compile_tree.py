@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Script para compilar a árvore de decisão treinada em código Python/NumPy e JavaScript
+(inferência sem scikit-learn/joblib)
+"""
+
+import os
+import sys
+import time
+import subprocess
+import importlib.util
+import numpy as np
+import joblib
+from threshold_optimization import predict_with_threshold
+
+PYTHON_OUTPUT = '../models/decision_tree_compiled.py'
+JAVASCRIPT_OUTPUT = '../../assets/js/modules/tree_model.js'
+
+def extract_tree(model):
+    """Extrai os arrays da árvore e as probabilidades normalizadas das folhas"""
+    tree = model.tree_
+    values = tree.value[:, 0, :]
+    return {
+        'children_left': tree.children_left.tolist(),
+        'children_right': tree.children_right.tolist(),
+        'feature': tree.feature.tolist(),
+        'threshold': tree.threshold.tolist(),
+        'proba': (values / values.sum(axis=1, keepdims=True)).tolist(),
+        'classes': model.classes_.tolist(),
+        'max_depth': int(model.get_depth()),
+        'decision_threshold': getattr(model, 'decision_threshold_', None)
+    }
+
+def _python_branches(tree, node, depth):
+    """Gera os if/else aninhados (Python) a partir de um nó"""
+    indent = '    ' * depth
+    if tree['children_left'][node] == -1:
+        return [f"{indent}return {tuple(tree['proba'][node])!r}"]
+    lines = [f"{indent}if x[{tree['feature'][node]}] <= {tree['threshold'][node]!r}:"]
+    lines += _python_branches(tree, tree['children_left'][node], depth + 1)
+    lines.append(f"{indent}else:")
+    lines += _python_branches(tree, tree['children_right'][node], depth + 1)
+    return lines
+
+def _javascript_branches(tree, node, depth):
+    """Gera os if/else aninhados (JavaScript) a partir de um nó"""
+    indent = '    ' * depth
+    if tree['children_left'][node] == -1:
+        return [f"{indent}return [{', '.join(repr(p) for p in tree['proba'][node])}];"]
+    lines = [f"{indent}if (x[{tree['feature'][node]}] <= {tree['threshold'][node]!r}) {{"]
+    lines += _javascript_branches(tree, tree['children_left'][node], depth + 1)
+    lines.append(f"{indent}}} else {{")
+    lines += _javascript_branches(tree, tree['children_right'][node], depth + 1)
+    lines.append(f"{indent}}}")
+    return lines
+
+def compile_to_python(model, feature_names):
+    """Gera o código-fonte de um módulo Python independente do scikit-learn"""
+    tree = extract_tree(model)
+    branches = "\n".join(_python_branches(tree, 0, 1))
+    return f'''"""
+Árvore de decisão compilada (gerado por src/scripts/compile_tree.py - não editar)
+Inferência sem scikit-learn: if/else aninhados por amostra e tabela vetorizada (NumPy)
+"""
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional (apenas para lotes)
+    np = None
+
+FEATURE_NAMES = {feature_names!r}
+CLASSES = {tree['classes']!r}
+DECISION_THRESHOLD = {tree['decision_threshold']!r}
+MAX_DEPTH = {tree['max_depth']}
+
+# Tabela da árvore (usada na versão vetorizada)
+CHILDREN_LEFT = {tree['children_left']!r}
+CHILDREN_RIGHT = {tree['children_right']!r}
+FEATURE = {tree['feature']!r}
+THRESHOLD = {tree['threshold']!r}
+PROBA = {tree['proba']!r}
+
+def predict_proba_row(row):
+    """Probabilidades de uma amostra (lista de {len(feature_names)} valores)"""
+    x = array('f', row)  # float32, como o scikit-learn
+{branches}
+
+def _decide(proba):
+    """Classe a partir das probabilidades (limiar salvo ou maior probabilidade)"""
+    if DECISION_THRESHOLD is not None:
+        return CLASSES[int(proba[-1] >= DECISION_THRESHOLD)]
+    return CLASSES[max(range(len(proba)), key=proba.__getitem__)]
+
+def predict_row(row):
+    """Classe predita de uma amostra"""
+    return _decide(predict_proba_row(row))
+
+def predict_proba(X):
+    """Probabilidades de um lote de amostras"""
+    if np is None:
+        return [predict_proba_row(row) for row in X]
+
+    X = np.asarray(X, dtype=np.float32)
+    left = np.asarray(CHILDREN_LEFT)
+    right = np.asarray(CHILDREN_RIGHT)
+    feature = np.maximum(np.asarray(FEATURE), 0)
+    threshold = np.asarray(THRESHOLD)
+    rows = np.arange(X.shape[0])
+
+    # Percorre a árvore nível a nível para todas as amostras ao mesmo tempo
+    node = np.zeros(X.shape[0], dtype=np.intp)
+    for _ in range(MAX_DEPTH):
+        go_left = X[rows, feature[node]] <= threshold[node]
+        next_node = np.where(go_left, left[node], right[node])
+        node = np.where(left[node] == -1, node, next_node)
+    return np.asarray(PROBA)[node]
+
+def predict(X):
+    """Classes preditas de um lote de amostras"""
+    if np is None:
+        return [predict_row(row) for row in X]
+
+    proba = predict_proba(X)
+    classes = np.asarray(CLASSES)
+    if DECISION_THRESHOLD is not None:
+        return classes[(proba[:, -1] >= DECISION_THRESHOLD).astype(int)]
+    return classes[proba.argmax(axis=1)]
+'''
+
+def compile_to_javascript(model, feature_names, example=None):
+    """Gera o código-fonte do modelo para o navegador (example: amostra para preencher o formulário)"""
+    tree = extract_tree(model)
+    branches = "\n".join(_javascript_branches(tree, 0, 2))
+    threshold = 'null' if tree['decision_threshold'] is None else repr(tree['decision_threshold'])
+    return f'''/**
+ * Árvore de Decisão Compilada
+ * Gerado por src/scripts/compile_tree.py - não editar
+ */
+
+class CompiledTreeModel {{
+    /**
+     * Probabilidades de uma amostra (array com {len(feature_names)} valores)
+     */
+    static predictProba(row) {{
+        const x = row.map(Math.fround); // float32, como o scikit-learn
+{branches}
+    }}
+
+    /**
+     * Classe predita de uma amostra
+     */
+    static predict(row) {{
+        const proba = CompiledTreeModel.predictProba(row);
+        if (CompiledTreeModel.threshold !== null) {{
+            return CompiledTreeModel.classes[proba[proba.length - 1] >= CompiledTreeModel.threshold ? 1 : 0];
+        }}
+        return CompiledTreeModel.classes[proba.indexOf(Math.max(...proba))];
+    }}
+
+    /**
+     * Predição a partir de um objeto {{nome_da_feature: valor}}
+     */
+    static predictFromObject(values) {{
+        return CompiledTreeModel.predict(CompiledTreeModel.featureNames.map(name => Number(values[name])));
+    }}
+}}
+
+CompiledTreeModel.featureNames = {list(feature_names)!r};
+CompiledTreeModel.classes = {tree['classes']!r};
+CompiledTreeModel.threshold = {threshold};
+CompiledTreeModel.example = {'null' if example is None else repr([float(v) for v in example])};
+
+// Exportar para uso global
+window.CompiledTreeModel = CompiledTreeModel;
+'''
+
+def load_compiled_module(path=PYTHON_OUTPUT):
+    """Importa o módulo gerado a partir do caminho"""
+    spec = importlib.util.spec_from_file_location('decision_tree_compiled', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def verify(model, compiled, X):
+    """Confere se o código gerado reproduz exatamente as predições do modelo (com o limiar salvo)"""
+    expected = predict_with_threshold(model, X)
+    same_batch = np.array_equal(compiled.predict(X), expected)
+    same_proba = np.allclose(compiled.predict_proba(X), model.predict_proba(X))
+    same_rows = all(compiled.predict_row(row) == label
+                    for row, label in zip(X[:1000].tolist(), expected[:1000]))
+    return same_batch and same_proba and same_rows
+
+def _startup_time(code, repeats=5):
+    """Tempo (mediana) para iniciar um interpretador e executar o código"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+def benchmark(model, compiled, X, model_path='../models/decision_tree_model.pkl'):
+    """Compara inicialização e latência do modelo pickle e do código compilado"""
+    print("\n=== BENCHMARK: PICKLE x COMPILADO ===")
+
+    interpreter = _startup_time('pass')
+    pickle_startup = _startup_time(f"import joblib; joblib.load({model_path!r})") - interpreter
+    compiled_path = os.path.dirname(os.path.abspath(PYTHON_OUTPUT))
+    compiled_startup = _startup_time(
+        f"import sys; sys.path.insert(0, {compiled_path!r}); import decision_tree_compiled"
+    ) - interpreter
+    print(f"Inicialização (sem o interpretador): pickle {pickle_startup * 1000:.1f} ms | "
+          f"compilado {compiled_startup * 1000:.1f} ms")
+
+    rows = X.tolist()
+    start = time.perf_counter()
+    for row in X:
+        predict_with_threshold(model, row.reshape(1, -1))
+    sklearn_row = (time.perf_counter() - start) / len(X)
+
+    start = time.perf_counter()
+    for row in rows:
+        compiled.predict_row(row)
+    compiled_row = (time.perf_counter() - start) / len(rows)
+    print(f"Latência por amostra: scikit-learn {sklearn_row * 1e6:.1f} µs | "
+          f"compilado {compiled_row * 1e6:.1f} µs ({sklearn_row / compiled_row:.0f}x)")
+
+    start = time.perf_counter()
+    predict_with_threshold(model, X)
+    sklearn_batch = time.perf_counter() - start
+    start = time.perf_counter()
+    compiled.predict(X)
+    compiled_batch = time.perf_counter() - start
+    print(f"Lote de {len(X)} amostras: scikit-learn {sklearn_batch * 1000:.2f} ms | "
+          f"compilado (NumPy) {compiled_batch * 1000:.2f} ms")
+
+    return {
+        'pickle_startup_s': pickle_startup, 'compiled_startup_s': compiled_startup,
+        'sklearn_row_s': sklearn_row, 'compiled_row_s': compiled_row,
+        'sklearn_batch_s': sklearn_batch, 'compiled_batch_s': compiled_batch
+    }
+
+if __name__ == "__main__":
+    print("=== COMPILAÇÃO DA ÁRVORE DE DECISÃO ===")
+    model = joblib.load('../models/decision_tree_model.pkl')
+    X_test = np.load('../data/X_test.npy')
+    with open('../data/feature_names.txt', 'r') as f:
+        feature_names = [line.strip() for line in f.readlines()]
+
+    with open(PYTHON_OUTPUT, 'w') as f:
+        f.write(compile_to_python(model, feature_names))
+    print(f"Módulo Python salvo em '{PYTHON_OUTPUT}'")
+
+    with open(JAVASCRIPT_OUTPUT, 'w') as f:
+        f.write(compile_to_javascript(model, feature_names, example=X_test[0]))
+    print(f"Módulo JavaScript salvo em '{JAVASCRIPT_OUTPUT}'")
+
+    compiled = load_compiled_module()
+
+    # Verificação no conjunto de teste e em um lote sintético maior
+    rng = np.random.default_rng(42)
+    low, high = X_test.min(axis=0), X_test.max(axis=0)
+    X_synthetic = rng.uniform(low, high, size=(100_000, X_test.shape[1]))
+    for name, X in (('teste', X_test), ('sintético', X_synthetic)):
+        status = 'OK' if verify(model, compiled, X) else 'DIVERGENTE'
+        print(f"Verificação ({name}, {len(X)} amostras): {status}")
+
+    benchmark(model, compiled, X_test)
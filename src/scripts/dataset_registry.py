@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Registro de datasets com cache das versões já pré-processadas
+(datasets do UCI por ID e CSVs por URL)
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+import numpy as np
+import pandas as pd
+from http_fetch import fetch_sources, atomic_write
+
+# Datasets conhecidos (ID do UCI -> informações de exibição)
+DATASETS = {
+    '17': {
+        'name': 'Breast Cancer Wisconsin (Diagnostic)',
+        'class_labels': {'B': 'benign', 'M': 'malignant'}
+    },
+    '15': {'name': 'Breast Cancer Wisconsin (Original)'},
+    '53': {'name': 'Iris'},
+    '109': {'name': 'Wine'},
+    '45': {'name': 'Heart Disease'}
+}
+
+CACHE_DIR = os.environ.get('DATASET_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'dataset_cache'))
+
+# Segundos em que uma origem revalidada é considerada atual sem nova requisição
+# (ex.: jobs de um lote logo após o preload)
+FRESH_SECONDS = float(os.environ.get('DATASET_FRESH_SECONDS', 30))
+
+# Cache em memória (compartilhado com processos filhos criados por fork)
+_CACHE = {}
+# Última revalidação de cada (origem, coluna target): (chave da versão, instante)
+_REVALIDATED = {}
+
+def register_dataset(key, name, class_labels=None):
+    """Adiciona um dataset do UCI ao registro"""
+    DATASETS[str(key)] = {'name': name, 'class_labels': class_labels or {}}
+
+def _cache_key(source, target_column, version):
+    """Chave do cache para uma origem (ID ou URL), coluna target e versão do conteúdo"""
+    raw = f"{source}|{target_column or ''}|{version}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+def _split_raw(source, raw, target_column=None):
+    """Separa features e target do dataset baixado"""
+    if source.isdigit():
+        X = raw['features']
+        y = raw['targets']
+        if target_column is not None:
+            y = y[target_column]
+        if isinstance(y, pd.DataFrame):
+            y = y.iloc[:, 0]
+        return X, y
+
+    df = raw['original']
+    # Por padrão, a última coluna é o target
+    target = target_column if target_column is not None else df.columns[-1]
+    return df.drop(columns=[target]), df[target]
+
+def preprocess(X, y):
+    """Mantém features numéricas, imputa ausentes pela mediana e codifica o target"""
+    X = X.select_dtypes(include='number')
+    X = X.fillna(X.median())
+
+    valid = y.notna().to_numpy()
+    X = X[valid]
+    y = y[valid]
+
+    classes, y_encoded = np.unique(y.astype(str).str.strip().to_numpy(), return_inverse=True)
+    return X.to_numpy(dtype=np.float64), y_encoded.astype(np.int64), list(X.columns), list(classes)
+
+def _save_to_disk(key, entry):
+    """Salva a entrada pré-processada no cache em disco"""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        atomic_write(os.path.join(CACHE_DIR, f"{key}.npz"),
+                     lambda f: np.savez(f, X=entry['X'], y=entry['y']))
+        metadata = {k: v for k, v in entry.items() if k not in ('X', 'y')}
+        atomic_write(os.path.join(CACHE_DIR, f"{key}.json"),
+                     lambda f: json.dump(metadata, f, ensure_ascii=False), binary=False)
+    except OSError:
+        pass  # Cache em disco é opcional (ex.: sistema de arquivos somente leitura)
+
+def _load_from_disk(key):
+    """Carrega a entrada pré-processada do cache em disco (se existir)"""
+    arrays_path = os.path.join(CACHE_DIR, f"{key}.npz")
+    metadata_path = os.path.join(CACHE_DIR, f"{key}.json")
+    if not (os.path.exists(arrays_path) and os.path.exists(metadata_path)):
+        return None
+    with open(metadata_path, 'r') as f:
+        entry = json.load(f)
+    with np.load(arrays_path) as arrays:
+        entry['X'] = arrays['X']
+        entry['y'] = arrays['y']
+    return entry
+
+def _build_entry(key, source, raw, target_column=None):
+    """Pré-processa o dataset baixado e monta a entrada do cache"""
+    X_raw, y_raw = _split_raw(source, raw, target_column)
+    X, y, feature_names, classes = preprocess(X_raw, y_raw)
+
+    info = DATASETS.get(source, {'name': 'Dataset Personalizado'})
+    labels = info.get('class_labels', {})
+    counts = np.bincount(y, minlength=len(classes))
+    return {
+        'key': key,
+        'source': source,
+        'version': raw['version'],
+        'name': info['name'],
+        'X': X,
+        'y': y,
+        'feature_names': feature_names,
+        'class_names': classes,
+        'class_counts': {labels.get(c, c): int(n) for c, n in zip(classes, counts)}
+    }
+
+def preload(sources):
+    """Carrega vários datasets (revalidação condicional -> memória -> disco -> pré-processamento)
+
+    Toda origem passa pela sessão de downloads, que revalida a cópia em cache com
+    If-None-Match/If-Modified-Since (304 não retransfere o corpo). A versão devolvida
+    (ETag/Last-Modified ou hash do corpo) faz parte da chave do cache pré-processado,
+    então um CSV alterado na origem gera uma nova entrada em vez de servir a antiga.
+    Origens revalidadas há menos de FRESH_SECONDS não são consultadas de novo.
+    """
+    requests = [(str(source).strip(), target_column) for source, target_column in sources]
+    for source, _ in requests:
+        if source.isdigit() and source not in DATASETS:
+            raise ValueError(f"Dataset UCI {source} não suportado")
+
+    now = time.monotonic()
+    keys = {}
+    for request in requests:
+        key, checked_at = _REVALIDATED.get(request, (None, -np.inf))
+        if key in _CACHE and now - checked_at < FRESH_SECONDS:
+            keys[request] = key
+
+    # Cada origem é revalidada/baixada uma única vez, mesmo com colunas target diferentes
+    sources_to_fetch = sorted({source for source, target_column in requests
+                               if (source, target_column) not in keys})
+    raw_by_source = dict(zip(sources_to_fetch, fetch_sources(sources_to_fetch) if sources_to_fetch else []))
+    for source, target_column in requests:
+        if (source, target_column) in keys:
+            continue
+        raw = raw_by_source[source]
+        key = _cache_key(source, target_column, raw['version'])
+        if key not in _CACHE:
+            entry = _load_from_disk(key)
+            if entry is None:
+                entry = _build_entry(key, source, raw, target_column)
+                _save_to_disk(key, entry)
+            _CACHE[key] = entry
+        # Versão anterior da mesma origem não será mais servida
+        previous, _ = _REVALIDATED.get((source, target_column), (key, None))
+        if previous != key:
+            _CACHE.pop(previous, None)
+        keys[(source, target_column)] = key
+        _REVALIDATED[(source, target_column)] = (key, time.monotonic())
+
+    return [_CACHE[keys[request]] for request in requests]
+
+def load_dataset(source, target_column=None):
+    """Retorna o dataset pré-processado (revalidado na origem; memória -> disco -> download)"""
+    return preload([(source, target_column)])[0]
+
+if __name__ == "__main__":
+    for source in DATASETS:
+        entry = load_dataset(source)
+        print(f"{source}: {entry['name']} - {entry['X'].shape[0]} amostras, "
+              f"{entry['X'].shape[1]} features, classes {entry['class_counts']}")
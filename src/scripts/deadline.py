@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Controle do tempo de execução de uma requisição (orçamento por etapa e cortes realizados)
+"""
+
+import time
+import threading
+import contextlib
+
+# Intervalo entre chamadas de `poll` enquanto uma etapa executa em thread
+POLL_INTERVAL = 0.5
+
+class DeadlineExceeded(Exception):
+    """Etapa obrigatória não terminou dentro do orçamento"""
+
+class Deadline:
+    """Orçamento de tempo de uma requisição, com o tempo gasto em cada etapa"""
+
+    def __init__(self, budget, poll=None):
+        self.budget = float(budget)
+        self.poll = poll  # Chamada periódica durante run() (ex.: detectar cliente desconectado)
+        self.start = time.perf_counter()
+        self.steps = {}
+        self.cuts = []
+
+    def elapsed(self):
+        """Segundos desde o início da requisição"""
+        return time.perf_counter() - self.start
+
+    def remaining(self):
+        """Segundos restantes do orçamento (nunca negativo)"""
+        return max(self.budget - self.elapsed(), 0.0)
+
+    def allows(self, step, seconds):
+        """Indica se há tempo para uma etapa opcional (registra o corte se não houver)"""
+        if self.remaining() >= seconds:
+            return True
+        self.cut(step, 'skipped', f"restavam {self.remaining():.1f}s (necessário ~{seconds:.1f}s)")
+        return False
+
+    def cut(self, step, action, detail):
+        """Registra uma degradação (etapa pulada, profundidade limitada, amostragem...)"""
+        self.cuts.append({'step': step, 'action': action, 'detail': detail})
+
+    @contextlib.contextmanager
+    def step(self, name):
+        """Mede o tempo gasto em uma etapa"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps[name] = self.steps.get(name, 0.0) + time.perf_counter() - start
+
+    def run(self, name, function, *args, fraction=1.0, cancellable=False):
+        """Executa uma etapa em uma thread e desiste após a fração do tempo restante
+
+        cancellable=True: a função recebe `cancel` (threading.Event), sinalizado quando a
+        etapa estoura o tempo ou `poll` interrompe a requisição; etapas com pool de
+        processos devem então cancelar o trabalho pendente e encerrar o pool.
+        """
+        outcome = {}
+        cancel = threading.Event()
+        kwargs = {'cancel': cancel} if cancellable else {}
+
+        def target():
+            try:
+                outcome['value'] = function(*args, **kwargs)
+            except Exception as e:
+                outcome['error'] = e
+
+        with self.step(name):
+            # Thread daemon: se estourar o tempo, a resposta é enviada sem esperar por ela
+            worker = threading.Thread(target=target, daemon=True)
+            worker.start()
+            limit = time.perf_counter() + self.remaining() * fraction
+            try:
+                while worker.is_alive() and time.perf_counter() < limit:
+                    worker.join(min(POLL_INTERVAL, max(limit - time.perf_counter(), 0.0)))
+                    if self.poll is not None and worker.is_alive():
+                        self.poll()
+            finally:
+                if worker.is_alive():
+                    cancel.set()
+
+        if worker.is_alive():
+            raise DeadlineExceeded(f"Etapa '{name}' excedeu o tempo disponível "
+                                   f"({self.elapsed():.2f}s de {self.budget:.2f}s)")
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome['value']
+
+    def summary(self):
+        """Resumo para a resposta da API"""
+        return {
+            'seconds': self.budget,
+            'elapsed': round(self.elapsed(), 3),
+            'steps': {name: round(seconds, 3) for name, seconds in self.steps.items()},
+            'cuts': self.cuts,
+            'partial': bool(self.cuts)
+        }
@@ -14,6 +14,13 @@ from sklearn.metrics import (
 )
 from sklearn.tree import DecisionTreeClassifier
 import joblib
+from explain_predictions import TreeExplainer, export_explanations
+from leaf_statistics import LeafStatsIndex
+from input_validation import PROFILE_OUTPUT, load_profile, validate_batch, DriftMonitor, print_validation
+from threshold_optimization import (
+    choose_operating_point, set_threshold, get_threshold, predict_with_threshold
+)
+from prepare_data import seed_argument
 
 def load_data_and_model():
     """Carrega dados e modelo treinado"""
@@ -29,16 +36,16 @@ def load_data_and_model():
     
     return X_train, X_test, y_train, y_test, feature_names, model
 
-def detailed_evaluation():
+def detailed_evaluation(model, X_test, y_test):
     """Realiza avaliação detalhada do modelo"""
     print("=== AVALIAÇÃO DETALHADA DO MODELO ===")
     
-    # Carregar dados e modelo
-    X_train, X_test, y_train, y_test, feature_names, model = load_data_and_model()
-    
-    # Predições
-    y_pred = model.predict(X_test)
+    # Predições (usando o limiar salvo no modelo, se houver)
     y_pred_proba = model.predict_proba(X_test)[:, 1]  # Probabilidade da classe positiva (maligno)
+    y_pred = predict_with_threshold(model, X_test, y_pred_proba)
+    
+    threshold = get_threshold(model)
+    print(f"Limiar de decisão: {threshold:.4f}" if threshold is not None else "Limiar de decisão: padrão (predict)")
     
     # Métricas básicas
     accuracy = accuracy_score(y_test, y_pred)
@@ -94,6 +101,36 @@ def detailed_evaluation():
         'confusion_matrix': cm
     }
 
+def optimize_operating_point(model, X_train, y_train, target_sensitivity=0.95, min_specificity=0.80,
+                             random_state=42):
+    """Escolhe o ponto de operação (prioridade para sensibilidade) e salva no modelo
+
+    O limiar vem das probabilidades fora do fold do treino (folds embaralhados com
+    random_state); o teste só é usado depois, na avaliação com o limiar já aplicado.
+    """
+    print("=== OTIMIZAÇÃO DO LIMIAR DE DECISÃO ===")
+    
+    # Varredura de todos os limiares sobre as probabilidades da validação cruzada
+    operating_point = choose_operating_point(
+        model, X_train, y_train, random_state=random_state,
+        target_sensitivity=target_sensitivity, min_specificity=min_specificity
+    )
+    
+    print(f"Critério: {operating_point['criterion']}")
+    print(f"Limiar escolhido: {operating_point['threshold']:.4f}")
+    print(f"Sensibilidade (validação cruzada no treino): {operating_point['sensitivity']:.4f}")
+    print(f"Especificidade (validação cruzada no treino): {operating_point['specificity']:.4f}")
+    
+    # Armazenar o limiar no artefato do modelo (sobrescreve o de uma execução anterior)
+    set_threshold(model, operating_point)
+    if operating_point['degenerate']:
+        model.decision_threshold_ = None
+        print("Limiar descartado: uma das classes nunca seria predita (mantido o limiar padrão)")
+    joblib.dump(model, '../models/decision_tree_model.pkl')
+    print("Limiar salvo em '../models/decision_tree_model.pkl'\n")
+    
+    return operating_point
+
 def create_advanced_visualizations(metrics):
     """Cria visualizações avançadas"""
     print("\n=== CRIANDO VISUALIZAÇÕES AVANÇADAS ===")
@@ -179,7 +216,7 @@ def create_advanced_visualizations(metrics):
     
     print("Dashboard de avaliação salvo como 'evaluation_dashboard.png'")
 
-def analyze_errors(metrics, feature_names):
+def analyze_errors(metrics, feature_names, model=None):
     """Analisa os erros do modelo"""
     print("\n=== ANÁLISE DE ERROS ===")
     
@@ -195,17 +232,81 @@ def analyze_errors(metrics, feature_names):
     print(f"Falsos Positivos: {false_positives.sum()}")
     print(f"Falsos Negativos: {false_negatives.sum()}")
     
+    # Explicações (caminho de decisão) de todos os casos em uma única passada
+    explainer = TreeExplainer(model, feature_names) if model is not None else None
+    explanation = explainer.explain(X_test) if explainer is not None else None
+    
     if false_positives.sum() > 0:
         print(f"\nCasos Falsos Positivos (preditos como malignos, mas são benignos):")
         fp_indices = np.where(false_positives)[0]
         for i, idx in enumerate(fp_indices[:3]):  # Mostrar apenas os primeiros 3
             print(f"  Caso {i+1}: Probabilidade = {metrics['y_pred_proba'][idx]:.3f}")
+            if explanation is not None:
+                print(explainer.format_explanation(explanation, idx))
     
     if false_negatives.sum() > 0:
         print(f"\nCasos Falsos Negativos (preditos como benignos, mas são malignos):")
         fn_indices = np.where(false_negatives)[0]
         for i, idx in enumerate(fn_indices[:3]):  # Mostrar apenas os primeiros 3
             print(f"  Caso {i+1}: Probabilidade = {metrics['y_pred_proba'][idx]:.3f}")
+            if explanation is not None:
+                print(explainer.format_explanation(explanation, idx))
+
+    if model is not None:
+        analyze_leaf_errors(model, feature_names, X_test, metrics)
+
+def analyze_leaf_errors(model, feature_names, X_test, metrics, top=5):
+    """Erros agrupados por folha da árvore (índice de estatísticas por folha)"""
+    index = LeafStatsIndex(model, feature_names).update(X_test, metrics['y_test'], metrics['y_pred'])
+
+    table = index.leaf_table()
+    table = table[table['errors'] > 0].sort_values(['errors', 'error_rate'], ascending=False)
+    print(f"\nFolhas com erros ({len(table)} de {len(index.leaf_nodes)} folhas):")
+    for row in table.head(top).itertuples():
+        print(f"  Nó {row.node}: {row.errors}/{row.count} erros "
+              f"(taxa {row.error_rate:.1%}, FP {row.fp}, FN {row.fn}) - {index.describe_leaf(row.node)}")
+
+    # Subgrupos definidos pela divisão da raiz (consulta em O(folhas), sem reler as amostras)
+    tree = model.tree_
+    if tree.node_count > 1:
+        feature, threshold = feature_names[tree.feature[0]], tree.threshold[0]
+        print(f"\nErros por subgrupo da divisão da raiz ({feature}):")
+        for op in ('<=', '>'):
+            result = index.query(feature, op, threshold)
+            rate = f"{result['error_rate']:.1%}" if result['error_rate'] is not None else '-'
+            print(f"  {feature} {op} {threshold:.4f}: {result['count']} amostras, "
+                  f"{result['errors']} erros (taxa {rate})")
+
+    return index
+
+def validate_inputs(X_test, metrics, path=PROFILE_OUTPUT):
+    """Valida o conjunto de teste contra o perfil do treino e mede o drift"""
+    print("\n=== VALIDAÇÃO DAS ENTRADAS E DRIFT ===")
+    try:
+        profile = load_profile(path)
+    except FileNotFoundError:
+        print(f"Perfil '{path}' não encontrado (execute prepare_data.py)")
+        return None
+    
+    validation = validate_batch(X_test, profile)
+    drift = DriftMonitor(profile).update(X_test, metrics['y_pred']).report()
+    print_validation(validation, drift)
+    
+    metrics['validation'] = validation
+    metrics['drift'] = drift
+    return validation, drift
+
+def operating_point_section(metrics):
+    """Texto do ponto de operação para o relatório"""
+    point = metrics.get('operating_point')
+    if point is None or point['degenerate']:
+        return "\n- Limiar padrão do modelo (0.5)"
+    return f"""
+- Critério: {point['criterion']}
+- Limiar de decisão: {point['threshold']:.4f} (escolhido na validação cruzada do treino)
+- Sensibilidade na validação cruzada: {point['sensitivity']:.4f} ({point['sensitivity']:.1%})
+- Especificidade na validação cruzada: {point['specificity']:.4f} ({point['specificity']:.1%})
+- As métricas deste relatório são do conjunto de teste, com o limiar já aplicado"""
 
 def generate_summary_report(metrics):
     """Gera relatório resumo"""
@@ -242,6 +343,8 @@ INTERPRETAÇÃO CLÍNICA:
 - NPV de {metrics['npv']:.1%}: Quando o modelo prediz benigno, está correto 
   {metrics['npv']:.1%} das vezes.
 
+PONTO DE OPERAÇÃO:{operating_point_section(metrics)}
+
 MATRIZ DE CONFUSÃO:
                     Predito
                 Benigno  Maligno
@@ -269,14 +372,24 @@ if __name__ == "__main__":
     # Carregar dados e modelo
     X_train, X_test, y_train, y_test, feature_names, model = load_data_and_model()
     
-    # Avaliação detalhada
-    metrics = detailed_evaluation()
+    # Ponto de operação (limiar de decisão) escolhido só com o treino
+    operating_point = optimize_operating_point(model, X_train, y_train, random_state=seed_argument())
+    
+    # Avaliação detalhada no teste, com o limiar escolhido
+    metrics = detailed_evaluation(model, X_test, y_test)
+    metrics['operating_point'] = operating_point
     
     # Visualizações avançadas
     create_advanced_visualizations(metrics)
     
+    # Validação das entradas e drift em relação ao treino
+    validate_inputs(X_test, metrics)
+    
     # Análise de erros
-    analyze_errors(metrics, feature_names)
+    analyze_errors(metrics, feature_names, model)
+    
+    # Explicações de todas as predições
+    export_explanations(model, X_test, feature_names)
     
     # Relatório resumo
     generate_summary_report(metrics)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Script para explicar as predições da árvore de decisão
+(caminho de decisão e contribuição de cada feature por caso)
+"""
+
+import json
+import numpy as np
+from scipy import sparse
+import joblib
+from threshold_optimization import get_threshold
+
+class TreeExplainer:
+    """Explicador vetorizado de caminhos de decisão com cache por folha"""
+
+    def __init__(self, model, feature_names, class_names=('Benigno', 'Maligno')):
+        self.model = model
+        self.feature_names = list(feature_names)
+        self.class_names = list(class_names)
+        # Ponto de operação salvo no modelo (None: classe de maior probabilidade)
+        self.decision_threshold = get_threshold(model)
+
+        tree = model.tree_
+        self.children_left = tree.children_left
+        self.children_right = tree.children_right
+        self.feature = tree.feature
+        self.threshold = tree.threshold
+
+        # Probabilidade de cada classe em cada nó
+        values = tree.value[:, 0, :]
+        self.node_proba = values / values.sum(axis=1, keepdims=True)
+
+        # Pai de cada nó (a raiz não tem pai)
+        n_nodes = tree.node_count
+        parent = np.full(n_nodes, -1, dtype=np.intp)
+        internal = np.where(self.children_left != -1)[0]
+        parent[self.children_left[internal]] = internal
+        parent[self.children_right[internal]] = internal
+        self.parent = parent
+
+        # Matriz (nós x features): variação da probabilidade da classe positiva
+        # ao entrar em cada nó, atribuída à feature usada na divisão do pai
+        non_root = np.where(parent != -1)[0]
+        delta = self.node_proba[non_root, -1] - self.node_proba[parent[non_root], -1]
+        self.edge_contributions = sparse.csr_matrix(
+            (delta, (non_root, self.feature[parent[non_root]])),
+            shape=(n_nodes, len(self.feature_names))
+        )
+        self.bias = float(self.node_proba[0, -1])
+
+        # Cache por folha: todas as amostras de uma folha compartilham o caminho
+        self._leaf_paths = {}
+        self._leaf_contributions = {}
+
+    def _cache_leaves(self, X, leaves):
+        """Calcula caminho e contribuições apenas das folhas ainda não vistas"""
+        unique_leaves, first_rows = np.unique(leaves, return_index=True)
+        missing = np.array([leaf not in self._leaf_paths for leaf in unique_leaves], dtype=bool)
+        if not missing.any():
+            return
+
+        # Uma linha representativa por folha nova -> matriz indicadora de nós
+        rows = X.iloc[first_rows[missing]] if hasattr(X, 'iloc') else X[first_rows[missing]]
+        indicator = self.model.decision_path(rows).tocsr()
+        contributions = np.asarray((indicator @ self.edge_contributions).todense())
+
+        for i, leaf in enumerate(unique_leaves[missing]):
+            nodes = indicator.indices[indicator.indptr[i]:indicator.indptr[i + 1]]
+            nodes = np.sort(nodes)  # Nós filhos sempre têm índice maior que o pai
+            path = []
+            for node, next_node in zip(nodes[:-1], nodes[1:]):
+                path.append({
+                    'node': int(node),
+                    'feature': self.feature_names[self.feature[node]],
+                    'threshold': float(self.threshold[node]),
+                    'direction': '<=' if next_node == self.children_left[node] else '>'
+                })
+            self._leaf_paths[int(leaf)] = path
+            self._leaf_contributions[int(leaf)] = contributions[i]
+
+    def explain(self, X):
+        """Explica um lote de amostras em uma única passada vetorizada"""
+        leaves = self.model.apply(X)
+        self._cache_leaves(X, leaves)
+
+        unique_leaves, inverse = np.unique(leaves, return_inverse=True)
+        contributions = np.vstack(
+            [self._leaf_contributions[int(leaf)] for leaf in unique_leaves]
+        )[inverse]
+        proba = self.node_proba[leaves]
+        if self.decision_threshold is not None:
+            # Mesma regra de predict_with_threshold
+            prediction = (proba[:, -1] >= self.decision_threshold).astype(int)
+        else:
+            prediction = proba.argmax(axis=1)
+
+        return {
+            'leaves': leaves,
+            'proba': proba[:, -1],
+            'prediction': prediction,
+            'bias': self.bias,
+            'contributions': contributions,
+            'paths': [self._leaf_paths[int(leaf)] for leaf in leaves]
+        }
+
+    def top_contributions(self, contributions, top_n=5):
+        """Retorna as features com maior contribuição absoluta"""
+        order = np.argsort(-np.abs(contributions))[:top_n]
+        return [
+            {'feature': self.feature_names[j], 'contribution': float(contributions[j])}
+            for j in order if contributions[j] != 0
+        ]
+
+    def explain_records(self, X, top_n=5):
+        """Explicações em formato serializável (JSON), uma por amostra"""
+        explanation = self.explain(X)
+        records = []
+        for i, leaf in enumerate(explanation['leaves']):
+            records.append({
+                'leaf': int(leaf),
+                'prediction': self.class_names[explanation['prediction'][i]],
+                'probability': float(explanation['proba'][i]),
+                'path': explanation['paths'][i],
+                'top_contributions': self.top_contributions(explanation['contributions'][i], top_n)
+            })
+        return records
+
+    def explain_compact(self, X, top_n=5):
+        """Explicações serializáveis com os caminhos agrupados por folha"""
+        explanation = self.explain(X)
+        rows = []
+        for i, leaf in enumerate(explanation['leaves']):
+            rows.append({
+                'leaf': int(leaf),
+                'prediction': self.class_names[explanation['prediction'][i]],
+                'probability': float(explanation['proba'][i]),
+                'top_contributions': self.top_contributions(explanation['contributions'][i], top_n)
+            })
+        leaves = np.unique(explanation['leaves'])
+        return {
+            'bias': explanation['bias'],
+            'paths': {str(leaf): self._leaf_paths[int(leaf)] for leaf in leaves},
+            'rows': rows
+        }
+
+    def format_explanation(self, explanation, i, top_n=3):
+        """Formata a explicação de uma amostra como texto"""
+        threshold = '' if self.decision_threshold is None else f", limiar = {self.decision_threshold:.3f}"
+        lines = [
+            f"Folha {explanation['leaves'][i]} -> {self.class_names[explanation['prediction'][i]]} "
+            f"(P(maligno) = {explanation['proba'][i]:.3f}, base = {explanation['bias']:.3f}{threshold})"
+        ]
+        for step in explanation['paths'][i]:
+            lines.append(f"    {step['feature']} {step['direction']} {step['threshold']:.4f}")
+        for item in self.top_contributions(explanation['contributions'][i], top_n):
+            lines.append(f"    contribuição {item['feature']}: {item['contribution']:+.3f}")
+        return "\n".join(lines)
+
+def export_explanations(model, X, feature_names, output_path='../data/prediction_explanations.json'):
+    """Salva a explicação de todas as amostras em JSON"""
+    explainer = TreeExplainer(model, feature_names)
+    records = explainer.explain_records(X)
+
+    with open(output_path, 'w') as f:
+        json.dump(records, f, ensure_ascii=False, indent=2)
+
+    print(f"Explicações de {len(records)} predições salvas em '{output_path}'")
+    return records
+
+if __name__ == "__main__":
+    X_test = np.load('../data/X_test.npy')
+    with open('../data/feature_names.txt', 'r') as f:
+        feature_names = [line.strip() for line in f.readlines()]
+    model = joblib.load('../models/decision_tree_model.pkl')
+
+    export_explanations(model, X_test, feature_names)
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Script para selecionar o subconjunto mínimo de features da árvore de decisão
+(seleção forward/backward em paralelo com cache dos scores por fold)
+"""
+
+import os
+import json
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.model_selection import StratifiedKFold
+from sklearn.metrics import accuracy_score
+import joblib
+from permutation_importance import data_fingerprint
+from prepare_data import measure_storage
+
+SELECTION_OUTPUT = '../data/selected_features.json'
+
+def load_selection_inputs():
+    """Carrega dados de treino, importâncias, correlações e parâmetros do modelo final"""
+    X_train = np.load('../data/X_train.npy')
+    y_train = np.load('../data/y_train.npy')
+
+    with open('../data/feature_names.txt', 'r') as f:
+        feature_names = [line.strip() for line in f.readlines()]
+
+    importance = pd.read_csv('../data/feature_importance.csv').set_index('feature')['importance']
+    correlation = pd.read_csv('../data/target_correlation.csv').set_index('feature')['correlation']
+
+    with open('../data/best_params.json', 'r') as f:
+        params = json.load(f)['final_params']
+
+    return X_train, y_train, feature_names, importance, correlation, params
+
+def candidate_order(feature_names, importance, correlation):
+    """Índices das features por prioridade: importância na árvore, depois |correlação|"""
+    ranking = pd.DataFrame({
+        'importance': importance.reindex(feature_names).fillna(0.0).values,
+        'correlation': correlation.reindex(feature_names).abs().fillna(0.0).values
+    })
+    return ranking.sort_values(['importance', 'correlation'], ascending=False).index.tolist()
+
+class FoldScoreCache:
+    """Scores de validação cruzada por subconjunto de features (memória e disco)"""
+
+    def __init__(self, X, y, params, n_splits=5, n_jobs=None, cache_dir='../data/importance_cache'):
+        self.X = np.ascontiguousarray(X, dtype=np.float32)  # A árvore trabalha em float32
+        self.y = np.asarray(y).ravel()
+        self.params = {**params, 'random_state': 42}
+        self.folds = list(StratifiedKFold(n_splits=n_splits).split(self.X, self.y))
+        self.n_jobs = n_jobs or os.cpu_count()
+        self.hits = 0
+        self.misses = 0
+
+        params_digest = hashlib.sha1(json.dumps(self.params, sort_keys=True).encode('utf-8')).hexdigest()[:8]
+        self.path = None
+        if cache_dir:
+            self.path = os.path.join(
+                cache_dir, f"selection_{data_fingerprint(self.X, self.y)}_{params_digest}_{n_splits}.json"
+            )
+        self.scores = {}
+        if self.path and os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                self.scores = json.load(f)
+
+    @staticmethod
+    def key(subset):
+        """Chave do subconjunto (independente da ordem das features)"""
+        return ','.join(str(i) for i in sorted(subset))
+
+    def _fold_scores(self, subset):
+        """Acurácia de cada fold usando apenas as colunas do subconjunto"""
+        X = self.X[:, sorted(subset)]
+        scores = []
+        for train, test in self.folds:
+            model = DecisionTreeClassifier(**self.params).fit(X[train], self.y[train])
+            scores.append(float(accuracy_score(self.y[test], model.predict(X[test]))))
+        return scores
+
+    def evaluate(self, subsets):
+        """Score médio de cada subconjunto (calcula em paralelo só os ausentes do cache)"""
+        keys = [self.key(subset) for subset in subsets]
+        missing = {key: subset for key, subset in zip(keys, subsets) if key not in self.scores}
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+
+        # O treino da árvore libera o GIL: threads compartilham X sem cópias entre processos
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.n_jobs) as executor:
+                for key, scores in zip(missing, executor.map(self._fold_scores, missing.values())):
+                    self.scores[key] = scores
+        return [float(np.mean(self.scores[key])) for key in keys]
+
+    def save(self):
+        """Salva os scores calculados no cache em disco"""
+        if self.path:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w') as f:
+                json.dump(self.scores, f)
+
+def forward_selection(cache, order, tolerance=1e-4):
+    """Adiciona, a cada passo, a feature que mais melhora o score (avaliadas em paralelo)"""
+    selected, remaining = [], list(order)
+    best_score, history = 0.0, []
+    while remaining:
+        scores = cache.evaluate([selected + [feature] for feature in remaining])
+        best = int(np.argmax(scores))  # Empates: a feature de maior prioridade
+        if selected and scores[best] <= best_score + tolerance:
+            break
+        selected.append(remaining.pop(best))
+        best_score = scores[best]
+        history.append({'action': 'add', 'feature': selected[-1], 'score': best_score})
+    return selected, best_score, history
+
+def backward_elimination(cache, features, reference_score, tolerance=0.005):
+    """Remove, a cada passo, a feature cuja ausência menos piora o score"""
+    current = list(features)
+    current_score = cache.evaluate([current])[0]
+    history = []
+    while len(current) > 1:
+        scores = cache.evaluate([[f for f in current if f != feature] for feature in current])
+        best = int(np.argmax(scores))
+        if scores[best] < reference_score - tolerance:
+            break
+        history.append({'action': 'remove', 'feature': current.pop(best), 'score': scores[best]})
+        current_score = scores[best]
+    return current, current_score, history
+
+def select_features(X, y, feature_names, importance, correlation, params,
+                    tolerance=0.005, n_jobs=None, cache_dir='../data/importance_cache'):
+    """Menor subconjunto com score de CV até `tolerance` abaixo do conjunto completo"""
+    cache = FoldScoreCache(X, y, params, n_jobs=n_jobs, cache_dir=cache_dir)
+    order = candidate_order(feature_names, importance, correlation)
+    full_score = cache.evaluate([order])[0]
+
+    forward, forward_score, forward_history = forward_selection(cache, order)
+    # A eliminação parte das features que a árvore usa (as demais não alteram o modelo)
+    used = [i for i in order if importance.get(feature_names[i], 0.0) > 0] or order
+    backward, backward_score, backward_history = backward_elimination(
+        cache, used, full_score, tolerance
+    )
+    cache.save()
+
+    candidates = [
+        ('forward', forward, forward_score, forward_history),
+        ('backward', backward, backward_score, backward_history)
+    ]
+    valid = [c for c in candidates if c[2] >= full_score - tolerance] or candidates
+    method, subset, score, history = min(valid, key=lambda c: (len(c[1]), -c[2]))
+    subset = sorted(subset)
+
+    return {
+        'features': [feature_names[i] for i in subset],
+        'indices': subset,
+        'cv_score': score,
+        'full_cv_score': full_score,
+        'n_features': len(subset),
+        'n_features_full': len(feature_names),
+        'method': method,
+        'tolerance': tolerance,
+        'params': params,
+        'history': [{**step, 'feature': feature_names[step['feature']]} for step in history],
+        'cache': {'hits': cache.hits, 'misses': cache.misses}
+    }
+
+def save_selection(selection, path=SELECTION_OUTPUT):
+    """Salva o esquema reduzido (lista de features e índices das colunas)"""
+    with open(path, 'w') as f:
+        json.dump(selection, f, ensure_ascii=False, indent=2)
+    print(f"Esquema reduzido salvo em '{path}'")
+
+def read_selected_columns(csv_path, selection, target='Diagnosis'):
+    """Lê do CSV apenas as colunas selecionadas (e o target)"""
+    data = pd.read_csv(csv_path, usecols=selection['features'] + [target])
+    return data[selection['features']], data[target]
+
+def _median_time(function, repeats=5):
+    """Tempo (mediana) de execução de uma função"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+def report_gains(selection, csv_path='../data/breast_cancer_data.csv'):
+    """Compara leitura, armazenamento e inferência com todas as features e com o subconjunto
+
+    O armazenamento é medido nos arquivos que prepare_data grava com cada esquema.
+    """
+    print("\n=== GANHOS DO ESQUEMA REDUZIDO ===")
+    X_train = np.load('../data/X_train.npy')
+    X_test = np.load('../data/X_test.npy')
+    y_train = np.load('../data/y_train.npy')
+    y_test = np.load('../data/y_test.npy')
+    with open('../data/feature_names.txt', 'r') as f:
+        feature_names = [line.strip() for line in f.readlines()]
+    indices = [feature_names.index(name) for name in selection['features']]
+
+    full_model = joblib.load('../models/decision_tree_model.pkl')
+    reduced_model = DecisionTreeClassifier(**selection['params'], random_state=42)
+    reduced_model.fit(X_train[:, indices], y_train)
+    X_test_reduced = np.ascontiguousarray(X_test[:, indices])
+
+    full_data = pd.read_csv(csv_path)
+    reduced_data, _ = read_selected_columns(csv_path, selection)
+    full_files = measure_storage(csv_path=csv_path)
+    reduced_files = measure_storage(selection, csv_path)
+    rows = [
+        ('Leitura do CSV',
+         _median_time(lambda: pd.read_csv(csv_path)), full_data.memory_usage(deep=True).sum(),
+         _median_time(lambda: read_selected_columns(csv_path, selection)),
+         reduced_data.memory_usage(deep=True).sum()),
+        ('Arquivos gravados',
+         None, sum(full_files.values()),
+         None, sum(reduced_files.values())),
+        ('Inferência (teste)',
+         _median_time(lambda: full_model.predict(X_test), repeats=50), X_test.nbytes,
+         _median_time(lambda: reduced_model.predict(X_test_reduced), repeats=50), X_test_reduced.nbytes)
+    ]
+
+    print(f"{'etapa':<22} {'completo':>22} {'reduzido':>22}")
+    for name, full_time, full_bytes, reduced_time, reduced_bytes in rows:
+        full_time = f"{full_time * 1000:.2f} ms" if full_time is not None else '-'
+        reduced_time = f"{reduced_time * 1000:.2f} ms" if reduced_time is not None else '-'
+        print(f"{name:<22} {full_time:>10} {full_bytes / 1024:>8.1f} KB "
+              f"{reduced_time:>10} {reduced_bytes / 1024:>8.1f} KB")
+
+    full_arrays = sum(size for name, size in full_files.items() if name.startswith('data/X_'))
+    reduced_arrays = sum(size for name, size in reduced_files.items() if name.startswith('data/X_'))
+    print(f"Matrizes de features (X_train/X_test .npy): {full_arrays / 1024:.1f} KB -> "
+          f"{reduced_arrays / 1024:.1f} KB ({1 - reduced_arrays / full_arrays:.1%} menor)")
+
+    full_accuracy = accuracy_score(y_test, full_model.predict(X_test))
+    reduced_accuracy = accuracy_score(y_test, reduced_model.predict(X_test_reduced))
+    print(f"Acurácia no teste: completo {full_accuracy:.4f} | reduzido {reduced_accuracy:.4f}")
+
+    return {'rows': rows, 'files': {'full': full_files, 'reduced': reduced_files},
+            'full_accuracy': full_accuracy, 'reduced_accuracy': reduced_accuracy}
+
+if __name__ == "__main__":
+    print("=== SELEÇÃO DE FEATURES ===")
+    X_train, y_train, feature_names, importance, correlation, params = load_selection_inputs()
+
+    start = time.perf_counter()
+    selection = select_features(X_train, y_train, feature_names, importance, correlation, params)
+    elapsed = time.perf_counter() - start
+
+    print(f"Score CV com {selection['n_features_full']} features: {selection['full_cv_score']:.4f}")
+    print(f"Score CV com {selection['n_features']} features ({selection['method']}): "
+          f"{selection['cv_score']:.4f}")
+    print(f"Features selecionadas: {', '.join(selection['features'])}")
+    print(f"Subconjuntos avaliados: {selection['cache']['misses']} "
+          f"(cache: {selection['cache']['hits']} reaproveitados) em {elapsed:.2f}s")
+
+    save_selection(selection)
+    report_gains(selection)
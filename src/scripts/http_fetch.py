@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Camada de download de datasets (UCI por ID e CSVs por URL) com asyncio, conexões
+reutilizadas, novas tentativas, revalidação condicional (ETag/Last-Modified) e
+descompressão gzip durante a leitura
+"""
+
+import os
+import io
+import ssl
+import json
+import time
+import zlib
+import asyncio
+import hashlib
+import tempfile
+import threading
+import http.client
+from urllib.parse import urlsplit, urljoin
+import pandas as pd
+
+try:
+    import certifi
+except ImportError:  # certifi é opcional (usa os certificados do sistema)
+    certifi = None
+
+UCI_API_URL = os.environ.get('UCI_API_URL', 'https://archive.ics.uci.edu/api/dataset')
+HTTP_CACHE_DIR = os.environ.get('HTTP_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'http_cache'))
+
+CHUNK_SIZE = 64 * 1024
+MAX_REDIRECTS = 5
+RETRY_STATUS = {429, 500, 502, 503, 504}
+MAX_STATS = 1000
+
+class FetchError(Exception):
+    """Falha definitiva ao baixar uma URL"""
+
+def atomic_write(path, write, binary=True):
+    """Escreve em um arquivo temporário do mesmo diretório e o move para `path` (os.replace)
+
+    Leitores concorrentes veem o arquivo antigo ou o novo, nunca um arquivo pela metade.
+    """
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb' if binary else 'w') as f:
+            write(f)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+def body_version(body, headers=None):
+    """Versão do conteúdo: ETag/Last-Modified do servidor ou hash do corpo"""
+    headers = headers or {}
+    validator = headers.get('etag') or headers.get('last_modified')
+    if validator:
+        return hashlib.sha1(validator.encode('utf-8')).hexdigest()[:16]
+    return hashlib.sha1(body).hexdigest()[:16]
+
+class ConnectionPool:
+    """Conexões HTTP(S) keep-alive reaproveitadas por host (seguro entre threads)"""
+
+    def __init__(self, max_per_host=4, timeout=30):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context(cafile=certifi.where() if certifi else None)
+
+    def acquire(self, scheme, host, fresh=False):
+        """Conexão ociosa do host (ou uma nova) e se ela foi reutilizada"""
+        with self._lock:
+            idle = self._idle.get((scheme, host))
+            if idle and not fresh:
+                return idle.pop(), True
+        if scheme == 'https':
+            return http.client.HTTPSConnection(host, timeout=self.timeout, context=self._ssl_context), False
+        return http.client.HTTPConnection(host, timeout=self.timeout), False
+
+    def release(self, scheme, host, connection):
+        """Devolve a conexão ao pool (ou fecha se o pool do host estiver cheio)"""
+        with self._lock:
+            idle = self._idle.setdefault((scheme, host), [])
+            if len(idle) < self.max_per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def close(self):
+        """Fecha todas as conexões ociosas"""
+        with self._lock:
+            for connections in self._idle.values():
+                for connection in connections:
+                    connection.close()
+            self._idle.clear()
+
+class ResponseCache:
+    """Corpo e validadores (ETag/Last-Modified) das respostas em disco, por URL"""
+
+    def __init__(self, cache_dir=HTTP_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()[:20]
+        return os.path.join(self.cache_dir, f"{key}.body"), os.path.join(self.cache_dir, f"{key}.json")
+
+    def validators(self, url):
+        """Cabeçalhos condicionais para revalidar a cópia em cache (se houver)"""
+        if not self.cache_dir:
+            return {}
+        body_path, meta_path = self._paths(url)
+        if not (os.path.exists(body_path) and os.path.exists(meta_path)):
+            return {}
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def load(self, url):
+        """Corpo e validadores salvos para a URL"""
+        body_path, meta_path = self._paths(url)
+        with open(body_path, 'rb') as f:
+            body = f.read()
+        with open(meta_path, 'r') as f:
+            return body, json.load(f)
+
+    def store(self, url, body, headers):
+        """Salva o corpo se a resposta tiver validadores (escrita atômica: temporário + os.replace)"""
+        etag, last_modified = headers.get('ETag'), headers.get('Last-Modified')
+        if not self.cache_dir or not (etag or last_modified):
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            body_path, meta_path = self._paths(url)
+            atomic_write(body_path, lambda f: f.write(body))
+            atomic_write(meta_path, lambda f: json.dump(
+                {'url': url, 'etag': etag, 'last_modified': last_modified}, f
+            ), binary=False)
+        except OSError:
+            pass  # Cache em disco é opcional (ex.: sistema de arquivos somente leitura)
+
+class FetchSession:
+    """Sessão de downloads assíncronos (pool de conexões, cache e estatísticas)"""
+
+    def __init__(self, cache_dir=HTTP_CACHE_DIR, retries=3, backoff=0.5, max_per_host=4, timeout=30):
+        self.pool = ConnectionPool(max_per_host, timeout)
+        self.cache = ResponseCache(cache_dir)
+        self.retries = retries
+        self.backoff = backoff
+        self.stats = []
+
+    def _request(self, url, headers, fresh=False):
+        """Uma requisição GET (bloqueante) com leitura em blocos e descompressão gzip"""
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        connection, reused = self.pool.acquire(parts.scheme, parts.netloc, fresh)
+        try:
+            try:
+                connection.request('GET', path, headers={
+                    'Accept-Encoding': 'gzip', 'Connection': 'keep-alive', **headers
+                })
+                response = connection.getresponse()
+            except (ConnectionError, http.client.RemoteDisconnected):
+                if not reused:
+                    raise
+                # Conexão ociosa fechada pelo servidor: tenta de novo com uma conexão nova
+                connection.close()
+                return self._request(url, headers, fresh=True)
+
+            gzipped = response.getheader('Content-Encoding', '').lower() == 'gzip'
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if gzipped else None
+            body, wire_bytes = io.BytesIO(), 0
+            while True:
+                chunk = response.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                wire_bytes += len(chunk)
+                body.write(decompressor.decompress(chunk) if decompressor else chunk)
+            if decompressor:
+                body.write(decompressor.flush())
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            raise
+
+        if response.will_close:
+            connection.close()
+        else:
+            self.pool.release(parts.scheme, parts.netloc, connection)
+        return response.status, response.msg, body.getvalue(), wire_bytes, reused
+
+    def _fetch_sync(self, url):
+        """Download com redirecionamentos e revalidação do cache (executado em thread)"""
+        for _ in range(MAX_REDIRECTS + 1):
+            status, headers, body, wire_bytes, reused = self._request(url, self.cache.validators(url))
+            if status in (301, 302, 303, 307, 308) and headers.get('Location'):
+                url = urljoin(url, headers['Location'])
+                continue
+            if status == 304:
+                body, validators = self.cache.load(url)
+                return url, status, body, body_version(body, validators), wire_bytes, reused
+            if status == 200:
+                self.cache.store(url, body, headers)
+            validators = {'etag': headers.get('ETag'), 'last_modified': headers.get('Last-Modified')}
+            return url, status, body, body_version(body, validators), wire_bytes, reused
+        raise FetchError(f"Redirecionamentos demais: {url}")
+
+    async def fetch(self, url):
+        """Baixa a URL (com novas tentativas) e retorna o corpo"""
+        return (await self.fetch_versioned(url))[0]
+
+    async def fetch_versioned(self, url):
+        """Corpo da URL e sua versão (validador do servidor ou hash do corpo)"""
+        start = time.perf_counter()
+        last_error = None
+        for attempt in range(1, self.retries + 2):
+            try:
+                final_url, status, body, version, wire_bytes, reused = await asyncio.to_thread(
+                    self._fetch_sync, url
+                )
+                if status in RETRY_STATUS:
+                    last_error = FetchError(f"HTTP {status} em {url}")
+                elif status not in (200, 304):
+                    raise FetchError(f"HTTP {status} em {url}")
+                else:
+                    del self.stats[:-MAX_STATS]  # Sessões longas guardam só os últimos downloads
+                    self.stats.append({
+                        'url': final_url,
+                        'status': status,
+                        'from_cache': status == 304,
+                        'bytes': len(body),
+                        'wire_bytes': wire_bytes,
+                        'seconds': time.perf_counter() - start,
+                        'attempts': attempt,
+                        'reused_connection': reused
+                    })
+                    return body, version
+            except (OSError, http.client.HTTPException) as e:
+                last_error = e
+            if attempt <= self.retries:
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+        raise FetchError(f"Falha ao baixar {url}: {last_error}")
+
+    async def fetch_many(self, urls):
+        """Baixa várias URLs em paralelo (mesma ordem da entrada)"""
+        return await asyncio.gather(*(self.fetch(url) for url in urls))
+
+    async def fetch_csv(self, url):
+        """DataFrame de um CSV remoto"""
+        return pd.read_csv(io.BytesIO(await self.fetch(url)))
+
+    async def fetch_uci(self, dataset_id):
+        """Dataset do UCI: metadados pela API e CSV padronizado, separados por papel da variável"""
+        body, metadata_version = await self.fetch_versioned(f"{UCI_API_URL}?id={int(dataset_id)}")
+        metadata = json.loads(body)
+        if metadata.get('status') != 200:
+            raise FetchError(metadata.get('message', f"Dataset UCI {dataset_id} não encontrado"))
+        metadata = metadata['data']
+        if not metadata.get('data_url'):
+            raise FetchError(f"Dataset UCI {dataset_id} não está disponível para importação")
+
+        body, data_version = await self.fetch_versioned(metadata['data_url'])
+        data = pd.read_csv(io.BytesIO(body))
+        roles = {}
+        for variable in metadata.get('variables', []):
+            roles.setdefault(variable['role'], []).append(variable['name'])
+        return {
+            'name': metadata.get('name'),
+            'features': data[roles['Feature']] if roles.get('Feature') else None,
+            'targets': data[roles['Target']] if roles.get('Target') else None,
+            'original': data,
+            'version': body_version(f"{metadata_version}|{data_version}".encode('utf-8'))
+        }
+
+    async def fetch_source(self, source):
+        """ID do UCI ou URL de CSV (com a versão do conteúdo em 'version')"""
+        source = str(source).strip()
+        if source.isdigit():
+            return await self.fetch_uci(source)
+        if source.startswith('http'):
+            body, version = await self.fetch_versioned(source)
+            return {'name': None, 'original': pd.read_csv(io.BytesIO(body)), 'version': version}
+        raise ValueError("URL de dataset inválida")
+
+    def summary(self):
+        """Bytes e tempo de cada download"""
+        return list(self.stats)
+
+    def close(self):
+        """Fecha as conexões do pool"""
+        self.pool.close()
+
+# Sessão compartilhada (conexões reaproveitadas entre requisições do mesmo processo)
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+def get_session():
+    """Sessão padrão do processo"""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = FetchSession()
+        return _SESSION
+
+def fetch_sources(sources, session=None):
+    """Baixa várias origens (IDs do UCI ou URLs) em paralelo a partir de código síncrono"""
+    session = session or get_session()
+
+    async def fetch_all():
+        return await asyncio.gather(*(session.fetch_source(source) for source in sources))
+
+    return asyncio.run(fetch_all())
+
+def fetch_source(source, session=None):
+    """Baixa uma origem (ID do UCI ou URL) a partir de código síncrono"""
+    return fetch_sources([source], session)[0]
+
+if __name__ == "__main__":
+    import sys
+
+    print("=== DOWNLOAD DE DATASETS ===")
+    sources = sys.argv[1:] or ['17']
+    session = get_session()
+    for round_name in ('primeira busca', 'revalidação'):
+        start = time.perf_counter()
+        session.stats.clear()
+        fetch_sources(sources, session)
+        print(f"\n{round_name.capitalize()} ({time.perf_counter() - start:.2f}s):")
+        for item in session.summary():
+            print(f"  {item['url']}: HTTP {item['status']} - {item['bytes']} bytes "
+                  f"({item['wire_bytes']} transferidos) em {item['seconds']:.3f}s, "
+                  f"{item['attempts']} tentativa(s), conexão reutilizada: {item['reused_connection']}")
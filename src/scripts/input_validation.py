@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Validação das entradas e monitoramento de drift: perfil do treino (faixas, quantis e
+proporções das classes) salvo junto ao modelo, checagens vetorizadas por lote e
+PSI/KS acumulados em streaming
+"""
+
+import sys
+import json
+import numpy as np
+
+PROFILE_OUTPUT = '../models/validation_profile.json'
+N_QUANTILES = 10
+# Margem (fração da faixa do treino) antes de considerar um valor fora da faixa
+RANGE_TOLERANCE = 0.1
+# Limiares usuais do PSI: < 0.1 estável, 0.1-0.25 moderado, > 0.25 significativo
+PSI_WARNING = 0.1
+PSI_ALERT = 0.25
+EPSILON = 1e-6
+# Linhas por lote usadas no drift (amostra aleatória; PSI/KS não precisam do lote inteiro)
+DRIFT_SAMPLE_ROWS = 65_536
+
+def _bin_counts(X, edges):
+    """Contagens por bin de cada feature (bin b = nº de bordas menores que o valor)"""
+    counts = []
+    for f, feature_edges in enumerate(edges):
+        column = X[:, f]
+        bins = np.searchsorted(feature_edges, column[np.isfinite(column)], side='left')
+        counts.append(np.bincount(bins, minlength=len(feature_edges) + 1))
+    return counts
+
+def build_profile(X, y, feature_names, n_quantiles=N_QUANTILES, rows=None):
+    """Perfil do conjunto de treino usado para validar e medir drift
+
+    Uma coluna por vez, sem copiar a matriz (nem convertê-la para float64): `rows`
+    seleciona as linhas do treino direto na matriz completa (ex.: índices do modo enxuto).
+    """
+    y = np.asarray(y).ravel()
+    levels = np.linspace(0, 1, n_quantiles + 1)[1:-1]
+
+    columns = {'min': [], 'max': [], 'mean': [], 'std': [], 'bin_edges': [], 'reference_proportions': []}
+    for f in range(X.shape[1]):
+        column = X[:, f] if rows is None else X[rows, f]
+        column = column[np.isfinite(column)]
+        if column.size == 0:
+            edges = np.empty(0)
+            stats = [np.nan] * 4
+        else:
+            edges = np.unique(np.quantile(column, levels).astype(np.float64))
+            stats = [column.min(), column.max(), column.mean(dtype=np.float64), column.std(dtype=np.float64)]
+        counts = np.bincount(np.searchsorted(edges, column, side='left'), minlength=len(edges) + 1)
+        for name, value in zip(('min', 'max', 'mean', 'std'), stats):
+            columns[name].append(float(value))
+        columns['bin_edges'].append(edges.tolist())
+        columns['reference_proportions'].append((counts / max(counts.sum(), 1)).tolist())
+
+    classes, class_counts = np.unique(y, return_counts=True)
+    return {
+        'feature_names': list(feature_names),
+        'n_samples': int(X.shape[0] if rows is None else len(rows)),
+        **columns,
+        'classes': classes.tolist(),
+        'class_priors': (class_counts / class_counts.sum()).tolist()
+    }
+
+def save_profile(profile, path=PROFILE_OUTPUT):
+    """Salva o perfil de validação junto ao modelo"""
+    with open(path, 'w') as f:
+        json.dump(profile, f, ensure_ascii=False)
+    print(f"Perfil de validação salvo em '{path}'")
+
+def load_profile(path=PROFILE_OUTPUT):
+    """Carrega o perfil de validação"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def validate_batch(X, profile, tolerance=RANGE_TOLERANCE, columns=None):
+    """Checa o lote em uma única passada vetorizada e marca as linhas inseguras
+
+    - esquema: número (e nomes, se informados) das colunas
+    - valores ausentes ou infinitos
+    - valores fora da faixa do treino (com margem `tolerance` da amplitude)
+    """
+    if columns is None and hasattr(X, 'columns'):
+        columns = [str(c) for c in X.columns]
+    X = np.asarray(X)
+    if not np.issubdtype(X.dtype, np.floating):
+        X = X.astype(np.float64)
+    expected = profile['feature_names']
+
+    schema_errors = []
+    if X.ndim != 2 or X.shape[1] != len(expected):
+        schema_errors.append(
+            f"Esperadas {len(expected)} features, recebidas {X.shape[1] if X.ndim == 2 else X.ndim}"
+        )
+        return {'valid': False, 'schema_errors': schema_errors, 'n_rows': int(len(X))}
+    if columns is not None and list(columns) != list(expected):
+        missing = [c for c in expected if c not in columns]
+        schema_errors.append(
+            f"Features ausentes: {', '.join(missing)}" if missing else "Ordem das features diferente do treino"
+        )
+
+    # Uma comparação por limite: NaN falha nas duas, então não precisa de isfinite no lote todo
+    low, high = np.asarray(profile['min']), np.asarray(profile['max'])
+    margin = tolerance * (high - low)
+    flagged = ~((X >= low - margin) & (X <= high + margin)).all(axis=1)
+
+    # Detalhe por feature só nas linhas marcadas
+    rows = X[flagged]
+    non_finite = ~np.isfinite(rows)
+    out_of_range = ~non_finite & ((rows < low - margin) | (rows > high + margin))
+
+    names = np.asarray(expected)
+    return {
+        'valid': not schema_errors and not flagged.any(),
+        'schema_errors': schema_errors,
+        'n_rows': int(len(X)),
+        'n_flagged': int(flagged.sum()),
+        'flagged_rows': np.flatnonzero(flagged).tolist(),
+        'non_finite': dict(zip(names.tolist(), non_finite.sum(axis=0).tolist())),
+        'out_of_range': dict(zip(names.tolist(), out_of_range.sum(axis=0).tolist()))
+    }
+
+def psi(reference, current):
+    """Population Stability Index entre duas distribuições de bins"""
+    reference = np.clip(np.asarray(reference, dtype=np.float64), EPSILON, None)
+    current = np.clip(np.asarray(current, dtype=np.float64), EPSILON, None)
+    return float(np.sum((current - reference) * np.log(current / reference)))
+
+def drift_status(value):
+    """Classificação do PSI"""
+    if value > PSI_ALERT:
+        return 'significativo'
+    return 'moderado' if value > PSI_WARNING else 'estável'
+
+class DriftMonitor:
+    """Drift acumulado em streaming: contagens por bin do perfil, sem guardar as amostras
+
+    Lotes grandes são amostrados (até `sample_rows` linhas aleatórias por lote) e as
+    proporções usam suavização de Laplace (bins vazios não explodem o PSI). O KS é
+    calculado nas bordas dos quantis do treino (aproximação por baixo do KS exato).
+    """
+
+    def __init__(self, profile, sample_rows=DRIFT_SAMPLE_ROWS, random_state=42):
+        self.profile = profile
+        self.edges = [np.asarray(e) for e in profile['bin_edges']]
+        self.reference = [np.asarray(p) for p in profile['reference_proportions']]
+        self.classes = np.asarray(profile['classes'])
+        self.counts = [np.zeros(len(e) + 1, dtype=np.int64) for e in self.edges]
+        self.class_counts = np.zeros(len(self.classes), dtype=np.int64)
+        self.sample_rows = sample_rows
+        self.rng = np.random.default_rng(random_state)
+        self.n_samples = 0
+        self.n_sampled = 0
+
+    def update(self, X, y_pred=None):
+        """Acumula um lote (e, opcionalmente, as classes preditas)"""
+        X = np.asarray(X)
+        rows = slice(None)
+        if self.sample_rows and len(X) > self.sample_rows:
+            # Linhas sorteadas (passo fixo coincidiria com lotes periódicos), em ordem de memória
+            rows = np.sort(self.rng.integers(0, len(X), self.sample_rows))
+        sample = np.ascontiguousarray(X[rows].T)  # Colunas contíguas para o searchsorted
+        for total, counts in zip(self.counts, _bin_counts(sample.T, self.edges)):
+            total += counts
+        if y_pred is not None:
+            index = np.searchsorted(self.classes, np.asarray(y_pred).ravel()[rows])
+            self.class_counts += np.bincount(index, minlength=len(self.classes))[:len(self.classes)]
+        self.n_samples += len(X)
+        self.n_sampled += sample.shape[1]
+        return self
+
+    def report(self):
+        """PSI e KS de cada feature (e PSI das classes preditas contra as do treino)"""
+        features = {}
+        for name, counts, reference in zip(self.profile['feature_names'], self.counts, self.reference):
+            smoothed = (counts + 0.5) / (counts.sum() + 0.5 * len(counts))
+            current = counts / max(counts.sum(), 1)
+            value = psi(reference, smoothed)
+            features[name] = {
+                'psi': value,
+                'ks': float(np.max(np.abs(np.cumsum(current) - np.cumsum(reference)))),
+                'status': drift_status(value)
+            }
+
+        class_psi = None
+        if self.class_counts.sum() > 0:
+            class_psi = psi(
+                self.profile['class_priors'],
+                (self.class_counts + 0.5) / (self.class_counts.sum() + 0.5 * len(self.class_counts))
+            )
+
+        return {
+            'n_samples': self.n_samples,
+            'n_sampled': self.n_sampled,
+            'features': features,
+            'class_psi': class_psi,
+            'drifted': [name for name, item in features.items() if item['psi'] > PSI_ALERT]
+        }
+
+def print_validation(validation, drift=None, top=5):
+    """Resumo da validação e do drift"""
+    for error in validation['schema_errors']:
+        print(f"Erro de esquema: {error}")
+    if 'n_flagged' in validation:
+        print(f"Linhas marcadas como inseguras: {validation['n_flagged']} de {validation['n_rows']}")
+        issues = {name: validation['non_finite'][name] + validation['out_of_range'][name]
+                  for name in validation['out_of_range']}
+        for name, count in sorted(issues.items(), key=lambda item: -item[1])[:top]:
+            if count:
+                print(f"  {name}: {count} valor(es) ausentes ou fora da faixa do treino")
+    if drift is not None:
+        ranked = sorted(drift['features'].items(), key=lambda item: -item[1]['psi'])
+        print(f"Drift (PSI/KS) em {drift['n_samples']} amostras - maiores PSI:")
+        for name, item in ranked[:top]:
+            print(f"  {name}: PSI {item['psi']:.4f} | KS {item['ks']:.4f} ({item['status']})")
+        if drift['class_psi'] is not None:
+            print(f"  Classes preditas: PSI {drift['class_psi']:.4f} ({drift_status(drift['class_psi'])})")
+
+if __name__ == "__main__":
+    print("=== VALIDAÇÃO DAS ENTRADAS ===")
+    profile = load_profile()
+    path = sys.argv[1] if len(sys.argv) > 1 else '../data/X_test.npy'
+    X = np.load(path)
+    validation = validate_batch(X, profile)
+    print_validation(validation, DriftMonitor(profile).update(X).report())
+    sys.exit(0 if validation['valid'] else 1)
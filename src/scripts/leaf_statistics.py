@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Índice de estatísticas por folha da árvore de decisão para análise de erros e subgrupos
+(contagens, erros, FP/FN e histogramas por feature, atualizados a cada lote avaliado)
+"""
+
+import numpy as np
+import pandas as pd
+from threshold_optimization import predict_with_threshold
+
+# Canais dos histogramas: amostras, erros, falsos positivos e falsos negativos
+CHANNELS = ('count', 'errors', 'fp', 'fn')
+
+class LeafStatsIndex:
+    """Estatísticas acumuladas por folha
+
+    As consultas combinam a caixa de cada folha (limites das features no caminho
+    até ela) com histogramas por folha x bin de feature: folhas inteiramente dentro ou
+    fora da condição usam só os totais, e apenas as folhas cortadas pela condição
+    consultam o histograma. O custo é O(folhas), independente do número de amostras.
+    """
+
+    def __init__(self, model, feature_names, n_bins=32):
+        self.model = model
+        self.feature_names = list(feature_names)
+        self.n_bins = n_bins
+        tree = model.tree_
+
+        self.leaf_nodes = np.flatnonzero(tree.children_left == -1)
+        self.leaf_slot = np.full(tree.node_count, -1, dtype=np.intp)
+        self.leaf_slot[self.leaf_nodes] = np.arange(len(self.leaf_nodes))
+        self.lower, self.upper = self._leaf_boxes(tree)
+
+        n_leaves, n_features = len(self.leaf_nodes), len(self.feature_names)
+        self.n_classes = len(model.classes_)
+        self.totals = np.zeros((n_leaves, len(CHANNELS)), dtype=np.int64)
+        self.true_class = np.zeros((n_leaves, self.n_classes), dtype=np.int64)
+        self.feature_sum = np.zeros((n_leaves, n_features))
+        self.feature_min = np.full((n_leaves, n_features), np.inf)
+        self.feature_max = np.full((n_leaves, n_features), -np.inf)
+        self.edges = None
+        self.offsets = None
+        self.histograms = None
+        self.n_batches = 0
+
+    def _leaf_boxes(self, tree):
+        """Limites (inferior exclusivo, superior inclusivo) de cada feature em cada folha"""
+        n_features = len(self.feature_names)
+        lower = np.full((tree.node_count, n_features), -np.inf)
+        upper = np.full((tree.node_count, n_features), np.inf)
+        for node in range(tree.node_count):  # Pais sempre antes dos filhos
+            left, right = tree.children_left[node], tree.children_right[node]
+            if left == -1:
+                continue
+            feature, threshold = tree.feature[node], tree.threshold[node]
+            for child in (left, right):
+                lower[child], upper[child] = lower[node], upper[node]
+            upper[left, feature] = min(upper[node, feature], threshold)
+            lower[right, feature] = max(lower[node, feature], threshold)
+        return lower[self.leaf_nodes], upper[self.leaf_nodes]
+
+    def _init_bins(self, X):
+        """Bordas dos bins: limiares da árvore (consultas exatas) + quantis do primeiro lote"""
+        tree = self.model.tree_
+        quantiles = np.quantile(X, np.linspace(0, 1, self.n_bins + 1)[1:-1], axis=0)
+        self.edges = []
+        for f in range(len(self.feature_names)):
+            thresholds = tree.threshold[(tree.children_left != -1) & (tree.feature == f)]
+            self.edges.append(np.unique(np.concatenate([thresholds, quantiles[:, f]])))
+        # Bins de todas as features lado a lado: a feature f ocupa offsets[f]:offsets[f + 1]
+        self.offsets = np.r_[0, np.cumsum([len(e) + 1 for e in self.edges])]
+        self.histograms = np.zeros(
+            (len(self.leaf_nodes), int(self.offsets[-1]), len(CHANNELS)), dtype=np.int64
+        )
+
+    def update(self, X, y_true, y_pred=None):
+        """Acumula um lote avaliado (folha de cada amostra via model.apply)"""
+        X = np.asarray(X, dtype=np.float32)  # Mesma precisão das comparações da árvore
+        y_true = np.asarray(y_true).ravel()
+        if y_pred is None:
+            y_pred = predict_with_threshold(self.model, X)
+        y_pred = np.asarray(y_pred).ravel()
+        if self.edges is None:
+            self._init_bins(X)
+
+        slot = self.leaf_slot[self.model.apply(X)]
+        n_leaves = len(self.leaf_nodes)
+        positive = self.model.classes_[-1]
+        channels = np.column_stack([
+            np.ones(len(y_true), dtype=bool),
+            y_true != y_pred,
+            (y_pred == positive) & (y_true != positive),
+            (y_pred != positive) & (y_true == positive)
+        ])
+
+        # Totais por folha
+        for c in range(len(CHANNELS)):
+            self.totals[:, c] += np.bincount(slot[channels[:, c]], minlength=n_leaves)
+        class_index = np.searchsorted(self.model.classes_, y_true)
+        self.true_class += np.bincount(
+            slot * self.n_classes + class_index, minlength=n_leaves * self.n_classes
+        ).reshape(n_leaves, self.n_classes)
+
+        # Resumos das features por folha (amostras ordenadas por folha + reduceat)
+        order = np.argsort(slot, kind='stable')
+        sorted_slot = slot[order]
+        starts = np.flatnonzero(np.r_[True, sorted_slot[1:] != sorted_slot[:-1]])
+        leaves = sorted_slot[starts]
+        X_sorted = X[order].astype(np.float64)
+        self.feature_sum[leaves] += np.add.reduceat(X_sorted, starts, axis=0)
+        self.feature_min[leaves] = np.minimum(self.feature_min[leaves], np.minimum.reduceat(X_sorted, starts, axis=0))
+        self.feature_max[leaves] = np.maximum(self.feature_max[leaves], np.maximum.reduceat(X_sorted, starts, axis=0))
+
+        # Histogramas folha x bin de feature (um bincount inteiro por canal)
+        total_bins = self.histograms.shape[1]
+        bins = np.column_stack([
+            np.searchsorted(edges, X[:, f].astype(np.float64), side='left')
+            for f, edges in enumerate(self.edges)
+        ]) + self.offsets[:-1]
+        flat = slot[:, None] * total_bins + bins
+        for c in range(len(CHANNELS)):
+            counts = np.bincount(flat[channels[:, c]].ravel(), minlength=n_leaves * total_bins)
+            self.histograms[..., c] += counts.reshape(n_leaves, total_bins)
+
+        self.n_batches += 1
+        return self
+
+    def leaf_table(self):
+        """Resumo por folha (contagens, erros e taxa de erro)"""
+        counts = self.totals[:, 0]
+        table = pd.DataFrame(self.totals, columns=list(CHANNELS))
+        table.insert(0, 'node', self.leaf_nodes)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            table['error_rate'] = np.where(counts > 0, self.totals[:, 1] / counts, np.nan)
+        proba = self.model.tree_.value[self.leaf_nodes, 0, :]
+        table['predicted_proba'] = proba[:, -1] / proba.sum(axis=1)
+        return table
+
+    def feature_means(self):
+        """Média de cada feature por folha (NaN para folhas sem amostras)"""
+        counts = self.totals[:, [0]].astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = self.feature_sum / counts
+        return pd.DataFrame(means, index=self.leaf_nodes, columns=self.feature_names)
+
+    def query(self, feature=None, op='>', threshold=None, leaves=None):
+        """Contagens do subgrupo: folhas escolhidas e/ou condição `feature op threshold`
+
+        op: '>' ou '<=' (mesma convenção das divisões da árvore). A consulta é exata
+        quando o limiar é uma borda de bin (todos os limiares da árvore são); caso
+        contrário, interpola dentro do bin e informa `exact = False` (contagens estimadas).
+        """
+        selected = np.ones(len(self.leaf_nodes), dtype=bool)
+        if leaves is not None:
+            selected &= np.isin(self.leaf_nodes, np.atleast_1d(leaves))
+
+        exact = True
+        if feature is None:
+            result = self.totals[selected].sum(axis=0)
+        else:
+            if op not in ('>', '<='):
+                raise ValueError("Operador deve ser '>' ou '<='")
+            f = self.feature_names.index(feature) if isinstance(feature, str) else int(feature)
+            threshold = float(threshold)
+
+            # x > t: folha inteira se o limite inferior >= t; nenhuma se o superior <= t
+            inside = self.lower[:, f] >= threshold
+            outside = self.upper[:, f] <= threshold
+            if op == '<=':
+                inside, outside = outside, inside
+            partial = selected & ~inside & ~outside
+            result = self.totals[selected & inside].sum(axis=0).astype(np.float64)
+
+            # Bin b contém (borda[b-1], borda[b]]: com t no bin j, x > t <=> b > j (se t = borda[j])
+            edges = self.edges[f]
+            j = int(np.searchsorted(edges, threshold, side='left'))
+            histogram = self.histograms[partial, self.offsets[f]:self.offsets[f + 1]]
+            above = histogram[:, j + 1:].sum(axis=1).astype(np.float64)
+            exact = j < len(edges) and edges[j] == threshold
+            if not exact:
+                # Fração do bin acima de t por interpolação linear (limitada ao mín/máx da folha)
+                low = np.maximum(edges[j - 1] if j > 0 else -np.inf, self.feature_min[partial, f])
+                high = np.minimum(edges[j] if j < len(edges) else np.inf, self.feature_max[partial, f])
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    fraction = np.clip((high - threshold) / (high - low), 0.0, 1.0)
+                fraction = np.where(high > low, fraction, (low > threshold).astype(np.float64))
+                above += histogram[:, j] * fraction[:, None]
+            if op == '<=':
+                above = histogram.sum(axis=1) - above
+            result += above.sum(axis=0)
+
+        count, errors, fp, fn = (float(v) if not exact else int(v) for v in result)
+        return {
+            'count': count, 'errors': errors, 'fp': fp, 'fn': fn,
+            'error_rate': errors / count if count else None,
+            'exact': bool(exact)
+        }
+
+    def describe_leaf(self, node):
+        """Condições (caixa) que definem uma folha, em texto"""
+        slot = self.leaf_slot[node]
+        conditions = []
+        for f, name in enumerate(self.feature_names):
+            low, high = self.lower[slot, f], self.upper[slot, f]
+            if np.isfinite(low) and np.isfinite(high):
+                conditions.append(f"{low:.4f} < {name} <= {high:.4f}")
+            elif np.isfinite(low):
+                conditions.append(f"{name} > {low:.4f}")
+            elif np.isfinite(high):
+                conditions.append(f"{name} <= {high:.4f}")
+        return ' e '.join(conditions) if conditions else '(raiz)'
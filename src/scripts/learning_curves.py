@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Curvas de aprendizado com validação cruzada: acurácia em função do tamanho do treino
+(prefixos estratificados aninhados e todos os ajustes tamanhos x folds em um pool de processos)
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, CancelledError, wait, FIRST_COMPLETED
+import numpy as np
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.model_selection import StratifiedKFold
+
+DEFAULT_TRAIN_SIZES = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+# Intervalo (s) entre verificações do pedido de cancelamento enquanto os ajustes executam
+CANCEL_POLL = 0.2
+
+# Dados dos processos do pool (enviados uma única vez por processo no initializer)
+_WORKER_DATA = {}
+
+def stratified_order(indices, y, random_state=42):
+    """Ordena os índices para que todo prefixo mantenha a proporção das classes
+
+    Cada classe é embaralhada e suas amostras recebem as posições (i + 0.5) / n_classe;
+    a ordenação por posição intercala as classes, então prefixos maiores contêm os menores.
+    """
+    rng = np.random.default_rng(random_state)
+    labels = y[indices]
+    positions = np.empty(len(indices))
+    for label in np.unique(labels):
+        members = np.flatnonzero(labels == label)
+        positions[rng.permutation(members)] = (np.arange(len(members)) + 0.5) / len(members)
+    return indices[np.argsort(positions, kind='stable')]
+
+def resolve_train_sizes(train_sizes, n_train):
+    """Tamanhos absolutos (frações <= 1 são relativas ao treino de cada fold)"""
+    sizes = []
+    for size in train_sizes:
+        size = float(size)
+        n = int(round(size * n_train)) if size <= 1.0 else int(size)
+        sizes.append(min(max(n, 2), n_train))
+    return sorted(set(sizes))
+
+def _init_worker(X, y, params):
+    """Guarda os dados no processo do pool"""
+    _WORKER_DATA.update(X=X, y=y, params=params)
+
+def _fit_and_score(task):
+    """Treina no prefixo do fold e avalia no próprio prefixo e no fold de validação"""
+    train_prefix, test = task
+    X, y = _WORKER_DATA['X'], _WORKER_DATA['y']
+    start = time.perf_counter()
+    model = DecisionTreeClassifier(**_WORKER_DATA['params']).fit(X[train_prefix], y[train_prefix])
+    fit_time = time.perf_counter() - start
+    train_score = float((model.predict(X[train_prefix]) == y[train_prefix]).mean())
+    test_score = float((model.predict(X[test]) == y[test]).mean())
+    return train_score, test_score, fit_time
+
+def learning_curve(X, y, params, train_sizes=DEFAULT_TRAIN_SIZES, n_splits=5,
+                   n_jobs=None, random_state=42, progress=None, cancel=None):
+    """Acurácia de treino/validação por tamanho do treino (média e desvio entre os folds)
+
+    progress(concluídos, total) é chamado após cada ajuste; uma exceção levantada por ele
+    interrompe a curva e cancela os ajustes ainda não iniciados. `cancel` (threading.Event)
+    faz o mesmo quando sinalizado (ex.: orçamento de tempo esgotado), levantando CancelledError.
+    """
+    start = time.perf_counter()
+    X = np.ascontiguousarray(X, dtype=np.float32)  # A árvore trabalha em float32
+    y = np.asarray(y).ravel()
+    params = {**params, 'random_state': random_state}
+
+    folds = list(StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state).split(X, y))
+    orders = [stratified_order(train, y, random_state + i) for i, (train, _) in enumerate(folds)]
+    sizes = resolve_train_sizes(train_sizes, min(len(order) for order in orders))
+
+    def check_cancel():
+        if cancel is not None and cancel.is_set():
+            raise CancelledError('Curva de aprendizado cancelada')
+
+    # Um ajuste por (tamanho, fold); o prefixo de cada tamanho contém o dos menores
+    tasks = [(order[:size], test) for size in sizes for order, (_, test) in zip(orders, folds)]
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(tasks))
+    scores = [None] * len(tasks)
+    n_done = 0
+    if n_jobs > 1:
+        executor = ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(X, y, params))
+        pending = set()
+        try:
+            futures = {executor.submit(_fit_and_score, task): i for i, task in enumerate(tasks)}
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=CANCEL_POLL, return_when=FIRST_COMPLETED)
+                check_cancel()
+                for future in done:
+                    scores[futures[future]] = future.result()
+                    n_done += 1
+                    if progress is not None:
+                        progress(n_done, len(tasks))
+        finally:
+            # Interrompida: descarta os ajustes pendentes sem esperar pelos que estão em execução
+            executor.shutdown(wait=not pending, cancel_futures=True)
+    else:
+        _init_worker(X, y, params)
+        for i, task in enumerate(tasks):
+            check_cancel()
+            scores[i] = _fit_and_score(task)
+            if progress is not None:
+                progress(i + 1, len(tasks))
+
+    scores = np.asarray(scores).reshape(len(sizes), n_splits, 3)
+    train_scores, test_scores, fit_times = scores[:, :, 0], scores[:, :, 1], scores[:, :, 2]
+    return {
+        'train_sizes': sizes,
+        'train_scores_mean': train_scores.mean(axis=1).tolist(),
+        'train_scores_std': train_scores.std(axis=1).tolist(),
+        'test_scores_mean': test_scores.mean(axis=1).tolist(),
+        'test_scores_std': test_scores.std(axis=1).tolist(),
+        'fit_time_mean': fit_times.mean(axis=1).tolist(),
+        'test_scores': test_scores.tolist(),
+        'n_splits': n_splits,
+        'n_fits': len(tasks),
+        'n_jobs': n_jobs,
+        'total_time': time.perf_counter() - start
+    }
+
+def plot_learning_curve(curve, path, title='Curva de Aprendizado - Árvore de Decisão'):
+    """Salva o gráfico das curvas de treino e validação"""
+    import matplotlib.pyplot as plt
+
+    sizes = np.asarray(curve['train_sizes'])
+    plt.figure(figsize=(10, 6))
+    for key, label, color in (('train', 'Treino', 'steelblue'), ('test', 'Validação cruzada', 'darkorange')):
+        mean = np.asarray(curve[f'{key}_scores_mean'])
+        std = np.asarray(curve[f'{key}_scores_std'])
+        plt.plot(sizes, mean, 'o-', color=color, label=label)
+        plt.fill_between(sizes, mean - std, mean + std, color=color, alpha=0.2)
+    plt.xlabel('Amostras de treino')
+    plt.ylabel('Acurácia')
+    plt.title(title)
+    plt.legend(loc='lower right')
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.savefig(path, dpi=300, bbox_inches='tight')
+    plt.close()
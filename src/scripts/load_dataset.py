@@ -5,18 +5,22 @@ Script para carregar e explorar o dataset Breast Cancer Wisconsin (Diagnostic)
 
 import pandas as pd
 import numpy as np
-from ucimlrepo import fetch_ucirepo
+from http_fetch import get_session, fetch_source
 
 def load_breast_cancer_data():
     """Carrega o dataset de câncer de mama do repositório UCI"""
     print("Carregando dataset Breast Cancer Wisconsin (Diagnostic)...")
     
-    # Buscar dataset
-    breast_cancer_wisconsin_diagnostic = fetch_ucirepo(id=17)
+    # Buscar dataset (revalida a cópia em cache com ETag/Last-Modified)
+    session = get_session()
+    breast_cancer_wisconsin_diagnostic = fetch_source(17, session)
+    for item in session.summary():
+        print(f"Download: HTTP {item['status']} - {item['bytes']} bytes "
+              f"({item['wire_bytes']} transferidos) em {item['seconds']:.2f}s")
     
     # Dados (como pandas dataframes)
-    X = breast_cancer_wisconsin_diagnostic.data.features
-    y = breast_cancer_wisconsin_diagnostic.data.targets
+    X = breast_cancer_wisconsin_diagnostic['features']
+    y = breast_cancer_wisconsin_diagnostic['targets']
     
     # Combinar features e targets em um único DataFrame
     data = pd.concat([X, y], axis=1)
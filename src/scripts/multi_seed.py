@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Execução do pipeline (preparação, construção e avaliação) para várias seeds em paralelo.
+Cada seed chama as mesmas funções dos scripts (prepare_data, build_decision_tree e a
+avaliação de evaluate_model, com o ponto de operação) em um diretório de trabalho
+próprio; o CSV bruto é lido uma única vez e repassado a cada processo do pool
+"""
+
+import os
+import io
+import json
+import time
+import shutil
+import tempfile
+import contextlib
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from prepare_data import prepare_data
+from build_decision_tree import build_decision_tree
+from evaluate_model import load_data_and_model, optimize_operating_point, detailed_evaluation
+
+RAW_DATASET = '../data/breast_cancer_data.csv'
+REPORT_PATH = '../data/multi_seed_report.txt'
+REPORT_HEADER = 'DISTRIBUIÇÃO DAS MÉTRICAS ENTRE SEEDS'
+METRICS = ('accuracy', 'precision', 'recall', 'f1', 'sensitivity', 'specificity', 'ppv', 'npv', 'roc_auc')
+
+# CSV bruto nos processos do pool (recebido uma vez por processo no initializer)
+_WORKER_DATA = {}
+
+def _init_worker(data):
+    """Guarda o dataset bruto no processo do pool"""
+    _WORKER_DATA['data'] = data
+
+@contextlib.contextmanager
+def _working_dir(path):
+    """Executa o bloco com `path` como diretório atual (os scripts usam caminhos relativos)"""
+    original = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(original)
+
+def run_seed(seed, n_jobs=1):
+    """Preparação, construção e avaliação com uma seed, pelas funções do pipeline
+
+    Os arquivos de cada etapa ficam em um diretório temporário com a mesma estrutura
+    de src/ (data, models, scripts), então seeds em paralelo não se sobrescrevem.
+    """
+    root = tempfile.mkdtemp(prefix=f'multi_seed_{seed}_')
+    for folder in ('data', 'models', 'scripts'):
+        os.makedirs(os.path.join(root, folder))
+    timings = {}
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            with _working_dir(os.path.join(root, 'data')):
+                prepare_data(make_plots=False, random_state=seed, data=_WORKER_DATA['data'])
+            timings['prepare'] = time.perf_counter() - start
+            
+            with _working_dir(os.path.join(root, 'scripts')):
+                start = time.perf_counter()
+                build_decision_tree(random_state=seed, n_jobs=n_jobs)
+                with open('../data/best_params.json', 'r') as f:
+                    build_info = json.load(f)
+                timings['build'] = time.perf_counter() - start
+                
+                start = time.perf_counter()
+                X_train, X_test, y_train, y_test, _, model = load_data_and_model()
+                operating_point = optimize_operating_point(model, X_train, y_train, random_state=seed)
+                metrics = detailed_evaluation(model, X_test, y_test)
+                timings['evaluate'] = time.perf_counter() - start
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        'seed': seed,
+        'metrics': {name: float(metrics[name]) for name in METRICS},
+        'threshold': None if operating_point['degenerate'] else operating_point['threshold'],
+        'best_params': build_info['best_params'],
+        'best_cv_score': build_info['best_cv_score'],
+        'final_model': build_info['final_model'],
+        'depth': int(model.get_depth()),
+        'timings': timings,
+        'seconds': sum(timings.values())
+    }
+
+def run_seeds(seeds, n_workers=None, path=RAW_DATASET):
+    """Executa o pipeline para cada seed em um pool de processos (n_workers=1: sequencial)
+
+    No pool, cada seed usa um processo (busca em grade com n_jobs=1); no modo
+    sequencial, a busca em grade de cada seed usa todos os processadores.
+    """
+    start = time.perf_counter()
+    data = pd.read_csv(path)
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    n_workers = min(n_workers or os.cpu_count() or 1, len(seeds))
+    try:
+        if n_workers > 1:
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                     initargs=(data,)) as executor:
+                results = list(executor.map(partial(run_seed, n_jobs=1), seeds))
+        else:
+            _init_worker(data)
+            results = [run_seed(seed, n_jobs=-1) for seed in seeds]
+    finally:
+        _WORKER_DATA.clear()
+    wall_time = time.perf_counter() - start
+
+    return {
+        'results': results,
+        'n_workers': n_workers,
+        'load_time': load_time,
+        'wall_time': wall_time,
+        'task_time': sum(result['seconds'] for result in results),
+        'throughput': len(seeds) / wall_time
+    }
+
+def aggregate(results):
+    """Média, desvio, mínimo, máximo e intervalo de 95% (percentis) de cada métrica"""
+    summary = {}
+    for name in METRICS:
+        values = np.array([result['metrics'][name] for result in results])
+        summary[name] = {
+            'mean': float(values.mean()),
+            'std': float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+            'min': float(values.min()),
+            'max': float(values.max()),
+            'p2.5': float(np.percentile(values, 2.5)),
+            'p97.5': float(np.percentile(values, 97.5))
+        }
+    return summary
+
+def format_report(run, summary, sequential=None):
+    """Seção do relatório com a distribuição das métricas e o throughput"""
+    results = run['results']
+    lines = [
+        REPORT_HEADER,
+        '=' * len(REPORT_HEADER),
+        '',
+        f"Seeds: {', '.join(str(result['seed']) for result in results)}",
+        f"{'métrica':<12} {'média':>8} {'desvio':>8} {'mín':>8} {'máx':>8} {'IC 95%':>17}"
+    ]
+    for name, item in summary.items():
+        lines.append(f"{name:<12} {item['mean']:>8.4f} {item['std']:>8.4f} {item['min']:>8.4f} "
+                     f"{item['max']:>8.4f}   [{item['p2.5']:.4f}, {item['p97.5']:.4f}]")
+
+    models = [result['final_model'] for result in results]
+    thresholds = [result['threshold'] for result in results if result['threshold'] is not None]
+    lines += [
+        '',
+        f"Modelo escolhido: Otimizado em {models.count('Otimizado')} de {len(models)} seeds; "
+        f"profundidade de {min(r['depth'] for r in results)} a {max(r['depth'] for r in results)}",
+        f"Limiar de decisão (validação cruzada no treino): "
+        + (f"{min(thresholds):.4f} a {max(thresholds):.4f}" if thresholds else "padrão em todas as seeds"),
+        '',
+        'THROUGHPUT:',
+        f"- Paralelo ({run['n_workers']} processos): {run['wall_time']:.2f}s "
+        f"({run['throughput']:.2f} seeds/s)"
+    ]
+    if sequential is not None:
+        lines.append(f"- Sequencial (medido): {sequential['wall_time']:.2f}s "
+                     f"({sequential['throughput']:.2f} seeds/s) - ganho {sequential['wall_time'] / run['wall_time']:.2f}x")
+    else:
+        lines.append(f"- Sequencial (soma das execuções): {run['task_time']:.2f}s "
+                     f"({len(results) / run['task_time']:.2f} seeds/s) - ganho {run['task_time'] / run['wall_time']:.2f}x")
+    lines.append(f"- Dataset bruto carregado uma vez em {run['load_time']:.3f}s")
+    return '\n'.join(lines) + '\n'
+
+def write_report(section, path=REPORT_PATH):
+    """Salva a distribuição das métricas em um relatório próprio"""
+    with open(path, 'w') as f:
+        f.write(section)
+    print(f"Distribuição das métricas salva em '{path}'")
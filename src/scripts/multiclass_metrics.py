@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Métricas um-contra-todos (one-vs-rest) vetorizadas para classificação binária e multiclasse
+"""
+
+import numpy as np
+from scipy.stats import rankdata
+
+def _safe_divide(numerator, denominator):
+    """Divisão elemento a elemento que retorna 0 quando o denominador é 0"""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator),
+                     where=denominator > 0)
+
+def confusion_matrix_fast(y_true, y_pred, n_classes):
+    """Matriz de confusão com um único bincount"""
+    y_true = np.asarray(y_true, dtype=np.int64).ravel()
+    y_pred = np.asarray(y_pred, dtype=np.int64).ravel()
+    counts = np.bincount(y_true * n_classes + y_pred, minlength=n_classes * n_classes)
+    return counts.reshape(n_classes, n_classes)
+
+def one_vs_rest_auc(y_true, y_proba):
+    """AUC-ROC de cada classe contra as demais (estatística de Mann-Whitney)"""
+    y_true = np.asarray(y_true, dtype=np.int64).ravel()
+    y_proba = np.asarray(y_proba, dtype=np.float64)
+    n_classes = y_proba.shape[1]
+
+    positives = y_true[:, None] == np.arange(n_classes)[None, :]
+    n_pos = positives.sum(axis=0)
+    n_neg = len(y_true) - n_pos
+
+    # Postos de todas as colunas de uma vez (empates recebem o posto médio)
+    ranks = rankdata(y_proba, axis=0)
+    rank_sum = (ranks * positives).sum(axis=0)
+    auc = _safe_divide(rank_sum - n_pos * (n_pos + 1) / 2, n_pos * n_neg)
+    auc[(n_pos == 0) | (n_neg == 0)] = np.nan
+    return auc
+
+def one_vs_rest_metrics(y_true, y_pred, y_proba=None, n_classes=None):
+    """Métricas clínicas por classe (um-contra-todos) e médias macro"""
+    if n_classes is None:
+        n_classes = int(max(np.max(y_true), np.max(y_pred))) + 1
+    cm = confusion_matrix_fast(y_true, y_pred, n_classes)
+
+    total = cm.sum()
+    tp = np.diag(cm)
+    fp = cm.sum(axis=0) - tp
+    fn = cm.sum(axis=1) - tp
+    tn = total - tp - fp - fn
+
+    per_class = {
+        'sensitivity': _safe_divide(tp, tp + fn),
+        'specificity': _safe_divide(tn, tn + fp),
+        'ppv': _safe_divide(tp, tp + fp),
+        'npv': _safe_divide(tn, tn + fn),
+        'f1': _safe_divide(2 * tp, 2 * tp + fp + fn),
+        'support': tp + fn
+    }
+    if y_proba is not None:
+        per_class['auc'] = one_vs_rest_auc(y_true, y_proba)
+
+    macro = {
+        name: float(np.nanmean(values)) if not np.all(np.isnan(values)) else None
+        for name, values in per_class.items() if name != 'support'
+    }
+    macro['accuracy'] = float(tp.sum() / total) if total else 0.0
+
+    return {
+        'confusion_matrix': cm,
+        'per_class': {name: values.tolist() for name, values in per_class.items()},
+        'macro': macro
+    }
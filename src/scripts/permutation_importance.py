@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Script para calcular a importância por permutação (e por remoção de coluna)
+das features da árvore de decisão
+"""
+
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+import joblib
+from threshold_optimization import get_threshold, predict_with_threshold
+
+# Cache em memória (LRU): (versão do modelo, dados, parâmetros) -> resultado
+MAX_CACHE_ENTRIES = 32
+# Linhas do bloco de trabalho de cada thread na importância por permutação
+CHUNK_ROWS = 16_384
+_IMPORTANCE_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+def model_version(model):
+    """Identificador da versão do modelo a partir dos arrays da árvore (e do limiar salvo)"""
+    tree = model.tree_
+    digest = hashlib.sha1()
+    for array in (tree.children_left, tree.children_right, tree.feature,
+                  tree.threshold, tree.value):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    if get_threshold(model) is not None:
+        digest.update(repr(float(get_threshold(model))).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+def data_fingerprint(X, y):
+    """Identificador do conjunto de avaliação"""
+    digest = hashlib.sha1()
+    # Buffer contíguo direto no hash (mesmos bytes de tobytes(), sem copiar X)
+    digest.update(np.ascontiguousarray(X))
+    digest.update(np.ascontiguousarray(y))
+    return digest.hexdigest()[:16]
+
+def _remember(key, result):
+    """Guarda no cache em memória, descartando o resultado usado há mais tempo"""
+    with _CACHE_LOCK:
+        _IMPORTANCE_CACHE[key] = result
+        _IMPORTANCE_CACHE.move_to_end(key)
+        while len(_IMPORTANCE_CACHE) > MAX_CACHE_ENTRIES:
+            _IMPORTANCE_CACHE.popitem(last=False)
+
+def _load_cached(key, cache_dir):
+    """Busca um resultado no cache em memória ou em disco"""
+    with _CACHE_LOCK:
+        if key in _IMPORTANCE_CACHE:
+            _IMPORTANCE_CACHE.move_to_end(key)
+            return _IMPORTANCE_CACHE[key]
+    if cache_dir:
+        path = os.path.join(cache_dir, f"{key}.json")
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                result = json.load(f)
+            _remember(key, result)
+            return result
+    return None
+
+def _store_cached(key, result, cache_dir):
+    """Salva um resultado no cache em memória e em disco"""
+    _remember(key, result)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(os.path.join(cache_dir, f"{key}.json"), 'w') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+def permutation_importance_fast(model, X, y, feature_names, n_repeats=5, random_state=42,
+                                n_jobs=None, cache_dir='../data/importance_cache'):
+    """Importância por permutação com predições em lote e pool de threads
+
+    Cada thread pontua em blocos de CHUNK_ROWS linhas (bloco de X com a coluna
+    embaralhada): a memória extra é n_jobs x CHUNK_ROWS x features, não cópias de X.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float32)  # A árvore trabalha em float32
+    y = np.asarray(y).ravel()
+    n_samples, n_features = X.shape
+
+    key = f"perm_{model_version(model)}_{data_fingerprint(X, y)}_{n_repeats}_{random_state}"
+    cached = _load_cached(key, cache_dir)
+    if cached is not None:
+        return cached
+
+    # Mesmas predições do modelo servido (limiar salvo pelo ponto de operação, se houver)
+    baseline = float((predict_with_threshold(model, X) == y).mean())
+
+    # Permutar uma feature que a árvore não usa não altera nenhuma predição
+    tree = model.tree_
+    used_features = set(int(f) for f in tree.feature[tree.children_left != -1])
+
+    # Bloco de trabalho por thread: só o bloco de linhas avaliado recebe a coluna permutada
+    local = threading.local()
+
+    def score_feature(j):
+        if j not in used_features:
+            return np.zeros(n_repeats)
+        if not hasattr(local, 'buffer'):
+            local.buffer = np.empty((min(CHUNK_ROWS, n_samples), n_features), dtype=X.dtype)
+        buffer = local.buffer
+        rng = np.random.default_rng([random_state, j])
+        scores = np.empty(n_repeats)
+        for repeat in range(n_repeats):
+            permuted = X[rng.permutation(n_samples), j]
+            correct = 0
+            for start in range(0, n_samples, len(buffer)):
+                block = buffer[:min(len(buffer), n_samples - start)]
+                block[:] = X[start:start + len(block)]
+                block[:, j] = permuted[start:start + len(block)]
+                correct += int((predict_with_threshold(model, block) == y[start:start + len(block)]).sum())
+            scores[repeat] = correct / n_samples
+        return baseline - scores
+
+    with ThreadPoolExecutor(max_workers=n_jobs or os.cpu_count()) as executor:
+        drops = list(executor.map(score_feature, range(n_features)))
+
+    drops = np.array(drops)
+    result = {
+        'model_version': model_version(model),
+        'method': 'permutation',
+        'baseline_score': baseline,
+        'n_repeats': n_repeats,
+        'features': list(feature_names),
+        'importance_mean': drops.mean(axis=1).tolist(),
+        'importance_std': drops.std(axis=1).tolist()
+    }
+    _store_cached(key, result, cache_dir)
+    return result
+
+def drop_column_importance(model, X_train, y_train, X_eval, y_eval, feature_names,
+                           n_jobs=None, cache_dir='../data/importance_cache'):
+    """Importância por remoção de coluna (retreina o modelo sem cada feature)"""
+    X_train = np.asarray(X_train)
+    X_eval = np.asarray(X_eval)
+    y_eval = np.asarray(y_eval).ravel()
+    n_features = X_train.shape[1]
+
+    key = f"drop_{model_version(model)}_{data_fingerprint(X_eval, y_eval)}"
+    cached = _load_cached(key, cache_dir)
+    if cached is not None:
+        return cached
+
+    baseline = float((predict_with_threshold(model, X_eval) == y_eval).mean())
+
+    def score_without(j):
+        columns = np.delete(np.arange(n_features), j)
+        reduced = clone(model).fit(X_train[:, columns], y_train)
+        reduced.decision_threshold_ = get_threshold(model)  # Mesmo ponto de operação do modelo completo
+        return baseline - float((predict_with_threshold(reduced, X_eval[:, columns]) == y_eval).mean())
+
+    with ThreadPoolExecutor(max_workers=n_jobs or os.cpu_count()) as executor:
+        drops = list(executor.map(score_without, range(n_features)))
+
+    result = {
+        'model_version': model_version(model),
+        'method': 'drop_column',
+        'baseline_score': baseline,
+        'features': list(feature_names),
+        'importance_mean': drops,
+        'importance_std': [0.0] * n_features
+    }
+    _store_cached(key, result, cache_dir)
+    return result
+
+def importance_to_dataframe(result):
+    """Converte o resultado em DataFrame ordenado pela importância"""
+    return pd.DataFrame({
+        'feature': result['features'],
+        'importance_mean': result['importance_mean'],
+        'importance_std': result['importance_std']
+    }).sort_values('importance_mean', ascending=False)
+
+if __name__ == "__main__":
+    X_train = np.load('../data/X_train.npy')
+    X_test = np.load('../data/X_test.npy')
+    y_train = np.load('../data/y_train.npy')
+    y_test = np.load('../data/y_test.npy')
+    with open('../data/feature_names.txt', 'r') as f:
+        feature_names = [line.strip() for line in f.readlines()]
+    model = joblib.load('../models/decision_tree_model.pkl')
+
+    print("=== IMPORTÂNCIA POR PERMUTAÇÃO ===")
+    permutation = importance_to_dataframe(
+        permutation_importance_fast(model, X_test, y_test, feature_names)
+    )
+    print(permutation.head(10))
+    permutation.to_csv('../data/permutation_importance.csv', index=False)
+
+    print("\n=== IMPORTÂNCIA POR REMOÇÃO DE COLUNA ===")
+    drop_column = importance_to_dataframe(
+        drop_column_importance(model, X_train, y_train, X_test, y_test, feature_names)
+    )
+    print(drop_column.head(10))
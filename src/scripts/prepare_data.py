@@ -3,19 +3,47 @@
 Script para preparar os dados para construção da árvore de decisão
 """
 
+import os
+import io
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import contextlib
+import tracemalloc
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
 import matplotlib.pyplot as plt
 import seaborn as sns
+from input_validation import build_profile, save_profile
 
-def prepare_data():
-    """Prepara os dados para a árvore de decisão"""
+# Esquema reduzido salvo por feature_selection.py (usado com --selected)
+SELECTION_PATH = '../data/selected_features.json'
+
+def selected_columns(selection):
+    """Colunas lidas do CSV no esquema reduzido (None: todas)"""
+    if selection is None:
+        return None
+    return selection['features'] + ['Diagnosis']
+
+def prepare_data(make_plots=True, random_state=42, data=None, selection=None):
+    """Prepara os dados para a árvore de decisão
+
+    data: CSV bruto já carregado (opcional); selection: esquema reduzido de
+    feature_selection.py - só as colunas selecionadas são lidas e salvas.
+    """
     print("=== PREPARAÇÃO DOS DADOS ===")
     
     # Carregar dados
-    data = pd.read_csv('breast_cancer_data.csv')
+    columns = selected_columns(selection)
+    if data is None:
+        data = pd.read_csv('breast_cancer_data.csv', usecols=columns)
+    if columns is not None:
+        data = data[columns]
+        print(f"Esquema reduzido: {len(selection['features'])} features selecionadas")
     print(f"Dados carregados: {data.shape}")
     
     # Separar features e target
@@ -42,12 +70,13 @@ def prepare_data():
     correlation_with_target = data_encoded.corr()['Diagnosis'].abs().sort_values(ascending=False)
     print("Top 10 features mais correlacionadas com o diagnóstico:")
     print(correlation_with_target.head(11)[1:])  # Excluir a própria variável target
+    save_target_correlation(correlation_with_target.drop('Diagnosis'))
     
     # Dividir dados em treino e teste
     X_train, X_test, y_train, y_test = train_test_split(
         X, y_encoded, 
         test_size=0.2, 
-        random_state=42, 
+        random_state=random_state, 
         stratify=y_encoded
     )
     
@@ -75,8 +104,14 @@ def prepare_data():
         f.write("B (Benigno): 0\n")
         f.write("M (Maligno): 1\n")
     
+    # Perfil do treino (faixas, quantis e classes) para validar entradas e medir drift
+    save_profile(build_profile(X_train.values, y_train, feature_names))
+    
     print("\nDados preparados e salvos com sucesso!")
     
+    if not make_plots:
+        return X_train, X_test, y_train, y_test, feature_names, class_mapping
+    
     # Criar visualização da distribuição das classes
     plt.figure(figsize=(10, 6))
     
@@ -116,6 +151,256 @@ def prepare_data():
     
     return X_train, X_test, y_train, y_test, feature_names, class_mapping
 
+def save_target_correlation(correlation, path='target_correlation.csv'):
+    """Salva a correlação absoluta de cada feature com o target (usada na seleção de features)"""
+    correlation.rename_axis('feature').reset_index(name='correlation').to_csv(path, index=False)
+
+def read_data_lean(path='breast_cancer_data.csv', chunk_rows=100_000, feature_names=None):
+    """Lê o CSV em blocos direto para um array float32 pré-alocado (feature_names: só essas colunas)"""
+    if feature_names is None:
+        columns = pd.read_csv(path, nrows=0).columns.tolist()
+        feature_names = [c for c in columns if c != 'Diagnosis']
+    
+    # Contar linhas sem carregar o arquivo
+    with open(path, 'rb') as f:
+        n_rows = sum(block.count(b'\n') for block in iter(lambda: f.read(1 << 20), b''))
+    with open(path, 'rb') as f:
+        f.seek(-1, 2)
+        if f.read(1) != b'\n':
+            n_rows += 1
+    n_rows -= 1  # Cabeçalho
+    
+    X = np.empty((n_rows, len(feature_names)), dtype=np.float32)
+    codes = np.empty(n_rows, dtype=np.int8)
+    labels = []
+    
+    start = 0
+    dtypes = {name: np.float32 for name in feature_names}
+    for chunk in pd.read_csv(path, dtype=dtypes, usecols=feature_names + ['Diagnosis'],
+                             chunksize=chunk_rows):
+        end = start + len(chunk)
+        X[start:end] = chunk[feature_names].to_numpy(dtype=np.float32)
+        
+        chunk_labels, chunk_codes = np.unique(chunk['Diagnosis'].to_numpy(), return_inverse=True)
+        mapping = []
+        for label in chunk_labels:
+            if label not in labels:
+                labels.append(label)
+            mapping.append(labels.index(label))
+        codes[start:end] = np.asarray(mapping, dtype=np.int8)[chunk_codes]
+        start = end
+    
+    # Reordenar os códigos como o LabelEncoder (classes em ordem alfabética)
+    classes = sorted(labels)
+    remap = np.array([classes.index(label) for label in labels], dtype=np.int64)
+    y_encoded = remap[codes]
+    
+    return X[:start], y_encoded[:start], feature_names, classes
+
+def target_correlation(X, y, chunk_rows=65_536):
+    """Correlação de Pearson de cada feature com o target em uma única passada"""
+    n_rows, n_features = X.shape
+    sum_x = np.zeros(n_features)
+    sum_xx = np.zeros(n_features)
+    sum_xy = np.zeros(n_features)
+    sum_y = 0.0
+    sum_yy = 0.0
+    
+    # Acumuladores em float64 sobre blocos de linhas (sem copiar a matriz)
+    for start in range(0, n_rows, chunk_rows):
+        block = X[start:start + chunk_rows].astype(np.float64)
+        y_block = y[start:start + chunk_rows].astype(np.float64)
+        sum_x += block.sum(axis=0)
+        sum_xx += np.einsum('ij,ij->j', block, block)
+        sum_xy += y_block @ block
+        sum_y += y_block.sum()
+        sum_yy += y_block @ y_block
+    
+    cov = sum_xy - sum_x * sum_y / n_rows
+    var_x = sum_xx - sum_x ** 2 / n_rows
+    var_y = sum_yy - sum_y ** 2 / n_rows
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return cov / np.sqrt(var_x * var_y)
+
+def top_feature_correlation_matrix(X, y, top_indices, feature_names):
+    """Matriz de correlação apenas das top features e do target (sob demanda)"""
+    columns = np.column_stack([X[:, top_indices].astype(np.float64), y])
+    names = [feature_names[i] for i in top_indices] + ['Diagnosis']
+    return pd.DataFrame(np.corrcoef(columns, rowvar=False), index=names, columns=names)
+
+def save_split(X, indices, path, chunk_rows=65_536):
+    """Salva X[indices] em .npy escrevendo em blocos (sem cópia completa em memória)"""
+    output = np.lib.format.open_memmap(path, mode='w+', dtype=X.dtype,
+                                       shape=(len(indices), X.shape[1]))
+    for start in range(0, len(indices), chunk_rows):
+        output[start:start + chunk_rows] = X[indices[start:start + chunk_rows]]
+    output.flush()
+    del output
+
+def prepare_data_lean(make_plots=True, random_state=42, selection=None):
+    """Prepara os dados com uso reduzido de memória
+
+    - features em float32 (a árvore do scikit-learn já trabalha em float32)
+    - apenas o vetor de correlação com o target, em uma única passada
+    - heatmap das top 10 features calculado só quando há visualizações
+    - divisão treino/teste como arrays de índices (mesma divisão do modo padrão)
+    - com selection, só as colunas do esquema reduzido são lidas e salvas
+    """
+    print("=== PREPARAÇÃO DOS DADOS (MODO ENXUTO) ===")
+    
+    X, y_encoded, feature_names, classes = read_data_lean(
+        'breast_cancer_data.csv', feature_names=None if selection is None else selection['features']
+    )
+    print(f"Features (X): {X.shape} ({X.nbytes / 1e6:.1f} MB em float32)")
+    print(f"Target (y): {y_encoded.shape}")
+    print(f"Classes originais: {classes}")
+    
+    class_mapping = {label: i for i, label in enumerate(classes)}
+    print(f"Mapeamento: {class_mapping}")
+    
+    # Análise de correlação (somente o vetor feature x target)
+    print("\n=== ANÁLISE DE CORRELAÇÃO ===")
+    correlation = pd.Series(np.abs(target_correlation(X, y_encoded)), index=feature_names)
+    correlation_with_target = correlation.sort_values(ascending=False)
+    print("Top 10 features mais correlacionadas com o diagnóstico:")
+    print(correlation_with_target.head(10))
+    save_target_correlation(correlation_with_target)
+    
+    # Dividir dados como índices
+    train_idx, test_idx = train_test_split(
+        np.arange(len(y_encoded)),
+        test_size=0.2,
+        random_state=random_state,
+        stratify=y_encoded
+    )
+    y_train = y_encoded[train_idx]
+    y_test = y_encoded[test_idx]
+    
+    print(f"\n=== DIVISÃO DOS DADOS ===")
+    print(f"Treino: {len(train_idx)} amostras")
+    print(f"Teste: {len(test_idx)} amostras")
+    print(f"Distribuição no treino: {np.bincount(y_train)}")
+    print(f"Distribuição no teste: {np.bincount(y_test)}")
+    
+    # Salvar dados preparados (mesmos arquivos do modo padrão + índices)
+    save_split(X, train_idx, 'X_train.npy')
+    save_split(X, test_idx, 'X_test.npy')
+    np.save('y_train.npy', y_train)
+    np.save('y_test.npy', y_test)
+    np.save('train_idx.npy', train_idx)
+    np.save('test_idx.npy', test_idx)
+    
+    with open('feature_names.txt', 'w') as f:
+        for name in feature_names:
+            f.write(f"{name}\n")
+    
+    with open('class_mapping.txt', 'w') as f:
+        f.write("B (Benigno): 0\n")
+        f.write("M (Maligno): 1\n")
+    
+    # Perfil do treino (faixas, quantis e classes) para validar entradas e medir drift
+    save_profile(build_profile(X, y_train, feature_names, rows=train_idx))
+    
+    print("\nDados preparados e salvos com sucesso!")
+    
+    if make_plots:
+        # Distribuição das classes a partir das contagens
+        counts = np.bincount(y_encoded)
+        plt.figure(figsize=(10, 6))
+        plt.subplot(1, 2, 1)
+        plt.bar(classes, counts, color=['lightblue', 'lightcoral'])
+        plt.title('Distribuição das Classes\n(Original)')
+        plt.xlabel('Diagnóstico')
+        plt.ylabel('Frequência')
+        plt.subplot(1, 2, 2)
+        plt.bar([str(i) for i in range(len(classes))], counts, color=['lightblue', 'lightcoral'])
+        plt.title('Distribuição das Classes\n(Codificada)')
+        plt.xlabel('Diagnóstico')
+        plt.ylabel('Frequência')
+        plt.tight_layout()
+        plt.savefig('class_distribution.png', dpi=300, bbox_inches='tight')
+        plt.close()
+        
+        # Heatmap calculado sob demanda só com as top 10 features
+        top_indices = [feature_names.index(name) for name in correlation_with_target.head(10).index]
+        correlation_matrix = top_feature_correlation_matrix(X, y_encoded, top_indices, feature_names)
+        plt.figure(figsize=(12, 8))
+        sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', center=0,
+                    square=True, fmt='.2f')
+        plt.title('Correlação entre Top 10 Features e Diagnóstico')
+        plt.tight_layout()
+        plt.savefig('correlation_heatmap.png', dpi=300, bbox_inches='tight')
+        plt.close()
+        
+        print("Visualizações salvas: 'class_distribution.png' e 'correlation_heatmap.png'")
+    
+    return X, y_encoded, train_idx, test_idx, feature_names, class_mapping
+
+def measure_peak_memory(function, **kwargs):
+    """Executa a função e retorna o pico de memória alocada (MB)"""
+    tracemalloc.start()
+    try:
+        function(**kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1e6
+
+def memory_report():
+    """Compara o pico de memória do modo padrão e do modo enxuto"""
+    peak_default = measure_peak_memory(prepare_data, make_plots=False)
+    peak_lean = measure_peak_memory(prepare_data_lean, make_plots=False)
+    
+    print("\n=== PICO DE MEMÓRIA ===")
+    print(f"Modo padrão: {peak_default:.2f} MB")
+    print(f"Modo enxuto: {peak_lean:.2f} MB")
+    print(f"Redução: {1 - peak_lean / peak_default:.1%}")
+    return peak_default, peak_lean
+
+def measure_storage(selection=None, csv_path='breast_cancer_data.csv', random_state=42):
+    """Tamanho (bytes) de cada arquivo gravado por prepare_data (todas as features ou o esquema reduzido)
+
+    A preparação roda em um diretório temporário com a estrutura de src/ (data e models).
+    """
+    csv_path = os.path.abspath(csv_path)
+    original = os.getcwd()
+    with tempfile.TemporaryDirectory() as root:
+        for folder in ('data', 'models'):
+            os.makedirs(os.path.join(root, folder))
+        shutil.copyfile(csv_path, os.path.join(root, 'data', 'breast_cancer_data.csv'))
+        os.chdir(os.path.join(root, 'data'))
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                prepare_data(make_plots=False, random_state=random_state, selection=selection)
+        finally:
+            os.chdir(original)
+        return {f"{folder}/{name}": os.path.getsize(os.path.join(root, folder, name))
+                for folder in ('data', 'models')
+                for name in sorted(os.listdir(os.path.join(root, folder)))
+                if name != 'breast_cancer_data.csv'}
+
+def seed_argument(default=42):
+    """Valor de --seed na linha de comando (demais argumentos são ignorados)"""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--seed', type=int, default=default,
+                        help='Seed da divisão treino/teste e das árvores (padrão: 42)')
+    return parser.parse_known_args()[0].seed
+
+def load_selection(path=SELECTION_PATH):
+    """Carrega o esquema reduzido salvo por feature_selection.py"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
 if __name__ == "__main__":
-    X_train, X_test, y_train, y_test, feature_names, class_mapping = prepare_data()
+    # --selected: grava só as features escolhidas por feature_selection.py
+    selection = load_selection() if '--selected' in sys.argv else None
+    if '--memory-report' in sys.argv:
+        memory_report()
+    elif '--lean' in sys.argv:
+        prepare_data_lean(make_plots='--no-plots' not in sys.argv, random_state=seed_argument(),
+                          selection=selection)
+    else:
+        X_train, X_test, y_train, y_test, feature_names, class_mapping = prepare_data(
+            random_state=seed_argument(), selection=selection
+        )
 
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Busca em grade com os dados de treino e os índices dos folds em memória compartilhada
+(memmap em /dev/shm: os workers do joblib abrem o mesmo arquivo em vez de receber cópias)
+"""
+
+import os
+import gc
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+import numpy as np
+from sklearn.tree import DecisionTreeClassifier
+from sklearn.model_selection import GridSearchCV, StratifiedKFold
+
+SHARED_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+def share_array(array, folder, name):
+    """Salva o array em disco e o reabre como memmap somente leitura"""
+    path = os.path.join(folder, f"{name}.npy")
+    np.save(path, np.ascontiguousarray(array))
+    return np.load(path, mmap_mode='r')
+
+def fold_indices(y, n_splits=5):
+    """Índices dos folds estratificados (mesmos folds de cv=5 no GridSearchCV)"""
+    splitter = StratifiedKFold(n_splits=n_splits)
+    return list(splitter.split(np.zeros(len(y)), y))
+
+@contextlib.contextmanager
+def shared_training_data(X, y, n_splits=5, folder=None):
+    """Coloca X, y e os índices dos folds em memmaps (removidos ao sair do bloco)"""
+    folder = tempfile.mkdtemp(prefix='grid_search_', dir=folder or SHARED_DIR)
+    try:
+        # float32 é o tipo usado internamente pela árvore (evita uma conversão por ajuste)
+        X_shared = share_array(np.asarray(X, dtype=np.float32), folder, 'X')
+        y_shared = share_array(np.asarray(y), folder, 'y')
+        folds = [
+            (share_array(train, folder, f"train_{i}"), share_array(test, folder, f"test_{i}"))
+            for i, (train, test) in enumerate(fold_indices(y, n_splits))
+        ]
+        yield X_shared, y_shared, folds
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+def shared_grid_search(estimator, param_grid, X, y, n_splits=5, scoring='accuracy',
+                       n_jobs=-1, verbose=0):
+    """GridSearchCV em que os workers acessam os dados de treino sem cópia"""
+    with shared_training_data(X, y, n_splits) as (X_shared, y_shared, folds):
+        grid_search = GridSearchCV(estimator, param_grid, cv=folds, scoring=scoring,
+                                   n_jobs=n_jobs, verbose=verbose)
+        grid_search.fit(X_shared, y_shared)
+    # Os memmaps dos folds não são mais necessários após o ajuste
+    grid_search.cv = n_splits
+    return grid_search
+
+def _read_status(pid, field):
+    """Valor (em KB) de um campo de /proc/<pid>/status"""
+    try:
+        with open(f"/proc/{pid}/status", 'r') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+def worker_pids():
+    """PIDs dos workers do joblib (processos filhos do loky)"""
+    parent = os.getpid()
+    pids = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", 'r') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+            with open(f"/proc/{entry}/cmdline", 'rb') as f:
+                cmdline = f.read().decode('utf-8', 'replace')
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == parent and 'loky' in cmdline and 'resource_tracker' not in cmdline:
+            pids.append(int(entry))
+    return pids
+
+def _shutdown_workers():
+    """Encerra os workers reutilizáveis (cada medição começa com processos novos)"""
+    from joblib.externals.loky import get_reusable_executor
+    get_reusable_executor().shutdown(wait=True)
+    gc.collect()
+
+def _run_search(X, y, param_grid, n_jobs, shared):
+    """Executa uma busca e mede tempo e memória (pico) de cada worker"""
+    _shutdown_workers()
+    estimator = DecisionTreeClassifier(random_state=42)
+    start = time.perf_counter()
+    if shared:
+        grid_search = shared_grid_search(estimator, param_grid, X, y, n_jobs=n_jobs)
+    else:
+        grid_search = GridSearchCV(estimator, param_grid, cv=5, scoring='accuracy', n_jobs=n_jobs)
+        grid_search.fit(X, y)
+    elapsed = time.perf_counter() - start
+
+    # O pico de RSS (VmHWM) inclui as cópias recebidas durante a busca
+    peaks = [_read_status(pid, 'VmHWM') for pid in worker_pids()]
+    peaks = [kb for kb in peaks if kb is not None]
+    fits = len(grid_search.cv_results_['params']) * 5
+    return {
+        'n_jobs': n_jobs,
+        'shared': shared,
+        'time_s': elapsed,
+        'fits_per_s': fits / elapsed,
+        'workers': len(peaks),
+        'worker_peak_rss_mb': float(np.mean(peaks)) / 1024 if peaks else None,
+        'total_peak_rss_mb': float(np.sum(peaks)) / 1024 if peaks else None,
+        'best_params': grid_search.best_params_
+    }
+
+def scaling_report(X, y, param_grid, worker_counts):
+    """Tempo, vazão e memória por worker da busca com e sem memória compartilhada"""
+    print("\n=== ESCALABILIDADE DA BUSCA EM GRADE ===")
+    print(f"Dados: {X.shape[0]} amostras x {X.shape[1]} features ({X.nbytes / 1024 ** 2:.1f} MB)")
+    print(f"{'workers':>8} {'modo':>12} {'tempo (s)':>10} {'ajustes/s':>10} "
+          f"{'RSS/worker (MB)':>16} {'RSS total (MB)':>15}")
+
+    results = []
+    for n_jobs in worker_counts:
+        for shared in (False, True):
+            result = _run_search(X, y, param_grid, n_jobs, shared)
+            results.append(result)
+            mode = 'compartilhado' if shared else 'cópias'
+            # Com 1 worker a busca roda no próprio processo (sem workers para medir)
+            worker_rss, total_rss = (
+                (f"{result['worker_peak_rss_mb']:.1f}", f"{result['total_peak_rss_mb']:.1f}")
+                if result['workers'] else ('-', '-')
+            )
+            print(f"{n_jobs:>8} {mode:>12} {result['time_s']:>10.2f} {result['fits_per_s']:>10.1f} "
+                  f"{worker_rss:>16} {total_rss:>15}")
+
+        copied, shared = results[-2], results[-1]
+        if copied['best_params'] != shared['best_params']:
+            print("⚠️  Melhores parâmetros diferentes entre os modos")
+    _shutdown_workers()
+    return results
+
+if __name__ == "__main__":
+    from build_decision_tree import PARAM_GRID
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count()],
+                        help='Números de workers avaliados')
+    parser.add_argument('--repeat-rows', type=int, default=50,
+                        help='Replica as amostras de treino para simular dados maiores')
+    args = parser.parse_args()
+
+    X_train = np.load('../data/X_train.npy')
+    y_train = np.load('../data/y_train.npy')
+
+    # Réplicas com um pequeno ruído (mantém a busca representativa em dados maiores)
+    rng = np.random.default_rng(42)
+    X_large = np.tile(X_train, (args.repeat_rows, 1))
+    X_large *= rng.normal(1.0, 0.01, size=X_large.shape)
+    y_large = np.tile(y_train, args.repeat_rows)
+
+    scaling_report(X_large, y_large, PARAM_GRID, sorted(set(args.workers)))
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Script para otimizar o limiar de decisão (ponto de operação) da árvore de decisão
+"""
+
+import numpy as np
+import pandas as pd
+import joblib
+from sklearn.base import clone
+from sklearn.model_selection import StratifiedKFold, cross_val_predict
+
+# Folds usados para obter as probabilidades fora do fold do treino
+N_SPLITS = 5
+
+def sweep_thresholds(y_true, y_score):
+    """Calcula as métricas de todos os limiares em uma única passada ordenada"""
+    y_true = np.asarray(y_true).ravel()
+    y_score = np.asarray(y_score).ravel()
+
+    # Ordenar escores em ordem decrescente e acumular positivos/negativos
+    order = np.argsort(-y_score, kind='mergesort')
+    scores = y_score[order]
+    positives = (y_true[order] == 1).astype(np.int64)
+
+    # Último índice de cada escore distinto: predição positiva se escore >= limiar
+    distinct = np.r_[np.where(np.diff(scores))[0], scores.size - 1]
+    tp = np.cumsum(positives)[distinct]
+    fp = (distinct + 1) - tp
+
+    total_pos = int(positives.sum())
+    total_neg = int(scores.size - total_pos)
+    fn = total_pos - tp
+    tn = total_neg - fp
+
+    sensitivity = tp / total_pos if total_pos else np.zeros(tp.size)
+    specificity = tn / total_neg if total_neg else np.zeros(tn.size)
+    ppv = tp / np.maximum(tp + fp, 1)
+    npv = tn / np.maximum(tn + fn, 1)
+
+    return {
+        'threshold': scores[distinct],
+        'tp': tp, 'fp': fp, 'fn': fn, 'tn': tn,
+        'sensitivity': sensitivity,
+        'specificity': specificity,
+        'ppv': ppv,
+        'npv': npv,
+        'accuracy': (tp + tn) / scores.size
+    }
+
+def select_threshold(sweep, target_sensitivity=None, target_specificity=None,
+                     cost_fn=None, cost_fp=None, min_specificity=0.0):
+    """Escolhe o ponto de operação conforme o critério informado
+
+    - target_sensitivity: maior limiar que atinge a sensibilidade mínima
+      (respeitando min_specificity; se impossível, a maior sensibilidade viável)
+    - target_specificity: menor limiar que atinge a especificidade mínima
+    - cost_fn/cost_fp: limiar de menor custo total (FN * cost_fn + FP * cost_fp)
+    - sem critério: limiar que maximiza o índice de Youden
+
+    Limiares que nunca predizem uma das classes (o último da varredura prediz tudo
+    positivo) não são candidatos; se a meta só seria atingida com eles, ela é limitada
+    à melhor sensibilidade/especificidade alcançável e `target_met` fica False.
+    """
+    valid = (sweep['tp'] + sweep['fp'] > 0) & (sweep['tn'] + sweep['fn'] > 0)
+    if not valid.any():
+        valid = np.ones(valid.size, dtype=bool)  # Escore único: nenhum limiar separa as classes
+    target_met = True
+
+    if target_sensitivity is not None:
+        feasible = valid & (sweep['specificity'] >= min_specificity)
+        candidates = np.where(feasible & (sweep['sensitivity'] >= target_sensitivity))[0]
+        if candidates.size:
+            index = candidates[0]
+        else:
+            target_met = False
+            index = int(np.argmax(np.where(feasible if feasible.any() else valid, sweep['sensitivity'], -1.0)))
+        criterion = f'sensibilidade >= {target_sensitivity:.2f}'
+        if min_specificity > 0:
+            criterion += f' (especificidade >= {min_specificity:.2f})'
+    elif target_specificity is not None:
+        candidates = np.where(valid & (sweep['specificity'] >= target_specificity))[0]
+        target_met = bool(candidates.size)
+        index = candidates[-1] if candidates.size else int(np.argmax(valid))
+        criterion = f'especificidade >= {target_specificity:.2f}'
+    elif cost_fn is not None or cost_fp is not None:
+        cost = sweep['fn'] * (cost_fn or 1.0) + sweep['fp'] * (cost_fp or 1.0)
+        index = int(np.argmin(np.where(valid, cost, np.inf)))
+        criterion = f'custo FN:FP = {cost_fn or 1.0:g}:{cost_fp or 1.0:g}'
+    else:
+        index = int(np.argmax(np.where(valid, sweep['sensitivity'] + sweep['specificity'] - 1, -np.inf)))
+        criterion = 'índice de Youden'
+
+    if not target_met:
+        reached = 'sensitivity' if target_sensitivity is not None else 'specificity'
+        criterion += f' - meta inatingível, limitada a {sweep[reached][index]:.2f}'
+
+    return {
+        'threshold': float(sweep['threshold'][index]),
+        'criterion': criterion,
+        'target_met': target_met,
+        # Uma das classes nunca é predita (probabilidades sem separação nenhuma)
+        'degenerate': bool(sweep['tp'][index] + sweep['fp'][index] == 0
+                           or sweep['tn'][index] + sweep['fn'][index] == 0),
+        **{name: float(sweep[name][index]) for name in
+           ('sensitivity', 'specificity', 'ppv', 'npv', 'accuracy')},
+        **{name: int(sweep[name][index]) for name in ('tp', 'fp', 'fn', 'tn')}
+    }
+
+def out_of_fold_scores(model, X, y, n_splits=N_SPLITS, random_state=42):
+    """Probabilidades da classe positiva fora do fold (validação cruzada no treino)"""
+    _, counts = np.unique(np.asarray(y).ravel(), return_counts=True)
+    cv = StratifiedKFold(n_splits=max(min(n_splits, int(counts.min())), 2),
+                         shuffle=True, random_state=random_state)
+    return cross_val_predict(clone(model), X, y, cv=cv, method='predict_proba')[:, -1]
+
+def choose_operating_point(model, X_train, y_train, n_splits=N_SPLITS, random_state=42, **criteria):
+    """Ponto de operação escolhido nas probabilidades fora do fold do treino
+
+    O teste não participa da escolha; as métricas do ponto são estimativas da
+    validação cruzada. Depende só dos dados de treino e dos hiperparâmetros
+    (clone descarta o limiar salvo), então repetir a escolha dá o mesmo limiar.
+    """
+    y_score = out_of_fold_scores(model, X_train, y_train, n_splits, random_state)
+    operating_point = select_threshold(sweep_thresholds(y_train, y_score), **criteria)
+    operating_point['source'] = 'out_of_fold'
+    return operating_point
+
+def get_threshold(model):
+    """Limiar salvo no artefato do modelo (None se não houver)"""
+    return getattr(model, 'decision_threshold_', None)
+
+def set_threshold(model, operating_point):
+    """Armazena o ponto de operação escolhido no próprio artefato do modelo"""
+    model.decision_threshold_ = operating_point['threshold']
+    model.operating_point_ = operating_point
+    return model
+
+def predict_with_threshold(model, X, y_score=None):
+    """Prediz usando o limiar salvo no modelo (predict padrão se não houver)"""
+    threshold = get_threshold(model)
+    if threshold is None:
+        return model.predict(X)
+    if y_score is None:
+        y_score = model.predict_proba(X)[:, 1]
+    return model.classes_[(np.asarray(y_score) >= threshold).astype(int)]
+
+def sweep_to_dataframe(sweep):
+    """Converte a varredura em DataFrame"""
+    return pd.DataFrame({name: np.asarray(values) for name, values in sweep.items()})
+
+if __name__ == "__main__":
+    X_train = np.load('../data/X_train.npy')
+    y_train = np.load('../data/y_train.npy')
+    model = joblib.load('../models/decision_tree_model.pkl')
+
+    # Probabilidades fora do fold do treino (o teste fica reservado para a avaliação)
+    y_pred_proba = out_of_fold_scores(model, X_train, y_train)
+    sweep = sweep_thresholds(y_train, y_pred_proba)
+
+    print("=== VARREDURA DE LIMIARES (VALIDAÇÃO CRUZADA NO TREINO) ===")
+    print(sweep_to_dataframe(sweep))
+
+    for point in (select_threshold(sweep, target_sensitivity=0.95, min_specificity=0.8),
+                  select_threshold(sweep, target_specificity=0.95),
+                  select_threshold(sweep, cost_fn=5, cost_fp=1),
+                  select_threshold(sweep)):
+        print(f"\n{point['criterion']}: limiar = {point['threshold']:.4f} | "
+              f"Sensibilidade = {point['sensitivity']:.4f} | "
+              f"Especificidade = {point['specificity']:.4f}")